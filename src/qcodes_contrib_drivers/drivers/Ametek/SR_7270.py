@@ -5,6 +5,11 @@ Created by Elyjah <elyjah.kiyooka@cea.fr>, Jan 2022
 
 """
 
+import time
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
 from qcodes.instrument import VisaInstrument
 from qcodes import validators as vals
 from qcodes.utils import DelayedKeyboardInterrupt
@@ -16,12 +21,22 @@ class Signalrecovery7270(VisaInstrument):
     Model 7270 DSP Lockin amplifier
 
     Note:
-    ask_raw command has been rewritten (bottom) to also read an echo to remove from buffer.
-    write_raw command have been rewritten to also read after writing using ask_raw.
+    The lockin terminates every reply with a null character, also the reply
+    to a command that returns no value. Responses are therefore read up to
+    the null character, and write_raw reads the (empty) reply of a command so
+    that it does not end up in the response to the next query.
+
+    The curve buffer acquires X, Y, R and phase at the internal sample rate
+    of the lockin and transfers them in binary, see acquire_curves.
 
     """
+    #: Bits of the curves in the curve buffer definition (CBD)
+    CURVE_BITS = {'x': 0, 'y': 1, 'r': 2, 'phase': 3}
+
     def __init__(self, name: str, address: str, terminator='\n\x00', **kwargs):
         super().__init__(name, address, terminator=terminator, device_clear = True, **kwargs)
+        self.visa_handle.read_termination = '\x00'
+        self._curves: Sequence[str] = ()
 
         idn = self.IDN.get()
         self.model = idn['model']
@@ -241,43 +256,53 @@ class Signalrecovery7270(VisaInstrument):
                         docstring=("Set measurement time constant; "
                                    "only settable."))
 
+        self.add_parameter(name='curve_length',
+                        label='Curve length',
+                        get_cmd='LEN',
+                        set_cmd='LEN {}',
+                        get_parser=int,
+                        vals=vals.Ints(min_value=1),
+                        docstring="Get and set the number of points stored "
+                                "per curve in the curve buffer.")
+
+        self.add_parameter(name='curve_storage_interval',
+                        label='Curve storage interval',
+                        unit='s',
+                        get_cmd='STR',
+                        set_cmd='STR {}',
+                        get_parser=lambda v: int(v) * 1e-6,
+                        set_parser=lambda v: int(round(v * 1e6)),
+                        vals=vals.Numbers(min_value=1e-6),
+                        docstring="Get and set the time between two points "
+                                "stored in the curve buffer, with 1 us "
+                                "resolution.")
+
     def ask_raw(self, cmd:str) -> str:
         """
-        Reimplementaion of ask function to handle lockin echo.
+        Reimplementaion of ask function to handle the null terminated replies.
 
         Args:
             cmd: Command to be sent (asked) to lockin.
 
-        Raises:
-            Runtimeerror: If the response does not end with the expected terminators '\\n\\x00' or '\\x00'
-
         Returns:
-            str: Return string from lockin with terminator character stripped of.
+            str: Return string from lockin with terminator characters stripped of.
 
         """
         with DelayedKeyboardInterrupt():
-            self.visa_handle.clear()
             response = self.visa_handle.query(cmd)
-            if response.endswith('\x00'):
-                resp = response[:-1]
-                if resp.endswith('\n'):
-                    return resp[:-1]
-                else:
-                    return resp
-            else:
-                return response
+            return response.rstrip('\r\n\x00')
 
     def write_raw(self, cmd:str) -> None:
         """
-        Reimplementation of write function to handle lockin echo.
-        Calls on ask_raw (defined above) to read echo.
+        Reimplementation of write function to read the empty reply of a
+        command.
 
         Args:
-            cmd: Command to be sent (asked) to lockin.
+            cmd: Command to be sent to lockin.
 
         """
         with DelayedKeyboardInterrupt():
-            status = self.ask_raw(cmd)
+            self.visa_handle.query(cmd)
 
     def get_idn(self):
         """
@@ -300,7 +325,115 @@ class Signalrecovery7270(VisaInstrument):
             complex: x + j*y as one complex number
 
         """
-        XY = self.ask_raw('XY.')
-        x = float(XY.split(',',1)[0])
-        y = float(XY.split(',',1)[1])
-        return x + 1j*y
+        x, y = self.ask_raw('XY.').split(',', 1)
+        return complex(float(x), float(y))
+
+    def setup_curve_buffer(self, n_points: int, interval: float,
+                           curves: Sequence[str] = ('x', 'y', 'r', 'phase')) -> None:
+        """
+        Define the curves stored in the curve buffer and the sampling.
+
+        Args:
+            n_points: Number of points per curve.
+            interval: Time between two points in s.
+            curves: Curves to store, out of 'x', 'y', 'r' and 'phase'.
+
+        """
+        unknown = set(curves) - set(self.CURVE_BITS)
+        if unknown:
+            raise ValueError(f'Unknown curves {sorted(unknown)}, expected '
+                             f'some of {list(self.CURVE_BITS)}')
+        mask = sum(1 << self.CURVE_BITS[curve] for curve in curves)
+        self.write(f'CBD {mask}')
+        self.curve_length(n_points)
+        self.curve_storage_interval(interval)
+        self._curves = tuple(curves)
+
+    def start_curve_acquisition(self) -> None:
+        """
+        Clear the curve buffer and start storing points (TD).
+        """
+        self.write('NC')
+        self.write('TD')
+
+    def curve_acquisition_status(self) -> Dict[str, int]:
+        """
+        Get the status of the curve acquisition (M).
+
+        Returns:
+            Dict of 'status' (0 when no acquisition is running), 'sweeps',
+            'status_byte' and 'points'.
+
+        """
+        parts = [int(part) for part in self.ask('M').split(',')]
+        return dict(zip(('status', 'sweeps', 'status_byte', 'points'), parts))
+
+    def wait_for_curves(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait until the curve acquisition has finished.
+
+        Args:
+            timeout: Maximum waiting time in s. Defaults to the expected
+                acquisition time plus the visa timeout.
+
+        Raises:
+            TimeoutError: If the acquisition did not finish in time.
+
+        """
+        duration = self.curve_length.get_latest() * self.curve_storage_interval.get_latest()
+        if timeout is None:
+            timeout = duration + (self.timeout() or 0)
+        start = time.perf_counter()
+        # No need to ask before the points can have been acquired
+        time.sleep(min(duration, timeout))
+        while self.curve_acquisition_status()['status'] != 0:
+            if time.perf_counter() - start > timeout:
+                raise TimeoutError(f'Curve acquisition did not finish within {timeout} s')
+            time.sleep(min(max(duration / 100, 1e-3), 0.1))
+
+    def get_curves(self) -> Dict[str, np.ndarray]:
+        """
+        Transfer the curves of the last acquisition in binary (DCB).
+
+        Returns:
+            Dict of the curves set up with setup_curve_buffer, X, Y and R
+            in V and the phase in degrees.
+
+        """
+        points = self.curve_acquisition_status()['points']
+        sensitivity = self.sensitivity()
+        curves = {}
+        with DelayedKeyboardInterrupt():
+            for curve in self._curves:
+                self.visa_handle.write(f'DCB {self.CURVE_BITS[curve]}')
+                raw = np.frombuffer(self.visa_handle.read_bytes(2 * points), dtype='>i2')
+                self.visa_handle.read()
+                if curve == 'phase':
+                    curves[curve] = raw / 100.0
+                else:
+                    curves[curve] = raw * (sensitivity / 10000.0)
+        return curves
+
+    def acquire_curves(self, n_points: int, interval: float,
+                       curves: Sequence[str] = ('x', 'y', 'r', 'phase'),
+                       timeout: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """
+        Acquire curves with the curve buffer of the lockin.
+
+        The points are sampled by the lockin itself, so the interval can be
+        much shorter than the time it takes to read single values.
+
+        Args:
+            n_points: Number of points per curve.
+            interval: Time between two points in s.
+            curves: Curves to acquire, out of 'x', 'y', 'r' and 'phase'.
+            timeout: Maximum time in s to wait for the acquisition to finish.
+
+        Returns:
+            Dict of the curves, X, Y and R in V and the phase in degrees.
+
+        """
+        self.setup_curve_buffer(n_points, interval, curves)
+        self.start_curve_acquisition()
+        self.wait_for_curves(timeout)
+        return self.get_curves()
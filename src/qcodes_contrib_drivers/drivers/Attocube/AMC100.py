@@ -3,10 +3,11 @@ from __future__ import annotations
 import dataclasses
 import os
 import sys
-from collections.abc import Mapping, Sequence
+import threading
+from collections.abc import Callable, Iterable, Mapping, Sequence
 from functools import partial
 from itertools import compress, zip_longest
-from typing import Any, overload
+from typing import Any, Union, overload
 
 import numpy as np
 from qcodes import validators
@@ -14,6 +15,9 @@ from qcodes.instrument import InstrumentChannel, Instrument, ChannelTuple
 from qcodes.parameters import (Parameter, MultiParameter, create_on_off_val_mapping,
                                ParamRawDataType)
 
+from .position_sampler import PositionSampler, synchronized
+from ..sampling import wait_until
+
 _POSITION_SCALE = 10 ** 6
 
 
@@ -87,25 +91,8 @@ class MultiAxisPositionParameter(MultiParameter):
         else:
             raise ValueError('Too many values, expected at most 3')
 
-        # tuples of boolean indicating whether axis is set and position
-        vals = [(setit := not np.isnan(value_dict[key]),
-                 value_dict[key] * _POSITION_SCALE if setit else 0.0)
-                for key in ('axis_1', 'axis_2', 'axis_3')]
-        sets, targets = zip(*vals)
-        axes_to_move = list(compress(range(3), sets))
         try:
-            # Set target positions
-            self.instrument.device.control.MultiAxisPositioning(*sets, *targets)
-            # Start moving
-            for axis in axes_to_move:
-                self.instrument.device.control.setControlMove(axis, True)
-            # Wait for target reached
-            while not all(self.instrument.device.status.getStatusTargetRange(axis)
-                          for axis in axes_to_move):
-                pass
-            # Stop moving
-            for axis in axes_to_move:
-                self.instrument.device.control.setControlMove(axis, False)
+            self.instrument.move_axes(value_dict)
         except self.instrument.exception_type as err:
             raise NotImplementedError from err
         else:
@@ -214,10 +201,7 @@ class AMC100Axis(InstrumentChannel):
     def _move_to_target_position(self, position: int):
         self.parent.device.move.setControlTargetPosition(self._axis, position)
         self.parent.device.control.setControlMove(self._axis, True)
-        while not self.parent.device.status.getStatusTargetRange(self._axis):
-            # Update qcodes cache
-            self.position.get()
-        self.parent.device.control.setControlMove(self._axis, False)
+        self.parent.wait_for_targets([self])
 
     def move_to_reference_position(self):
         """This function starts an approach to the reference position.
@@ -239,13 +223,26 @@ class AMC100Axis(InstrumentChannel):
         self.parent.device.move.setSingleStep(self._axis, backward)
 
 
+AxisKey = Union[str, int, AMC100Axis]
+
+
 class AttocubeAMC100(Instrument):
-    """Driver for the AMC100 position controller."""
+    """Driver for the AMC100 position controller.
+
+    Moves of several axes are started together with :meth:`start_move` and
+    awaited together with :meth:`wait_for_targets`. :meth:`start_position_sampler`
+    records the positions of all axes in the background, which also lets the
+    waits check the target status once per sample instead of continuously.
+    All calls of the device API hold a lock, so the sampler can run while the
+    driver is used.
+    """
     # Tested with fw 1.3.23
 
     def __init__(self, name: str, api_dir: os.PathLike, address: str | None = None,
                  axis_labels: Sequence[str] = (), **kwargs: Any):
         super().__init__(name, **kwargs)
+        self._position_sampler: PositionSampler | None = None
+        self._device_lock = threading.RLock()
 
         try:
             sys.path.append(str(api_dir))
@@ -264,7 +261,7 @@ class AttocubeAMC100(Instrument):
                 raise ValueError('No devices discovered')
             address = list(discovered)[0]
 
-        self.device = AMC.Device(address)
+        self.device = synchronized(AMC.Device(address), self._device_lock)
         self.device.connect()
 
         axes = []
@@ -290,7 +287,166 @@ class AttocubeAMC100(Instrument):
     def exception_type(self) -> Exception:
         return self._exception_type
 
+    @property
+    def position_sampler(self) -> PositionSampler | None:
+        """The position sampler started with :meth:`start_position_sampler`."""
+        return self._position_sampler
+
+    def get_positions(self) -> np.ndarray:
+        """Read the positions of all three axes with a single request."""
+        x, y, z, *_ = self.device.control.getPositionsAndVoltages()
+        return np.array([x, y, z]) / _POSITION_SCALE
+
+    def start_position_sampler(self, rate: float = 100.0,
+                               capacity: int = 100_000) -> PositionSampler:
+        """Start reading the positions of all axes in the background.
+
+        A running sampler is stopped and replaced.
+
+        Args:
+            rate: Samples per second.
+            capacity: Number of samples kept.
+        """
+        self.stop_position_sampler()
+        self._position_sampler = PositionSampler(self.get_positions, 3, rate, capacity)
+        return self._position_sampler.start()
+
+    def stop_position_sampler(self) -> None:
+        """Stop the position sampler, its samples stay available."""
+        if self._position_sampler is not None:
+            self._position_sampler.stop()
+
+    def start_move(self, targets: Mapping[AxisKey, float] | Sequence[float]
+                   ) -> list[AMC100Axis]:
+        """Start moving several axes to target positions at the same time.
+
+        Args:
+            targets: Target positions by axis (channel, name like ``axis_1``
+                or index 0, 1, 2 in :attr:`axis_channels`), or a sequence of
+                target positions starting with axis 1. NaN leaves an axis
+                where it is.
+
+        Returns:
+            The moving axes, to be passed to :meth:`wait_for_targets`.
+        """
+        if isinstance(targets, Mapping):
+            positions = {self._get_axis(axis)._axis: target
+                         for axis, target in targets.items()}
+        elif len(targets) <= 3:
+            positions = dict(enumerate(targets))
+        else:
+            raise ValueError('Too many values, expected at most 3')
+
+        sets = [not np.isnan(positions.get(i, np.nan)) for i in range(3)]
+        values = [positions[i] * _POSITION_SCALE if sets[i] else 0.0 for i in range(3)]
+        axes = [self.axis_channels[i] for i in compress(range(3), sets)]
+        self.device.control.MultiAxisPositioning(*sets, *values)
+        for axis in axes:
+            self.device.control.setControlMove(axis._axis, True)
+        return axes
+
+    def wait_for_targets(self, axes: Iterable[AxisKey], timeout: float | None = None,
+                         poll_interval: float = 0.01, stop: bool = True) -> None:
+        """Wait until all given axes are within their target range.
+
+        The target status of the axes still moving is checked after each
+        sample of a running position sampler, else every ``poll_interval``.
+        The cached positions of the axes are updated meanwhile.
+
+        Args:
+            axes: The axes returned by :meth:`start_move`, or their names
+                or indices.
+            timeout: Maximum time to wait in seconds, None to wait forever.
+            poll_interval: Time between checks without position sampler.
+            stop: Switch the closed loop move off when the targets are reached.
+
+        Raises:
+            TimeoutError: If the targets were not reached in time. The closed
+                loop moves are switched off.
+        """
+        channels = [self._get_axis(axis) for axis in axes]
+        moving = set(channels)
+
+        def reached() -> bool:
+            moving.difference_update([axis for axis in list(moving)
+                                      if self.device.status.getStatusTargetRange(axis._axis)])
+            self._update_position_cache(channels)
+            return not moving
+
+        try:
+            wait_until(reached, timeout, poll_interval, self._position_sampler)
+        except BaseException:
+            stop = True
+            raise
+        finally:
+            if stop:
+                self._stop_moves(channels)
+
+    def move_axes(self, targets: Mapping[AxisKey, float] | Sequence[float],
+                  timeout: float | None = None) -> None:
+        """Move several axes to target positions at the same time and wait
+        until all have arrived. See :meth:`start_move` for the targets."""
+        self.wait_for_targets(self.start_move(targets), timeout)
+
+    def run_trajectory(self, points: Iterable[Mapping[AxisKey, float] | Sequence[float]],
+                       callback: Callable[[int, np.ndarray], Any] | None = None,
+                       timeout: float | None = None) -> np.ndarray:
+        """Move through a list of target points.
+
+        The next target is sent as soon as all axes have reached the current
+        one, without switching the closed loop off in between.
+
+        Args:
+            points: Target positions per point, see :meth:`start_move`.
+            callback: Called as ``callback(index, positions)`` at each point,
+                e.g. to take a measurement.
+            timeout: Maximum time in seconds per point.
+
+        Returns:
+            The positions of all axes reached at each point.
+        """
+        reached = []
+        moved: set[AMC100Axis] = set()
+        try:
+            for index, point in enumerate(points):
+                axes = self.start_move(point)
+                moved.update(axes)
+                self.wait_for_targets(axes, timeout, stop=False)
+                positions = self.get_positions()
+                reached.append(positions)
+                if callback is not None:
+                    callback(index, positions)
+        finally:
+            self._stop_moves(moved)
+        return np.array(reached).reshape(-1, 3)
+
+    def _get_axis(self, key: AxisKey) -> AMC100Axis:
+        if isinstance(key, AMC100Axis):
+            return key
+        if isinstance(key, int):
+            if not 0 <= key < len(self.axis_channels):
+                raise ValueError(f'Invalid axis index {key}, expected 0, 1 or 2')
+            return self.axis_channels[key]
+        axis = self.submodules[key]
+        if not isinstance(axis, AMC100Axis):
+            raise KeyError(f'{key} is not an axis')
+        return axis
+
+    def _stop_moves(self, axes: Iterable[AMC100Axis]) -> None:
+        for axis in axes:
+            self.device.control.setControlMove(axis._axis, False)
+
+    def _update_position_cache(self, axes: Iterable[AMC100Axis]) -> None:
+        sampler = self._position_sampler
+        if sampler is not None and sampler.running and sampler.count:
+            positions = sampler.latest()[1]
+        else:
+            positions = self.get_positions()
+        for axis in axes:
+            axis.position.cache.set(positions[axis._axis])
+
     def close(self):
+        self.stop_position_sampler()
         self.device.close()
         super().close()
 
@@ -9,12 +9,23 @@ Attention - the device has not feedback from the motor. That means, the current
 not known. The driver can send a move command and the controller behaves like there is a motor
 connected to it, even if there is no motor available.
 
+Moves started with Anc300Axis.move_async return futures. A single monitor thread per controller
+polls the output voltage of all moving axes in one batch of queries, starting at the expected
+end of each move and then at a short, slowly growing interval. Anc300Axis.move_to_target closes
+the loop with a position readout provided by the caller (e.g. a capacitive sensor or an
+interferometer read by another instrument).
+
 Author:
     Michael Wagener, FZJ / ZEA-2, m.wagener@fz-juelich.de
 """
 
 import time
 import logging
+import threading
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import Future
+from typing import Any, Optional, Union
+
 import pyvisa
 
 # real mode:
@@ -247,6 +258,7 @@ class Anc300Axis(InstrumentChannel):
         Raises:
             ValueError: if the value is zero
         """
+        self._parent._cancel_move(self._axisnr, 'started another move')
         if value < 0:
             self._parent.write('stepd {} {}'.format(self._axisnr, -value))
         elif value > 0:
@@ -269,6 +281,7 @@ class Anc300Axis(InstrumentChannel):
         Raises:
             ValueError: if the given direction is invalid
         """
+        self._parent._cancel_move(self._axisnr, 'started a continous move')
         if direc == 'up':
             self._parent.write('stepu {} c'.format(self._axisnr))
         elif direc == 'down':
@@ -277,6 +290,81 @@ class Anc300Axis(InstrumentChannel):
             raise ValueError("no 'up' or 'donw' given")
 
 
+    def move_async(self, steps: int) -> 'Future[int]':
+        """Start a movement and return a future which resolves when the axis has stopped.
+
+        Args:
+            steps: the amount of steps to move, the sign denotes the direction
+
+        Returns:
+            Future resolving to the number of steps. It fails with a RuntimeError if the
+            move is stopped with stopMove or replaced by another move of this axis.
+        """
+        self.move(steps)
+        return self._parent._add_move(self._axisnr, steps, self._expected_duration(steps))
+
+
+    def move_to_target(self, target: float, position: Callable[[], float], tolerance: float,
+                       step_size: Optional[float] = None, max_steps: int = 1000,
+                       approach: float = 0.8, probe_steps: int = 10,
+                       max_iterations: int = 100) -> int:
+        """Move until an external position readout is within a tolerance of the target.
+
+        The controller has no position feedback, so the position is read with the given
+        function after each move. The position change per step is estimated from the
+        moves done so far. Each move covers the fraction `approach` of the estimated
+        remaining distance, so the moves get smaller near the target and overshooting
+        is avoided.
+
+        Args:
+            target: the target position, in the units of the readout
+            position: function returning the current position
+            tolerance: the accepted distance from the target
+            step_size: initial estimate of the position change per step (the sign gives
+                the direction of positive steps). If not given, it is measured with a
+                first move of `probe_steps` steps.
+            max_steps: maximum number of steps per move
+            approach: fraction of the remaining distance covered by each move
+            probe_steps: number of steps of the first move without a step size estimate
+            max_iterations: maximum number of moves
+
+        Returns:
+            The net number of steps moved.
+
+        Raises:
+            RuntimeError: if the target was not reached within max_iterations moves
+        """
+        moved = 0
+        current = position()
+        for _ in range(max_iterations):
+            error = target - current
+            if abs(error) <= tolerance:
+                return moved
+            if step_size is None:
+                steps = probe_steps if error > 0 else -probe_steps
+            else:
+                steps = int(round(approach * error / step_size))
+                steps = max(-max_steps, min(max_steps, steps))
+                if steps == 0:
+                    steps = 1 if error / step_size > 0 else -1
+            self.move_async(steps).result()
+            moved += steps
+            new = position()
+            if new != current:
+                estimate = (new - current) / steps
+                step_size = estimate if step_size is None else (step_size + estimate) / 2
+            current = new
+        raise RuntimeError('{} did not reach {} within {} moves'.format(
+            self.full_name, target, max_iterations))
+
+
+    def _expected_duration(self, steps: int) -> float:
+        if 'frequency' not in self.parameters:
+            return 0.0
+        frequency = self.frequency.cache.get()
+        return abs(steps) / frequency if frequency else 0.0
+
+
     def waitMove(self, wait=1.0, timeout=0):
         """Global function to wait until the movement is finished.
 
@@ -287,19 +375,24 @@ class Anc300Axis(InstrumentChannel):
         get the needed 'OK'. To avoid this, this routine asks the current output voltage. This
         voltage will be zero if the axis has stopped.
 
+        The checks start with a short interval which grows up to `wait`, so short moves
+        are not delayed by a full `wait`.
+
         Args:
-            wait: time to wait between the checks
+            wait: maximum time to wait between the checks
             timeout: number of seconds to generate a RuntimeError if not finished moving
 
         Returns:
             None. This function will block, until the motion of this axis has been stopped.
         """
         start = time.time()
+        interval = min(self._parent.move_poll_interval, wait)
         while True:
             volt = self._parent.ask('geto {}'.format(self._axisnr))
             if float(volt) == 0.0:
                 return
-            time.sleep(wait)
+            time.sleep(interval)
+            interval = min(interval * 2, wait)
             if timeout > 0:
                 if time.time() - start >= timeout:
                     raise RuntimeError('waitMove timed out')
@@ -309,6 +402,7 @@ class Anc300Axis(InstrumentChannel):
         """
         Global function to stop the movement.
         """
+        self._parent._cancel_move(self._axisnr, 'was stopped')
         self._parent.write('stop {}'.format(self._axisnr))
 
 
@@ -354,7 +448,17 @@ class ANC300(VisaInstrument):
         usage in experiment: not yet
     """
 
+    # shortest and longest interval between the status checks of moving axes
+    move_poll_interval = 0.01
+    move_poll_max_interval = 0.2
+    # maximum number of queries sent at once by refresh_status
+    batch_size = 16
+
     def __init__(self, name, address, **kwargs):
+        self._io_lock = threading.RLock()
+        self._moves: dict[int, tuple['Future[int]', int, float]] = {}
+        self._moves_changed = threading.Condition()
+        self._monitor: Optional[threading.Thread] = None
         super().__init__(name, address, 5, '\r\n', **kwargs)
 
         # configure the port
@@ -412,20 +516,12 @@ class ANC300(VisaInstrument):
         Raises:
             RuntimeError: if Error-Message from the device is read.
         """
-        status = super().ask_raw(cmd) # send the command to the device and read the echo/status
-        if status == cmd:
-            # now the device sends an echo
-            status = self.visa_handle.read() # read the status line again
-        if status.startswith('OK'):
-            return
-        if status.startswith('ERROR'):
-            raise RuntimeError(status)
-        # the line before the 'ERROR' a message will be send from the device
-        response = status
-        status = self.visa_handle.read() # read the last status line
-        if status.startswith('ERROR'):
-            raise RuntimeError(response)
-        return
+        with self._io_lock:
+            self.visa_handle.write(cmd)
+            lines, ok = self._read_reply(cmd)
+        if not ok:
+            # the line before the 'ERROR' a message will be send from the device
+            raise RuntimeError(" - ".join(lines) or 'ERROR')
 
 
     def ask_raw(self, cmd: str) -> str:
@@ -440,29 +536,230 @@ class ANC300(VisaInstrument):
         Raises:
             RuntimeError: if Error-Message from the device is read.
         """
-        response = super().ask_raw(cmd) # send the command to the device and read the echo/status
-        if response.startswith('> '): # sometimes the response starts with '> '. I don't know why.
-            response = response[2:]
-        if response == cmd:
-            # now the device has send an echo
-            response = self.visa_handle.read() # read the response line again
-            if response.startswith('> '):
-                response = response[2:]
-        status = self.visa_handle.read() # read the status line
-        if status.startswith('OK'):
-            if '=' in response:
-                # "frequency = 220 Hz" -> filter the 220
-                tmp = response.split('=')
-                return tmp[1].split()[0] # a single value
-            return response # the complete string
-        if status.startswith('ERROR'):
-            raise RuntimeError(response)
+        with self._io_lock:
+            self.visa_handle.write(cmd)
+            lines, ok = self._read_reply(cmd)
+        if not ok:
+            raise RuntimeError(" - ".join(lines))
+        return self._reply_value(lines)
+
+
+    def ask_many(self, cmds: Iterable[str]) -> list[Optional[str]]:
+        """Send several queries at once and read all responses afterwards.
+
+        The controller handles the queries one after the other, but there is only one
+        transfer in each direction instead of one round trip per query.
+
+        Args:
+            cmds: Commands to send to the controller.
+
+        Returns:
+            The response to each command, None for commands answered with 'ERROR'.
+        """
+        cmds = list(cmds)
+        if not cmds:
+            return []
+        with self._io_lock:
+            self.visa_handle.write('\r\n'.join(cmds))
+            replies = [self._read_reply(cmd) for cmd in cmds]
+        return [self._reply_value(lines) if ok else None for lines, ok in replies]
+
+
+    def _read_reply(self, cmd: str) -> tuple[list[str], bool]:
+        """Read the response lines of one command up to its status line.
+
+        Returns:
+            The response lines without echo and whether the status was 'OK'.
+        """
+        lines: list[str] = []
+        first = True
+        while True:
+            line = self.visa_handle.read()
+            if line.startswith('> '): # sometimes the response starts with '> '. I don't know why.
+                line = line[2:]
+            if first and line == cmd:
+                # the device has send an echo
+                first = False
+                continue
+            first = False
+            if line.startswith('OK'):
+                return lines, True
+            if line.startswith('ERROR'):
+                return lines, False
+            lines.append(line)
+
+
+    @staticmethod
+    def _reply_value(lines: list[str]) -> str:
+        if len(lines) == 1 and '=' in lines[0]:
+            # "frequency = 220 Hz" -> filter the 220
+            return lines[0].split('=')[1].split()[0] # a single value
         # the 'ver' command answers with two lines...
-        response = response + " - " + status
-        status = self.visa_handle.read() # read the second status line
-        if status.startswith('ERROR'):
-            raise RuntimeError(response)
-        return response
+        return " - ".join(lines)
+
+
+    def refresh_status(self, submod: str = "*") -> dict[str, Any]:
+        """Read all readable parameters of the axes and trigger outputs with batched
+        queries and update their cached values.
+
+        Args:
+            submod: (optional) refresh only the parameters of this submodule
+
+        Returns:
+            dict with the values, the key is the modulename and the parametername.
+            Parameters the device answered with an error are left out.
+        """
+        queries = {}
+        for m, mod in self.submodules.items():
+            if isinstance(mod, ChannelList) or submod not in ("*", m):
+                continue
+            for p, par in mod.parameters.items():
+                cmd = getattr(par.get_raw, 'cmd_str', None) if par.gettable else None
+                if isinstance(cmd, str):
+                    queries[m + "." + p] = (par, cmd)
+
+        values = {}
+        keys = list(queries)
+        for start in range(0, len(keys), self.batch_size):
+            chunk = keys[start:start + self.batch_size]
+            replies = self.ask_many(queries[key][1] for key in chunk)
+            for key, reply in zip(chunk, replies):
+                if reply is None:
+                    continue
+                par = queries[key][0]
+                try:
+                    value = par._from_raw_value_to_value(reply)
+                except (ValueError, KeyError):
+                    log.debug("Unexpected response %r for %s", reply, key)
+                    continue
+                par.cache.set(value)
+                values[key] = value
+        return values
+
+
+    def move_all(self, steps: Mapping[Union[int, str], int]) -> dict[str, 'Future[int]']:
+        """Start movements of several axis.
+
+        Args:
+            steps: the amount of steps per axis number or axis name (e.g. 'axis1')
+
+        Returns:
+            Future per axis name, see Anc300Axis.move_async
+        """
+        futures = {}
+        for axis, value in steps.items():
+            name = axis if isinstance(axis, str) else 'axis{}'.format(axis)
+            futures[name] = self.submodules[name].move_async(value)
+        return futures
+
+
+    def wait_moves(self, futures: Union[Mapping[Any, 'Future[int]'], Iterable['Future[int]']],
+                   timeout: Optional[float] = None) -> None:
+        """Wait until the given movements are finished.
+
+        Args:
+            futures: futures returned by move_async or move_all
+            timeout: number of seconds after which all axis are stopped and a
+                TimeoutError is raised. None waits forever.
+
+        Raises:
+            RuntimeError: if a movement was stopped
+        """
+        if isinstance(futures, Mapping):
+            futures = futures.values()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for future in list(futures):
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                future.result(remaining)
+            except TimeoutError:
+                self.stopall()
+                raise TimeoutError('movements did not finish within {} s'.format(timeout))
+
+
+    def _add_move(self, axis: int, steps: int, duration: float) -> 'Future[int]':
+        future: 'Future[int]' = Future()
+        future.set_running_or_notify_cancel()
+        with self._moves_changed:
+            self._moves[axis] = (future, steps, time.monotonic() + duration)
+            if self._monitor is None:
+                self._monitor = threading.Thread(target=self._monitor_moves,
+                                                 name='{}_moves'.format(self.name),
+                                                 daemon=True)
+                self._monitor.start()
+            self._moves_changed.notify_all()
+        return future
+
+
+    def _cancel_move(self, axis: int, reason: str) -> None:
+        with self._moves_changed:
+            move = self._moves.pop(axis, None)
+        if move is not None:
+            move[0].set_exception(RuntimeError('axis{} {}'.format(axis, reason)))
+
+
+    def _monitor_moves(self) -> None:
+        """Thread checking the output voltage of the moving axis until all have stopped.
+
+        Axis are only checked after the expected end of their movement. Afterwards the
+        interval between the checks starts at move_poll_interval and doubles up to
+        move_poll_max_interval while the axis are still moving.
+        """
+        interval = self.move_poll_interval
+        try:
+            while True:
+                with self._moves_changed:
+                    if not self._moves:
+                        self._monitor = None
+                        return
+                    now = time.monotonic()
+                    wake = min(end for _, _, end in self._moves.values())
+                    if wake > now:
+                        self._moves_changed.wait(wake - now)
+                        interval = self.move_poll_interval
+                        continue
+                    due = {axis: move for axis, move in self._moves.items() if move[2] <= now}
+
+                try:
+                    replies = self.ask_many('geto {}'.format(axis) for axis in due)
+                    stopped = [axis for axis, reply in zip(due, replies)
+                               if reply is not None and float(reply) == 0.0]
+                except Exception as e:
+                    for axis in due:
+                        self._finish_move(axis, due[axis][0], exception=e)
+                    continue
+
+                for axis in stopped:
+                    self._finish_move(axis, due[axis][0], result=due[axis][1])
+                if stopped:
+                    interval = self.move_poll_interval
+                else:
+                    with self._moves_changed:
+                        self._moves_changed.wait(interval)
+                    interval = min(2 * interval, self.move_poll_max_interval)
+        finally:
+            moves = {}
+            with self._moves_changed:
+                if self._monitor is threading.current_thread():
+                    # left after an unexpected error, the moves would never finish
+                    self._monitor = None
+                    moves, self._moves = self._moves, {}
+            for future, _, _ in moves.values():
+                future.set_exception(RuntimeError('the move monitor of {} stopped'
+                                                  .format(self.name)))
+
+
+    def _finish_move(self, axis: int, future: 'Future[int]', result: int = 0,
+                     exception: Optional[BaseException] = None) -> None:
+        with self._moves_changed:
+            move = self._moves.get(axis)
+            if move is None or move[0] is not future:
+                return # the move was cancelled or replaced meanwhile
+            del self._moves[axis]
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
 
 
     def stopall(self):
@@ -471,6 +768,7 @@ class ANC300(VisaInstrument):
         """
         self.log.debug("Stop all axis.")
         for a in range(7):
+            self._cancel_move(a+1, 'was stopped')
             self.write('stop {}'.format(a+1))
 
 
@@ -479,6 +777,8 @@ class ANC300(VisaInstrument):
         Override of the base class' close function
         """
         self.log.debug("Close the device.")
+        for a in list(self._moves):
+            self._cancel_move(a, 'was not finished before closing')
         super().close()
 
 
@@ -521,18 +821,19 @@ class ANC300(VisaInstrument):
             # ID and options only if all modules are returned
             retval.update(self.version())
 
+        values = self.refresh_status(submod)
         for m in self.submodules:
             mod = self.submodules[m]
             if not isinstance(mod, ChannelList) and (submod in ("*", m)):
                 for p in mod.parameters:
                     par = mod.parameters[p]
-                    try:
-                        if par.unit:
-                            val = str(par()).strip() + " " + par.unit
-                        else:
-                            val = str(par()).strip()
-                    except:
+                    key = m + "." + p
+                    if key not in values:
                         val = "** not readable **"
-                    retval.update({m + "." + p: val})
+                    elif par.unit:
+                        val = str(values[key]).strip() + " " + par.unit
+                    else:
+                        val = str(values[key]).strip()
+                    retval.update({key: val})
 
         return retval
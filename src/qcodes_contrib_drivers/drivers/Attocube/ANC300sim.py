@@ -108,6 +108,14 @@ class MockVisaHandle:
               'gettd 6': ['Wrong axis type','ERROR'],
               'gettd 7': ['Wrong axis type','ERROR'],
 
+              'geto 1': ['voltage = 0.000000 V'],
+              'geto 2': ['voltage = 0.000000 V'],
+              'geto 3': ['Wrong axis type','ERROR'],
+              'geto 4': ['Wrong axis type','ERROR'],
+              'geto 5': ['Wrong axis type','ERROR'],
+              'geto 6': ['Wrong axis type','ERROR'],
+              'geto 7': ['Wrong axis type','ERROR'],
+
               'getc 1':  ['cap = 5 nF'], # TODO
               'getc 2':  ['cap = 5 nF'], # TODO
               'getc 3':  ['Wrong axis type','ERROR'],
@@ -147,6 +155,11 @@ class MockVisaHandle:
         """
         if self.closed:
             raise RuntimeError("Trying to write to a closed instrument")
+        if '\r\n' in data.rstrip():
+            # several commands sent at once are answered one after the other
+            for line in data.rstrip().split('\r\n'):
+                self.write(line)
+            return len(data), pyvisa.constants.StatusCode.success
         cmd = data.rstrip()
         if _USE_DEBUG:
             print("DBG-Mock: write", cmd)
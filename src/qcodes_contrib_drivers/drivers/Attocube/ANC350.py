@@ -1,11 +1,18 @@
-﻿import time
-from typing import Any, Callable, Dict, Optional, Union
+﻿import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
 
+import numpy as np
 import qcodes.validators as vals
 from qcodes.instrument import Instrument
 from qcodes.instrument import InstrumentChannel, ChannelList
 
 from qcodes_contrib_drivers.drivers.Attocube.ANC350Lib import ANC350LibActuatorType, ANC350v3Lib, ANC350v4Lib
+from qcodes_contrib_drivers.drivers.Attocube.position_sampler import PositionSampler, synchronized
+from qcodes_contrib_drivers.drivers.sampling import wait_until
+
+AxisKey = Union[int, str, "Anc350Axis"]
+Targets = Union[Mapping[AxisKey, float], Sequence[Optional[float]]]
 
 
 class Anc350Axis(InstrumentChannel):
@@ -246,14 +253,7 @@ class Anc350Axis(InstrumentChannel):
         Args:
             position: The position the axis moves to
         """
-        self.target_position(position)
-        try:
-            self.enable_auto_move(relative=False)
-            time.sleep(0.1)
-            while (status := self.status.get())['moving'] and not status['target']:
-                pass
-        finally:
-            self.disable_auto_move()
+        self._parent.move_axes({self._axis: position})
 
     def _get_frequency(self) -> float:
         """
@@ -471,8 +471,16 @@ class ANC350(Instrument):
         inst_no: Sequence number of the device to connect to (default: 0, the first device found).
                  Note that the :meth:`discover` method of the library must be called before a
                  device can be connected.
+
+    Moves of several axes are started together with :meth:`start_move` and awaited together
+    with :meth:`wait_for_targets`. :meth:`start_position_sampler` records the positions of all
+    axes in the background; the waits then check the axis status once per sample. All calls of
+    the library hold a lock, so the sampler can run while the driver is used.
     """
 
+    # time the controller needs to report an automatic move as moving
+    _MOVE_START_DELAY = 0.1
+
     def __init__(self, name: str, library: ANC350v3Lib, inst_no: Optional[int] = None):
         super().__init__(name)
 
@@ -484,7 +492,9 @@ class ANC350(Instrument):
             raise NotImplementedError("Only version 3 and 4 of ANC350's driver-DLL are currently "
                                       "supported")
 
-        self._lib = library
+        self._lib = synchronized(library, threading.RLock())
+        self._position_sampler: Optional[PositionSampler] = None
+        self._move_started = 0.0
         self._device_no = inst_no or self._lib.discover() - 1
         if self._device_no < 0:
             raise ValueError('No free instrument discovered.')
@@ -499,10 +509,163 @@ class ANC350(Instrument):
         axischannels.lock()
         self.add_submodule("axis_channels", axischannels)
 
+    @property
+    def position_sampler(self) -> Optional[PositionSampler]:
+        """The position sampler started with :meth:`start_position_sampler`"""
+        return self._position_sampler
+
+    def get_positions(self) -> np.ndarray:
+        """
+        Reads the positions of all axes
+
+        Returns:
+            Positions of the x, y and z axis in millimeters [mm] or millidegrees [m°]
+        """
+        return np.array([self._lib.get_position(self._device_handle, axis) * 1e3
+                         for axis in range(3)])
+
+    def start_position_sampler(self, rate: float = 100.0,
+                               capacity: int = 100_000) -> PositionSampler:
+        """
+        Starts reading the positions of all axes in the background. A running sampler is
+        stopped and replaced.
+
+        Args:
+            rate: Samples per second
+            capacity: Number of samples kept
+        """
+        self.stop_position_sampler()
+        self._position_sampler = PositionSampler(self.get_positions, 3, rate, capacity)
+        return self._position_sampler.start()
+
+    def stop_position_sampler(self) -> None:
+        """Stops the position sampler, its samples stay available."""
+        if self._position_sampler is not None:
+            self._position_sampler.stop()
+
+    def start_move(self, targets: Targets) -> List["Anc350Axis"]:
+        """
+        Starts automatic moves of several axes to absolute target positions at the same time.
+
+        Args:
+            targets: Target positions by axis (channel, name like "x_axis" or index 0..2), or a
+                     sequence of target positions for x, y and z. None or NaN leaves an axis
+                     where it is.
+
+        Returns:
+            The moving axes, to be passed to :meth:`wait_for_targets`
+        """
+        items: List[Tuple[Anc350Axis, Optional[float]]]
+        if isinstance(targets, Mapping):
+            items = [(self._get_axis(key), target) for key, target in targets.items()]
+        else:
+            if len(targets) > 3:
+                raise ValueError("Too many values, expected at most 3")
+            items = list(zip(self.axis_channels, targets))
+        moves = [(axis, target) for axis, target in items
+                 if target is not None and not np.isnan(target)]
+
+        for axis, target in moves:
+            axis.target_position(target)
+        for axis, _ in moves:
+            axis.enable_auto_move(relative=False)
+        self._move_started = time.monotonic()
+        return [axis for axis, _ in moves]
+
+    def wait_for_targets(self, axes: Iterable[AxisKey], timeout: Optional[float] = None,
+                         poll_interval: float = 0.01, stop: bool = True) -> None:
+        """
+        Waits until all given axes have reached their target or stopped moving.
+
+        The status of the axes still moving is checked after each sample of a running position
+        sampler, else every `poll_interval` seconds.
+
+        Args:
+            axes: The axes returned by :meth:`start_move`, or their names or indices
+            timeout: Maximum time to wait in seconds, None to wait forever
+            poll_interval: Time between checks without position sampler
+            stop: Disable the automatic move afterwards
+
+        Raises:
+            TimeoutError: If the axes did not arrive in time. The automatic moves are disabled.
+        """
+        channels = [self._get_axis(axis) for axis in axes]
+        moving = set(channels)
+
+        def arrived() -> bool:
+            for axis in list(moving):
+                status = axis.status.get()
+                if not status["moving"] or status["target"]:
+                    moving.discard(axis)
+            return not moving
+
+        try:
+            time.sleep(max(0.0, self._move_started + self._MOVE_START_DELAY - time.monotonic()))
+            wait_until(arrived, timeout, poll_interval, self._position_sampler)
+        except BaseException:
+            stop = True
+            raise
+        finally:
+            if stop:
+                for axis in channels:
+                    axis.disable_auto_move()
+
+    def move_axes(self, targets: Targets, timeout: Optional[float] = None) -> None:
+        """
+        Moves several axes to target positions at the same time and waits until all have
+        arrived. See :meth:`start_move` for the targets.
+        """
+        self.wait_for_targets(self.start_move(targets), timeout)
+
+    def run_trajectory(self, points: Iterable[Targets],
+                       callback: Optional[Callable[[int, np.ndarray], Any]] = None,
+                       timeout: Optional[float] = None) -> np.ndarray:
+        """
+        Moves through a list of target points. The next targets are sent as soon as all axes
+        have arrived at the current point, without disabling the automatic moves in between.
+
+        Args:
+            points: Target positions per point, see :meth:`start_move`
+            callback: Called as ``callback(index, positions)`` at each point, e.g. to take a
+                      measurement
+            timeout: Maximum time in seconds per point
+
+        Returns:
+            The positions of all axes reached at each point
+        """
+        reached = []
+        moved = set()
+        try:
+            for index, point in enumerate(points):
+                axes = self.start_move(point)
+                moved.update(axes)
+                self.wait_for_targets(axes, timeout, stop=False)
+                positions = self.get_positions()
+                reached.append(positions)
+                if callback is not None:
+                    callback(index, positions)
+        finally:
+            for axis in moved:
+                axis.disable_auto_move()
+        return np.array(reached).reshape(-1, 3)
+
+    def _get_axis(self, key: AxisKey) -> "Anc350Axis":
+        if isinstance(key, Anc350Axis):
+            return key
+        if isinstance(key, int):
+            if not 0 <= key < len(self.axis_channels):
+                raise ValueError(f"Invalid axis index {key}, expected 0, 1 or 2")
+            return self.axis_channels[key]
+        axis = self.submodules[key]
+        if not isinstance(axis, Anc350Axis):
+            raise KeyError(f"{key} is not an axis")
+        return axis
+
     def close(self) -> None:
         """
         Closes the connection to the device. The device handle becomes invalid.
         """
+        self.stop_position_sampler()
         self._lib.disconnect(self._device_handle)
         super().close()
 
@@ -0,0 +1,105 @@
+"""Background sampling of the positions of all axes of an Attocube controller
+
+:class:`PositionSampler` reads the positions of all axes at a fixed rate in
+a background thread and keeps them, time stamped, in a numpy ring buffer
+(see :class:`~qcodes_contrib_drivers.drivers.sampling.RingBufferSampler`).
+Scans can then look up the position at any time of the scan afterwards
+instead of reading every axis for every pixel, and waiting for moves can
+be woken by new samples instead of polling each axis in its own loop.
+
+The sampler talks to the controller from its own thread, so the drivers
+access their device through :func:`synchronized`, which serializes all calls.
+"""
+import threading
+from collections.abc import Callable
+from functools import wraps
+from typing import Any, Optional, TypeVar
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from qcodes_contrib_drivers.drivers.sampling import RingBufferSampler
+
+__all__ = ['PositionSampler', 'synchronized']
+
+T = TypeVar('T')
+
+
+class PositionSampler(RingBufferSampler):
+    """Samples the positions of several axes into a ring buffer
+
+    Args:
+        read: Returns the positions of all axes.
+        n_axes: Number of values returned by ``read``.
+        rate: Samples per second.
+        capacity: Number of samples kept.
+    """
+
+    def __init__(self, read: Callable[[], ArrayLike], n_axes: int,
+                 rate: float = 100.0, capacity: int = 100_000):
+        super().__init__(read, 1 / rate, capacity)
+        self.n_axes = n_axes
+
+    @property
+    def rate(self) -> float:
+        """Samples per second"""
+        return 1 / self.interval
+
+    def samples(self, n: Optional[int] = None) -> tuple[np.ndarray, np.ndarray]:
+        """Return the last ``n`` samples, oldest first
+
+        Args:
+            n: Number of samples, defaults to all samples kept.
+
+        Returns:
+            The time stamps (as returned by :func:`time.time`) and an array of
+            the positions with one column per axis.
+        """
+        times, positions = super().samples(n)
+        return times, positions.reshape(-1, self.n_axes)
+
+    def positions_at(self, timestamps: Any) -> np.ndarray:
+        """Interpolate the sampled positions to the given time stamps
+
+        Time stamps outside the kept samples give NaN.
+
+        Returns:
+            The positions with an additional last axis per axis.
+        """
+        if self.count == 0:
+            return np.full(np.shape(timestamps) + (self.n_axes,), np.nan)
+        return self.interpolate(timestamps)
+
+
+class _Synchronized:
+    """Forwards attribute access to an object, calling its methods with a lock held"""
+
+    def __init__(self, target: Any, lock: threading.RLock):
+        self._target = target
+        self._lock = lock
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._target, name)
+        if callable(attribute):
+            @wraps(attribute)
+            def call(*args: Any, **kwargs: Any) -> Any:
+                with self._lock:
+                    return attribute(*args, **kwargs)
+            return call
+        if hasattr(attribute, '__dict__'):
+            # e.g. the control, move and status groups of the AMC API
+            return _Synchronized(attribute, self._lock)
+        return attribute
+
+
+def synchronized(target: T, lock: threading.RLock) -> T:
+    """Wrap a device object so that only one thread at a time calls its methods
+
+    Methods of nested objects (like ``device.control.setControlMove``) are
+    wrapped as well.
+
+    Args:
+        target: The device or library object
+        lock: The lock held during each call
+    """
+    return _Synchronized(target, lock)  # type: ignore[return-value]
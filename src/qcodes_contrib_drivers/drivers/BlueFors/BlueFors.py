@@ -2,12 +2,13 @@
 # Etienne Dumur <etienne.dumur@gmail.com>, september 2020
 
 import os
-import pandas as pd
 import numpy as np
-from datetime import date
-from typing import Optional, cast
+from datetime import date, timedelta
+from typing import Callable, Dict, Optional
 from qcodes.instrument import Instrument
 
+from qcodes_contrib_drivers.drivers.log_tail import LogTailReader
+
 class BlueFors(Instrument):
     """
     This is the QCoDeS python driver to extract the temperature and pressure
@@ -52,6 +53,9 @@ class BlueFors(Instrument):
         super().__init__(name = name, **kwargs)
 
         self.folder_path = os.path.abspath(folder_path)
+        self._log_reader = LogTailReader()
+        self._pressure_line: Optional[str] = None
+        self._pressures: Dict[int, float] = {}
 
         self.add_parameter(name       = 'pressure_vacuum_can',
                            unit       = 'mBar',
@@ -134,6 +138,37 @@ class BlueFors(Instrument):
         self.connect_message()
 
 
+    def _last_log_line(self, file_name: Callable[[str], str]) -> str:
+        """
+        Return the last complete line of the current day's log file. Right
+        after midnight, while the new file holds no complete line yet, the
+        last line of the previous day's file is returned.
+
+        Args:
+            file_name: Function returning the log file name for a folder name.
+
+        Returns:
+            line (str): Last line of the log file.
+        """
+
+        today = date.today()
+        first_error: Optional[OSError] = None
+        for day in (today, today - timedelta(days=1)):
+            folder_name = day.strftime("%y-%m-%d")
+            file_path = os.path.join(self.folder_path, folder_name, file_name(folder_name))
+            try:
+                line = self._log_reader.last_line(file_path)
+            except FileNotFoundError as err:
+                first_error = first_error or err
+                continue
+            if line is not None:
+                return line
+
+        if first_error is not None:
+            raise first_error
+        raise IndexError('log file holds no complete line')
+
+
     def get_temperature(self, channel: int) -> float:
         """
         Return the last registered temperature of the current day for the
@@ -146,41 +181,39 @@ class BlueFors(Instrument):
             temperature (float): Temperature of the channel in Kelvin.
         """
 
-        folder_name = date.today().strftime("%y-%m-%d")
-        file_path = os.path.join(self.folder_path, folder_name, 'CH'+str(channel)+' T '+folder_name+'.log')
-
         try:
-            df = pd.read_csv(file_path,
-                                delimiter = ',',
-                                names     = ['date', 'time', 'y'],
-                                header    = None)
-
-            date_series = cast(pd.Series[str], df["date"])
-            time_series = cast(pd.Series[str], df["time"])
-            data_time_str_series = date_series + "-" + time_series
-            try:
-                # There is a space before the day for old BlueFors Control Sofware versions
-                date_time = pd.to_datetime(
-                    data_time_str_series,
-                    format=" %d-%m-%y-%H:%M:%S",
-                )
-            except Exception:
-                # There is no space before the day with BlueFors Control Software v2.2
-                date_time = pd.to_datetime(
-                    data_time_str_series, format="%d-%m-%y-%H:%M:%S"
-                )
-            df["date_time"] = date_time
-            df.set_index("date_time", inplace=True)
-            df.sort_index(inplace=True)
-            return df.iloc[-1]["y"]
+            # Lines look like " 18-10-26,12:00:00,1.234e-02"
+            line = self._last_log_line(lambda folder_name: 'CH'+str(channel)+' T '+folder_name+'.log')
+            return float(line.split(',')[2])
         except (PermissionError, OSError) as err:
             self.log.warning('Cannot access log file: {}. Returning np.nan instead of the temperature value.'.format(err))
             return np.nan
-        except IndexError as err:
+        except (IndexError, ValueError) as err:
             self.log.warning('Cannot parse log file: {}. Returning np.nan instead of the temperature value.'.format(err))
             return np.nan
 
 
+    def get_pressures(self) -> Dict[int, float]:
+        """
+        Return the last registered pressures of the current day for all
+        channels of the maxigauge. They are parsed from the same log line,
+        which is only parsed once.
+
+        Returns:
+            pressures (dict): Pressure in mBar per channel (1 to 6).
+        """
+
+        line = self._last_log_line(lambda folder_name: 'maxigauge '+folder_name+'.log')
+        if line != self._pressure_line:
+            # Each channel has the fields name, void, status, pressure, void, void
+            # after the date and time fields
+            fields = line.split(',')
+            self._pressures = {channel: float(fields[5 + 6*(channel - 1)])
+                               for channel in range(1, 7)}
+            self._pressure_line = line
+        return self._pressures
+
+
     def get_pressure(self, channel: int) -> float:
         """
         Return the last registered pressure of the current day for the
@@ -193,69 +226,11 @@ class BlueFors(Instrument):
             pressure (float): Pressure of the channel in mBar.
         """
 
-        folder_name = date.today().strftime("%y-%m-%d")
-        file_path = os.path.join(self.folder_path, folder_name, 'maxigauge '+folder_name+'.log')
-
         try:
-            df = pd.read_csv(
-                file_path,
-                delimiter=",",
-                names=[
-                    "date",
-                    "time",
-                    "ch1_name",
-                    "ch1_void1",
-                    "ch1_status",
-                    "ch1_pressure",
-                    "ch1_void2",
-                    "ch1_void3",
-                    "ch2_name",
-                    "ch2_void1",
-                    "ch2_status",
-                    "ch2_pressure",
-                    "ch2_void2",
-                    "ch2_void3",
-                    "ch3_name",
-                    "ch3_void1",
-                    "ch3_status",
-                    "ch3_pressure",
-                    "ch3_void2",
-                    "ch3_void3",
-                    "ch4_name",
-                    "ch4_void1",
-                    "ch4_status",
-                    "ch4_pressure",
-                    "ch4_void2",
-                    "ch4_void3",
-                    "ch5_name",
-                    "ch5_void1",
-                    "ch5_status",
-                    "ch5_pressure",
-                    "ch5_void2",
-                    "ch5_void3",
-                    "ch6_name",
-                    "ch6_void1",
-                    "ch6_status",
-                    "ch6_pressure",
-                    "ch6_void2",
-                    "ch6_void3",
-                    "void",
-                ],
-                header=None,
-            )
-
-            date_series = cast(pd.Series[str], df["date"])
-            time_series = cast(pd.Series[str], df["time"])
-            df["date_time"] = pd.to_datetime(
-                date_series + "-" + time_series, format="%d-%m-%y-%H:%M:%S"
-            )
-            df.set_index("date_time", inplace=True)
-            df.sort_index(inplace=True)
-
-            return df.iloc[-1]['ch'+str(channel)+'_pressure']
+            return self.get_pressures()[channel]
         except (PermissionError, OSError) as err:
             self.log.warning('Cannot access log file: {}. Returning np.nan instead of the pressure value.'.format(err))
             return np.nan
-        except IndexError as err:
+        except (IndexError, KeyError, ValueError) as err:
             self.log.warning('Cannot parse log file: {}. Returning np.nan instead of the pressure value.'.format(err))
             return np.nan
@@ -23,11 +23,13 @@ from qcodes.validators import Numbers
 from qcodes.instrument import VisaInstrument
 import pyvisa.constants as vi_const
 
+from qcodes_contrib_drivers.drivers.field_sweep import FieldSweepMixin
+
 
 log = logging.getLogger(__name__)
 
 
-class CryogenicSMS120C(VisaInstrument):
+class CryogenicSMS120C(FieldSweepMixin, VisaInstrument):
 
     """
     The following hard-coded, default values for Cryogenic magnets are safety limits
@@ -52,8 +54,18 @@ class CryogenicSMS120C(VisaInstrument):
             for 4K operation 0.12A/s (0.013605 T/s, 0.8163 T/min) - not recommended
 
     Note about timing : SMS120C needs a minimum of 200ms delay between commands being sent
+
+    ``start_field_sweep(val)`` ramps to a field without blocking and records the
+    field during the ramp, see :class:`~qcodes_contrib_drivers.drivers.field_sweep.FieldSweep`.
+    The sign of ``val`` selects the polarity. If the polarity has to change,
+    the sweep first ramps to zero, changes the polarity and then ramps on to
+    ``val``, still without blocking.
     """
 
+    # each readback of a sweep sends two commands (GET OUTPUT and RAMP STATUS),
+    # the unit is only checked when the sweep starts
+    field_sweep_interval = 0.5
+
     # Reg. exp. to match a float or exponent in a string
     _re_float_exp = r'[-+]?(\d+(\.\d*)?|\.\d+)([eE][-+]?\d+)?'
 
@@ -86,6 +98,9 @@ class CryogenicSMS120C(VisaInstrument):
         self._field_rating = coil_constant * \
             current_rating  # corresponding max field based
         self._field_ramp_limit = coil_constant * current_ramp_limit
+        # polarity and field of the second leg of a sweep through zero
+        self._pending_field_ramp = None
+        self._field_ramp_started = 0.0
 
         self.add_parameter(name='unit',
                            get_cmd=self._get_unit,
@@ -267,8 +282,8 @@ class CryogenicSMS120C(VisaInstrument):
         return maxField
 
     # Get current magnetic field, returns a float (if unit is Tesla, otherwise raises an exception)
-    def _get_field(self):
-        if self._get_unit() != 1:
+    def _get_field(self, check_unit=True):
+        if check_unit and self._get_unit() != 1:
             raise Exception('Controller is not in TESLA mode, switch to TESLA to get the field')
 
         _, value = self.query('GET OUTPUT')
@@ -470,24 +485,28 @@ class CryogenicSMS120C(VisaInstrument):
             # Check that field is not outside max.field limit
             if (self._get_unit() == 1 and (val <= self._get_maxField())) or (
                     self._get_unit() == 0 and (val <= self._current_rating)):
-                # pause the controller if it is currently ramping
-                self._set_pauseRamp(1)
-                self.ask('SET MID %0.2f' % val)       # Set target field
-                self._set_pauseRamp(0)               # Unpause the controller
-                # Ramp magnet/field to MID or ZERO (Note: Using standard write
-                # as read returns an error/is non-existent).
-                if val == 0:
-                    self.write('RAMP ZERO')
-                    log.info('Ramping magnetic field to zero...')
-                else:
-                    self.write('RAMP MID')
-                    log.info('Ramping magnetic field...')
+                self._ramp_to(val)
             else:
                 log.error(
                     'Target field is outside max. limits, please lower the target value.')
         else:
             log.error('Cannot set field - check magnet status.')
 
+    def _ramp_to(self, val):
+        # pause the controller if it is currently ramping
+        self._set_pauseRamp(1)
+        self.ask('SET MID %0.2f' % val)       # Set target field
+        self._set_pauseRamp(0)               # Unpause the controller
+        # Ramp magnet/field to MID or ZERO (Note: Using standard write
+        # as read returns an error/is non-existent).
+        if val == 0:
+            self.write('RAMP ZERO')
+            log.info('Ramping magnetic field to zero...')
+        else:
+            self.write('RAMP MID')
+            log.info('Ramping magnetic field...')
+        self._field_ramp_started = time.monotonic()
+
     def _set_field_bidirectional(self, val):
         polarity = self._get_polarity()
         desired_polarity = '-' if val < 0 else '+'
@@ -501,6 +520,69 @@ class CryogenicSMS120C(VisaInstrument):
 
         self._set_field(abs(val))
 
+    def _start_field_ramp(self, val):
+        """
+        Start ramping to the field ``val`` in tesla, whose sign selects the
+        polarity. If the polarity has to change, only the ramp to zero is
+        started, :meth:`_field_ramping` starts the ramp to ``val`` once the
+        magnet holds at zero.
+
+        Raises:
+            RuntimeError: If the controller is not in TESLA mode, the switch
+                heater is off or the magnet status does not allow ramping.
+            ValueError: If ``val`` exceeds the max. field.
+        """
+        if self._get_unit() != 1:
+            raise RuntimeError('Controller is not in TESLA mode, switch to TESLA '
+                               'to sweep the field')
+        if not self.switchHeater():
+            raise RuntimeError('Unable to sweep the field, switch heater is off, '
+                               'persistent mode may be active')
+        if not self._can_startRamping():
+            raise RuntimeError('Cannot sweep the field - check magnet status.')
+        max_field = self._get_maxField()
+        if abs(val) > max_field:
+            raise ValueError('Target field of {} T is outside the max. field of '
+                             '{} T'.format(val, max_field))
+
+        self._pending_field_ramp = None
+        polarity = '-' if val < 0 else '+'
+        if val == 0 or self._get_polarity() == polarity:
+            self._ramp_to(abs(val))
+        elif abs(self._get_field(check_unit=False)) <= 0.007:
+            self._change_polarity(polarity)
+            self._ramp_to(abs(val))
+        else:
+            self._ramp_to(0)
+            self._pending_field_ramp = (polarity, abs(val))
+
+    def _change_polarity(self, polarity):
+        if not self._set_polarity(polarity):
+            raise RuntimeError('Could not change the polarity to {}, check '
+                               'magnet.'.format(polarity))
+
+    def _field_ramping(self):
+        status = self._get_rampStatus()
+        if status >= 2:
+            self._pending_field_ramp = None
+            raise RuntimeError('Magnet ramp stopped: {}'.format(
+                self.rampStatus.inverse_val_mapping[status]))
+        # the controller may report holding for a moment after a ramp command
+        if status == 1 or (time.monotonic() - self._field_ramp_started
+                           < self.field_sweep_settle_time):
+            return True
+        if self._pending_field_ramp is not None:
+            polarity, val = self._pending_field_ramp
+            self._pending_field_ramp = None
+            self._change_polarity(polarity)
+            self._ramp_to(val)
+            return True
+        return False
+
+    def _read_swept_field(self):
+        # the unit was checked when the sweep started
+        return self._get_field(check_unit=False)
+
     def _wait_for_field_zero(self, field_threshold=0.003, refresh_time=0.1):
         """Waits for the field to be within a certain threshold"""
         while abs(self.field()) > field_threshold:
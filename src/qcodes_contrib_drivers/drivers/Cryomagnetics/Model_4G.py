@@ -12,10 +12,16 @@ from qcodes.instrument import VisaInstrument
 from qcodes import validators as vals
 from qcodes.parameters import create_on_off_val_mapping
 
-class Model_4G(VisaInstrument):
+from qcodes_contrib_drivers.drivers.field_sweep import FieldSweepMixin
+
+class Model_4G(FieldSweepMixin, VisaInstrument):
     """
     This is the qcodes driver for the cryomagnetics
     Model 4G superconducting magnet power supply.
+
+    start_field_sweep(set_pnt) sweeps the output to set_pnt (in kG) without
+    blocking and records field_supply during the sweep, see
+    qcodes_contrib_drivers.drivers.field_sweep.FieldSweep.
     """
 
     def __init__(self, name, address, **kwargs):
@@ -206,6 +212,27 @@ class Model_4G(VisaInstrument):
         while abs(set_pnt -  float(self.visa_handle.query('IOUT?')[:-2])) >= 0.05:
             time.sleep(.05)
 
+    def _start_field_ramp(self, set_pnt):
+        """Starts sweeping towards set_pnt like _set_mag, without waiting for the sweep to finish."""
+        if self.units() != 'G':
+            raise RuntimeError('Units must be in Gauss / kG ! ')
+
+        self._field_sweep_target = set_pnt
+        mag_now = self.field_supply()
+        if set_pnt > mag_now:
+            self.write('ULIM %s' % set_pnt)
+            self.write('SWEEP UP SLOW')
+        elif set_pnt < mag_now:
+            self.write('LLIM %s' % set_pnt)
+            self.write('SWEEP DOWN SLOW')
+
+    def _field_ramping(self):
+        # field_supply has just been read by the sweep poller
+        return abs(self._field_sweep_target - self.field_supply.get_latest()) >= 0.05
+
+    def _read_swept_field(self):
+        return self.field_supply()
+
     def _set_persistance_heater(self, val):
         if val == '0':
             self.write_raw('PSHTR OFF')
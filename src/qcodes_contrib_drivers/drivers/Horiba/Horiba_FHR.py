@@ -6,6 +6,8 @@ import ctypes
 import os
 import pathlib
 import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
 from typing import Any, Dict, Mapping, cast
 
 from qcodes.parameters import DelegateParameter, Parameter
@@ -150,6 +152,32 @@ class MotorChannel(Dispatcher, InstrumentChannel, metaclass=abc.ABCMeta):
             if raise_exception or str(se) != 'errAbort':
                 raise
 
+    def is_busy(self) -> bool:
+        """Check if the motor is moving."""
+        code, value = self.cli.SpeIsBusy(self.handle,
+                                         f'{self.type()}{self.motor}')
+        self.error_check(code)
+        return bool(value)
+
+    def wait_until_idle(self, timeout: float = 60.0, interval: float = 0.05):
+        """Wait until the motor stopped moving.
+
+        The motor is polled by the 32-bit server, so waiting costs a
+        single request regardless of the duration of the movement.
+
+        Parameters
+        ----------
+        timeout : float
+            Maximum time to wait in seconds. Raises an
+            'errConnectionTimeout' exception if exceeded.
+        interval : float
+            Time between two polls of the motor in seconds.
+        """
+        code, _ = self.cli.SpeWaitUntilIdle(self.handle,
+                                            f'{self.type()}{self.motor}',
+                                            timeout, interval)
+        self.error_check(code)
+
     def _set_position(self, pos: int):
         """Set motor position. It return final motor position after
         movement.
@@ -429,12 +457,44 @@ class HoribaFHR(Instrument):
         slits = ChannelList(self, 'slits', SlitChannel)
         mirrors = ChannelList(self, 'mirrors', DCChannel)
 
+        # Send the whole setup to the dll server in one request
+        with self.batch():
+            self._setup_channels(gratings, slits, mirrors, dc_val_mappings)
+
+        self.add_submodule('port', self._port)
+        self.add_submodule('mirrors', mirrors.to_channel_tuple())
+        self.add_submodule('slits', slits.to_channel_tuple())
+        self.add_submodule('gratings', gratings.to_channel_tuple())
+
+        self.active_grating = Parameter(
+            'active_grating',
+            get_cmd=lambda: getattr(self, '_active_grating', None),
+            set_cmd=self._set_active_grating,
+            set_parser=self._parse_grating,
+            label='Active grating',
+            instrument=self
+        )
+        """The currently active grating.
+
+        It can be set using either the number of lines (eg ``600``) or
+        the :class:`GratingChannel` object itself. If the set value is
+        not the currently active one, the selected grating will be
+        moved to the current one's position.
+        """
+
+        self.connect_message()
+
+    def _setup_channels(self, gratings: ChannelList, slits: ChannelList,
+                        mirrors: ChannelList,
+                        dc_val_mappings: Dict[int, Dict[str, Literal[0, 1]] | None]):
+        """Create and configure the channels from the configuration file."""
         for name, section in self.config.items():
             if name == 'Port':
                 # This relies on Port being the first section because otherwise
                 # communication with the device will fail.
                 port = PortChannel(self, 'port', self.cli, self.handle,
                                    _get_int_or_raise(section, 'ComPort'))
+                self._port = port
                 port.open.set(True)
                 port.set_baud_rate(_get_int_or_raise(section,'Baudrate'))
                 port.set_timeout(_get_int_or_raise(section, 'Timeout'))
@@ -528,29 +588,6 @@ class HoribaFHR(Instrument):
                 mirror.config = dict(section)
                 mirrors.append(mirror)
 
-        self.add_submodule('port', port)
-        self.add_submodule('mirrors', mirrors.to_channel_tuple())
-        self.add_submodule('slits', slits.to_channel_tuple())
-        self.add_submodule('gratings', gratings.to_channel_tuple())
-
-        self.active_grating = Parameter(
-            'active_grating',
-            get_cmd=lambda: getattr(self, '_active_grating', None),
-            set_cmd=self._set_active_grating,
-            set_parser=self._parse_grating,
-            label='Active grating',
-            instrument=self
-        )
-        """The currently active grating.
-
-        It can be set using either the number of lines (eg ``600``) or
-        the :class:`GratingChannel` object itself. If the set value is
-        not the currently active one, the selected grating will be
-        moved to the current one's position.
-        """
-
-        self.connect_message()
-
     def _set_active_grating(self, grating: GratingChannel):
         if (active_grating := self.active_grating.get()) is None:
             raise ValueError('No grating has previously been moved. Please '
@@ -563,6 +600,31 @@ class HoribaFHR(Instrument):
             grating = cast(GratingChannel, self.gratings.get_channel_by_name(f'grating_{grating}'))
         return grating
 
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Send all port and motor commands issued within the block to
+        the 32-bit server in one request.
+
+        Each command otherwise costs one inter-process round trip. The
+        commands are executed in order when the block exits, and an
+        exception is raised for the first one that fails. Only use it
+        for commands whose return value is not needed, e.g. setting
+        positions, setups and ``wait_until_idle``.
+        """
+        with self.cli.batched() as results:
+            yield
+        for dispatcher, function, code, _ in results:
+            if code != 0:
+                raise SpeError(f'{Dispatcher._ERROR_CODES.get(code)} '
+                               f'({dispatcher} {function})')
+
+    def wait_until_idle(self, timeout: float = 60.0, interval: float = 0.05):
+        """Wait until all gratings and slits stopped moving, in a single
+        request to the 32-bit server."""
+        with self.batch():
+            for channel in (*self.gratings, *self.slits):
+                channel.wait_until_idle(timeout, interval)
+
     def get_idn(self) -> Dict[str, str | None]:
         return {'serial': self.config['Firmware']['SerialNumber'],
                 'firmware': self.config['Firmware']['VersionNumber'],
@@ -3,8 +3,10 @@ from __future__ import annotations
 import ctypes
 import os
 import pathlib
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Tuple
+from typing import Any, List, Optional, Tuple
 
 from qcodes.utils import DelayedKeyboardInterrupt
 
@@ -17,16 +19,59 @@ except ImportError:
 
 
 class FHRClient(Client64):
+    # dll function called by the batchable methods other than SpeCommand
+    _BATCH_FUNCTIONS = {'SpeCommandSetup': 'SetSetup',
+                        'SpeCommandIniParams': 'SetIniParams',
+                        'SpeWaitUntilIdle': 'WaitUntilIdle'}
 
     def __init__(self, dll_dir: str | os.PathLike | pathlib.Path,
                  filename: str = 'SpeControl'):
         module32 = str(Path(__file__).parent / 'fhr_server')
         super().__init__(module32=module32, dll_dir=dll_dir, filename=filename)
+        self._batch: Optional[List[Tuple[str, Tuple[Any, ...]]]] = None
 
     def request32(self, name: str, *args, **kwargs) -> Any:
         with DelayedKeyboardInterrupt():
             return super().request32(name, *args, **kwargs)
 
+    def _request_or_queue(self, name: str, *args) -> Tuple[int, Any]:
+        if self._batch is not None:
+            self._batch.append((name, args))
+            return 0, None
+        return self.request32(name, *args)
+
+    @contextmanager
+    def batched(self) -> Iterator[List[Tuple[str, str, int, int | None]]]:
+        """Send all commands issued within the block in one request.
+
+        Within the block, SpeCommand, SpeCommandSetup,
+        SpeCommandIniParams and SpeWaitUntilIdle are queued and
+        immediately return (0, None), so only use it for commands whose
+        return value is not needed. The queued commands are executed
+        in order when the block exits, stopping at the first error. The
+        yielded list is then filled with (dispatcher, function, code,
+        value) for each executed command. If the block raises, nothing
+        is sent.
+        """
+        if self._batch is not None:
+            # nested block, the outer block sends the commands
+            yield []
+            return
+
+        self._batch = []
+        results: List[Tuple[str, str, int, int | None]] = []
+        try:
+            yield results
+            calls, self._batch = self._batch, None
+            if calls:
+                replies = self.request32('SpeBatch', calls)
+                for (name, args), (code, value) in zip(calls, replies):
+                    function = (args[2] if name == 'SpeCommand'
+                                else self._BATCH_FUNCTIONS[name])
+                    results.append((args[1], function, code, value))
+        finally:
+            self._batch = None
+
     def CreateSpe(self) -> int:
         """Create new spectrometer handle."""
         return self.request32('CreateSpe')
@@ -42,7 +87,7 @@ class FHRClient(Client64):
         """Send command (execute a function) named "a_fun" for the
         function dispatcher named "a_dsp" for the spectrometer handled
         "h_spe". "a_par" is a pointer to the function parameters."""
-        return self.request32('SpeCommand', h_spe, a_dsp, a_fun, aPar)
+        return self._request_or_queue('SpeCommand', h_spe, a_dsp, a_fun, aPar)
 
     def SpeCommandSetup(self, h_spe: int, a_dsp: str,
                         fields: Tuple[int, ...]) -> Tuple[int, None]:
@@ -52,7 +97,7 @@ class FHRClient(Client64):
         must be defined in the 32-bit module. Otherwise, the 32-bit
         executable would need to know about qcodes_contrib_drivers.
         """
-        return self.request32('SpeCommandSetup', h_spe, a_dsp, fields)
+        return self._request_or_queue('SpeCommandSetup', h_spe, a_dsp, fields)
 
     def SpeCommandIniParams(self, h_spe: int, a_dsp: str,
                             fields: Tuple[int, ...]) -> Tuple[int, None]:
@@ -62,4 +107,19 @@ class FHRClient(Client64):
         must be defined in the 32-bit module. Otherwise, the 32-bit
         executable would need to know about qcodes_contrib_drivers.
         """
-        return self.request32('SpeCommandIniParams', h_spe, a_dsp, fields)
+        return self._request_or_queue('SpeCommandIniParams', h_spe, a_dsp, fields)
+
+    def SpeIsBusy(self, h_spe: int, a_dsp: str) -> Tuple[int, int | None]:
+        """Check if the motor of dispatcher "a_dsp" is moving."""
+        return self.request32('SpeIsBusy', h_spe, a_dsp)
+
+    def SpeWaitUntilIdle(self, h_spe: int, a_dsp: str, timeout: float = 60.0,
+                         interval: float = 0.05) -> Tuple[int, int | None]:
+        """Wait until the motor of dispatcher "a_dsp" stopped moving.
+
+        The motor is polled within the 32-bit server, so this costs a
+        single round trip. Returns the code errConnectionTimeout (5) if
+        the motor is still busy after "timeout" seconds.
+        """
+        return self._request_or_queue('SpeWaitUntilIdle', h_spe, a_dsp,
+                                      timeout, interval)
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import logging
+import time
 from pathlib import Path
-from typing import Tuple
+from typing import Any, List, Tuple
 
 from msl.loadlib import Server32
 
@@ -40,6 +41,10 @@ class FHRServer(Server32):
                     ('MaxSpeed', ctypes.c_int),
                     ('Ramp', ctypes.c_int)]
 
+    _BATCH_METHODS = frozenset({'SpeCommand', 'SpeCommandSetup',
+                                'SpeCommandIniParams', 'SpeIsBusy',
+                                'SpeWaitUntilIdle'})
+
     def __init__(self, host, port, dll_dir='', filename='SpeControl'):
         path = str(Path(dll_dir, filename).with_suffix('.dll'))
 
@@ -109,3 +114,47 @@ class FHRServer(Server32):
         """
         iniParams = self._SpeIniParams(20, *fields)
         return self.SpeCommand(h_spe, a_dsp, 'SetIniParams', iniParams)
+
+    def SpeIsBusy(self, h_spe: int, a_dsp: str) -> Tuple[int, int | None]:
+        """Check if the motor of dispatcher "a_dsp" is moving."""
+        return self.SpeCommand(h_spe, a_dsp, 'IsBusy', ctypes.c_int())
+
+    def SpeWaitUntilIdle(self, h_spe: int, a_dsp: str, timeout: float,
+                         interval: float) -> Tuple[int, int | None]:
+        """Wait until the motor of dispatcher "a_dsp" stopped moving.
+
+        The motor is polled every "interval" seconds within the server,
+        so the client only waits for a single reply. Returns the code
+        errConnectionTimeout (5) if the motor is still busy after
+        "timeout" seconds.
+        """
+        LOG.info(f'Waiting for {a_dsp} to become idle.')
+        deadline = time.monotonic() + timeout
+        while True:
+            code, busy = self.SpeIsBusy(h_spe, a_dsp)
+            if code != 0 or not busy:
+                return code, busy
+            if time.monotonic() > deadline:
+                return 5, busy
+            time.sleep(interval)
+
+    def SpeBatch(self, calls: List[Tuple[str, Tuple[Any, ...]]]
+                 ) -> List[Tuple[int, int | None]]:
+        """Execute several calls in one request.
+
+        "calls" is a list of (method name, arguments) for the methods
+        SpeCommand, SpeCommandSetup, SpeCommandIniParams, SpeIsBusy and
+        SpeWaitUntilIdle. The calls are executed in order until one
+        returns an error code. Returns the (code, value) results of the
+        executed calls.
+        """
+        LOG.info(f'Executing batch of {len(calls)} calls.')
+        results = []
+        for name, args in calls:
+            if name not in self._BATCH_METHODS:
+                raise ValueError(f'{name} cannot be called in a batch.')
+            code, value = getattr(self, name)(*args)
+            results.append((code, value))
+            if code != 0:
+                break
+        return results
@@ -1,21 +1,57 @@
 import time
 import base64
-import struct
+import logging
+from collections.abc import Callable, Iterator
+from typing import Any, Optional
+
+import numpy as np
 
 from qcodes.instrument import VisaInstrument
+from qcodes.parameters import MultiParameter
 
 from qcodes_contrib_drivers.drivers.Lakeshore.modules.vm10 import vm10
 from qcodes_contrib_drivers.drivers.Lakeshore.modules.bcs10 import bcs10
 from qcodes_contrib_drivers.drivers.Lakeshore.modules.vs10 import vs10
 from qcodes_contrib_drivers.drivers.Lakeshore.modules.cm10 import cm10
 
+log = logging.getLogger(__name__)
+
+class FetchMultipleParameter(MultiParameter):
+    """
+    Fetches several data sources of the M81 with a single
+    ``FETCh:MULTiple?`` query, so that all values are time aligned.
+    """
+    def __init__(self, name: str, instrument: "M81_SSM", data_sources, **kwargs) -> None:
+        """
+        Args:
+            name: name of the parameter
+            instrument: M81 the parameter is bound to
+            data_sources: sequence of (DATASOURCE_MNEMONIC, CHANNEL_INDEX) pairs
+        """
+        self.data_sources = tuple((str(mnemonic), int(index)) for (mnemonic, index) in data_sources)
+        names = tuple(f"{mnemonic}{index}" for (mnemonic, index) in self.data_sources)
+        super().__init__(name=name,
+                         instrument=instrument,
+                         names=names,
+                         shapes=tuple(() for _ in names),
+                         labels=names,
+                         units=tuple(instrument._data_source_unit(mnemonic, index)
+                                     for (mnemonic, index) in self.data_sources),
+                         setpoints=tuple(() for _ in names),
+                         **kwargs)
+
+    def get_raw(self) -> tuple:
+        assert isinstance(self.instrument, M81_SSM)
+        return self.instrument.fetch_multiple(*self.data_sources)
+
+
 class M81_SSM(VisaInstrument):
     """
     Driver class for the QCoDeS Lakeshore M81 *** Firmware version >= 2.1 ***
     """
     def __init__(self, name: str, address: str, **kwargs):
 
-        super().__init__(name, address, terminator='\r\n')
+        super().__init__(name, address, terminator='\r\n', **kwargs)
 
         self.add_parameter(name='keypad_lock',
                         label='keypad lock status',
@@ -72,7 +108,7 @@ class M81_SSM(VisaInstrument):
             full_sense_list.append((f"{i} : {self.ask(f'SENSe{i}:MODel?')}"))
         return full_sense_list
 
-    data_source_types = {
+    data_source_types: dict[str, Callable[[str], Any]] = {
         'RTIMe': float,
         'SAMPlitude': float,
         'SOFFset': float,
@@ -98,6 +134,62 @@ class M81_SSM(VisaInstrument):
         'GPOStates': int,
     }
 
+    def _data_source_unit(self, mnemonic: str, index: int) -> str:
+        """ Unit of a data source, based on the type of the module it refers to """
+        match mnemonic:
+            case 'RTIMe': return 's'
+            case 'SFRequency' | 'MRFRequency': return 'Hz'
+            case 'MTHeta': return 'deg'
+            case 'SAMPlitude' | 'SOFFset' | 'SRANge':
+                module = self.submodules.get(f'S{index}')
+                return 'A' if isinstance(module, bcs10) else 'V'
+            case 'MDC' | 'MRMs' | 'MPPeak' | 'MNPeak' | 'MPTPeak' | 'MX' | 'MY' | 'MR' | 'MRANge':
+                module = self.submodules.get(f'M{index}')
+                return 'A' if isinstance(module, cm10) else 'V'
+            case _: return ''
+
+    def fetch_multiple(self, *data_sources) -> tuple:
+        """
+        Fetches the latest values of several data sources with a single
+        ``FETCh:MULTiple?`` query. All values refer to the same instant.
+
+            Args:
+                data_sources (str, int): Variable length list of pairs of (DATASOURCE_MNEMONIC, CHANNEL_INDEX).
+
+            Returns:
+                Tuple with the parsed value of each data source, in the order requested.
+        """
+        if not data_sources:
+            raise ValueError('At least one data source must be given')
+        for (mnemonic, _) in data_sources:
+            if mnemonic not in self.data_source_types:
+                raise ValueError(f'Unknown data source {mnemonic!r}, must be one of '
+                                 f'{list(self.data_source_types)}')
+
+        elements = ','.join('{},{}'.format(mnemonic, index) for (mnemonic, index) in data_sources)
+        values = self.ask('FETCh:MULTiple? {}'.format(elements)).split(',')
+        if len(values) != len(data_sources):
+            raise RuntimeError(f'Expected {len(data_sources)} values from FETCh:MULTiple?, '
+                               f'got {len(values)}')
+
+        return tuple(self.data_source_types[mnemonic](value)
+                     for (mnemonic, _), value in zip(data_sources, values))
+
+    def add_fetch_multiple_parameter(self, name: str, *data_sources) -> FetchMultipleParameter:
+        """
+        Adds a MultiParameter that fetches the given data sources in one query, e.g.
+        ``m81.add_fetch_multiple_parameter('xy', ('MX', 1), ('MY', 1), ('MX', 2), ('MY', 2))``.
+
+            Args:
+                name (str): Name of the new parameter.
+                data_sources (str, int): Variable length list of pairs of (DATASOURCE_MNEMONIC, CHANNEL_INDEX).
+
+            Returns:
+                The new parameter
+        """
+        return self.add_parameter(name, parameter_class=FetchMultipleParameter,
+                                  data_sources=data_sources)
+
     def _configure_stream_elements(self, data_sources):
         """
         Sets the elements to include in the data stream. Takes a list of pairs of data source mnemonic and channel number. Up to 10 pairs.
@@ -105,17 +197,65 @@ class M81_SSM(VisaInstrument):
         elements = ','.join('{},{}'.format(mnemonic, index) for (mnemonic, index) in data_sources)
         self.write('TRACe:FORMat:ELEMents {}'.format(elements))
 
-    def stream_data(self, rate, num_points, *data_sources, transpose_data=True):
-        """Generator object to stream data from the instrument.
+    # struct format characters of TRACe:FORMat:ENCOding:B64:BFORmat? mapped
+    # onto the equivalent (little endian) numpy types
+    _stream_dtype_codes = {
+        'd': '<f8',
+        'f': '<f4',
+        '?': '?',
+        'b': 'i1',
+        'B': 'u1',
+        'h': '<i2',
+        'H': '<u2',
+        'i': '<i4',
+        'I': '<u4',
+        'l': '<i4',
+        'L': '<u4',
+        'q': '<i8',
+        'Q': '<u8',
+    }
+
+    def _stream_dtype(self, data_sources) -> np.dtype:
+        """
+        Builds the structured dtype of one stream record from the binary
+        format reported by the instrument. Fields are named after the
+        data source mnemonic and channel index, e.g. ``MX1``.
+        """
+        format_val = self.ask('TRACe:FORMat:ENCOding:B64:BFORmat?').strip('"').lstrip('<')
+        if len(format_val) != len(data_sources):
+            raise RuntimeError(
+                f'Stream format {format_val!r} does not match the '
+                f'{len(data_sources)} configured data sources')
+        fields = []
+        for code, (mnemonic, index) in zip(format_val, data_sources):
+            if code not in self._stream_dtype_codes:
+                raise RuntimeError(f'Unsupported stream format character {code!r}')
+            fields.append((f'{mnemonic}{index}', self._stream_dtype_codes[code]))
+        return np.dtype(fields)
+
+    def stream_data_chunks(self, rate, num_points, *data_sources,
+                           poll_interval: float = 0.05,
+                           timeout: Optional[float] = None) -> Iterator[tuple[np.ndarray, ...]]:
+        """Generator streaming data from the instrument as it is acquired.
+
+            Partial blocks are fetched with ``TRACe:DATA?`` while the
+            acquisition is running and decoded in one pass with
+            ``np.frombuffer``. The stream ends once ``num_points`` points
+            were collected or ``timeout`` has passed, and is stopped on the
+            instrument when the generator ends, fails or is closed early
+            (e.g. by breaking out of a loop over it).
 
             Args:
                 rate (int): Desired transfer rate in samples/sec. The maximum stream rate is 5000 samples/s.
                 num_points (int): Number of points to return. None to stream indefinitely.
                 data_sources (str, int): Variable length list of pairs of (DATASOURCE_MNEMONIC, CHANNEL_INDEX).
-                transpose_data (bool): transposes the data retured to get an array for each parameter streamed.
+                poll_interval (float): Time in seconds to wait before polling again when no new data is available.
+                timeout (float): Maximum duration of the stream in seconds. None to stream until
+                    ``num_points`` points were collected.
 
             Yields:
-                Stream data as a list
+                Tuple with one array per data source, containing the newly
+                acquired points. The arrays are views on the received block.
         """
 
         self._configure_stream_elements(data_sources)
@@ -126,39 +266,80 @@ class M81_SSM(VisaInstrument):
 
         self.write('TRACe:RATE {}'.format(rate))
 
-        #start streaming
-        self.write('TRACe:STARt {}'.format(num_points))
-        print('Streaming...')
-
-        # data counter
-        count = 0
-        while count < num_points:
-            time.sleep(1) # or what ever small value
-            count = int(self.ask("TRACe:DATA:COUNt?"))
-            print(f"\rBuffered points: {count}         ", end="", flush=True)
+        dtype = self._stream_dtype(data_sources)
+        names = dtype.names or ()
 
-        time.sleep(1)
-        print('\r')
+        #start streaming
+        if num_points is None:
+            self.write('TRACe:STARt')
+        else:
+            self.write('TRACe:STARt {}'.format(num_points))
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        num_collected = 0
+        remainder = b''
+        try:
+            while num_points is None or num_collected < num_points:
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+                block = self.ask('TRACe:DATA?').strip().strip('"')
+                if not block:
+                    time.sleep(poll_interval)
+                    continue
+
+                raw = remainder + base64.b64decode(block)
+                n_records = len(raw) // dtype.itemsize
+                remainder = raw[n_records * dtype.itemsize:]
+                if n_records == 0:
+                    continue
+                if num_points is not None:
+                    n_records = min(n_records, num_points - num_collected)
+
+                records = np.frombuffer(raw, dtype=dtype, count=n_records)
+                num_collected += n_records
+                yield tuple(records[name] for name in names)
+        finally:
+            try:
+                self.write('TRACe:STOP')
+            except Exception:
+                # the connection may already be closed or broken
+                log.warning('Failed to stop the data stream', exc_info=True)
+
+    def stream_data(self, rate, num_points, *data_sources, transpose_data=True,
+                    timeout: Optional[float] = None):
+        """Stream data from the instrument and return it once all points are acquired.
 
-        # pull data
-        string_bytes = base64.b64decode(self.ask('TRACe:DATA:ALL?')).hex()
+            Args:
+                rate (int): Desired transfer rate in samples/sec. The maximum stream rate is 5000 samples/s.
+                num_points (int): Number of points to return.
+                data_sources (str, int): Variable length list of pairs of (DATASOURCE_MNEMONIC, CHANNEL_INDEX).
+                transpose_data (bool): transposes the data retured to get an array for each parameter streamed.
+                timeout (float): Maximum duration of the stream in seconds.
 
-        format_val = self.ask('TRACe:FORMat:ENCOding:B64:BFORmat?').strip('\"')
-        data_format = f"<{format_val}"
+            Returns:
+                A list with one array per data source if ``transpose_data``
+                is True, otherwise a list of tuples, one per point.
+        """
+        print('Streaming...')
 
-        data_list = []
-        for data in struct.iter_unpack(data_format, bytes.fromhex(string_bytes)):
-            data_list.append(data)
+        chunks = list(self.stream_data_chunks(rate, num_points, *data_sources, timeout=timeout))
+        if chunks:
+            columns = [np.concatenate([chunk[i] for chunk in chunks])
+                       for i in range(len(data_sources))]
+        else:
+            # no data arrived before the timeout
+            columns = [np.empty(0) for _ in data_sources]
+        n_collected = len(columns[0]) if columns else 0
 
-        if len(data_list)==num_points:
+        if n_collected==num_points:
             print('All data collected.')
-        elif len(data_list)!=num_points:
-            print(f'Only {len(data_list)} data points collected.')
+        else:
+            print(f'Only {n_collected} data points collected.')
 
         if transpose_data == True:
-            data_list = [list(x) for x in zip(*data_list)]
+            return columns
 
-        return data_list
+        return list(zip(*(column.tolist() for column in columns)))
 
     def close(self) -> None:
         """
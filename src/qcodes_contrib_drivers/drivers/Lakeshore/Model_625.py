@@ -6,8 +6,10 @@ from typing import Union, Tuple, Optional
 from qcodes.instrument import VisaInstrument
 from qcodes.validators import  Numbers, Enum
 
+from qcodes_contrib_drivers.drivers.field_sweep import FieldSweepMixin
 
-class Lakeshore625(VisaInstrument):
+
+class Lakeshore625(FieldSweepMixin, VisaInstrument):
     """
     Driver for the Lakeshore Model 625 superconducting magnet power supply.
 
@@ -24,6 +26,9 @@ class Lakeshore625(VisaInstrument):
         - enable or disable support for the persistent switch heater. If set to `None`, nothing is changed
         ramp_segments_enabled (bool | None) = False:
         - enable or disable ramp segments. If set to `None`, nothing is changed.
+
+    Use `start_field_sweep(value)` to ramp the field without blocking while recording
+    it, see `qcodes_contrib_drivers.drivers.field_sweep.FieldSweep`.
     """
 
     def __init__(self, name: str, coil_constant: Optional[float],  field_ramp_rate: Optional[float], address: str,
@@ -606,3 +611,12 @@ class Lakeshore625(VisaInstrument):
         self._sleep(2.0)
         self.log.debug(f'Finished blocking ramp')
         return
+
+    def _start_field_ramp(self, value: float) -> None:
+        self.set_field(value, block=False)
+
+    def _field_ramping(self) -> bool:
+        return self.ramping_state() == 'ramping'
+
+    def _read_swept_field(self) -> float:
+        return self.field()
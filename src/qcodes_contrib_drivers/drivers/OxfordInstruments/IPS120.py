@@ -15,15 +15,20 @@ from qcodes import validators as vals
 from time import sleep
 import pyvisa
 
+from qcodes_contrib_drivers.drivers.field_sweep import FieldSweepMixin
+
 
 log = logging.getLogger(__name__)
 
-class OxfordInstruments_IPS120(VisaInstrument):
+class OxfordInstruments_IPS120(FieldSweepMixin, VisaInstrument):
     """This is the driver for the Oxford Instruments IPS 120 Magnet Power Supply
 
     The IPS 120 can connect through both RS232 serial as well as GPIB. The
     commands sent in both cases are similar. When using the serial connection,
     commands are prefaced with '@n' where n is the ISOBUS number.
+
+    ``start_field_sweep(field_value)`` starts a sweep to a field in Tesla
+    without blocking, see :class:`~qcodes_contrib_drivers.drivers.field_sweep.FieldSweep`.
     """
 
     _GET_STATUS_MODE = {
@@ -243,9 +248,10 @@ class OxfordInstruments_IPS120(VisaInstrument):
         if self._use_gpib:
             return self.ask(message)
 
-        self.visa_handle.write('@%s%s' % (self._number, message))
-        sleep(self._WRITE_WAIT)  # wait for the device to be able to respond
-        result = self._read()
+        with self._field_sweep_lock:
+            self.visa_handle.write('@%s%s' % (self._number, message))
+            sleep(self._WRITE_WAIT)  # wait for the device to be able to respond
+            result = self._read()
         if result.find('?') >= 0:
             print("Error: Command %s not recognized" % message)
         else:
@@ -810,6 +816,20 @@ class OxfordInstruments_IPS120(VisaInstrument):
         self.get_all()
         self.local()
 
+    def _start_field_ramp(self, field_value):
+        if self.switch_heater() != self._GET_STATUS_SWITCH_HEATER[1]:
+            raise RuntimeError('Switch heater is off, cannot change the field.')
+        self.hold()
+        self.field_setpoint(field_value)
+        self.remote()
+        self.to_setpoint()
+
+    def _field_ramping(self):
+        return self.mode2() != self._GET_STATUS_MODE2[0]
+
+    def _read_swept_field(self):
+        return self.field()
+
     def heater_off(self):
         """Switch the heater off"""
         if (self.switch_heater() == self._GET_STATUS_SWITCH_HEATER[0] or
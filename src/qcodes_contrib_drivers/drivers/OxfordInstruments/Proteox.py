@@ -1,8 +1,9 @@
 """  oi.DECS driver for Proteox dilution refrigerator systems  """
 """ Developed and maintained by Oxford Instruments NanoScience """
 
+from collections.abc import Callable, Mapping
 from functools import partial
-from typing import Any, Union
+from typing import Any, Optional, Union
 import time
 import subprocess
 import platform
@@ -15,6 +16,8 @@ from qcodes_contrib_drivers.drivers.OxfordInstruments._decsvisa.src.decs_visa_to
 from qcodes_contrib_drivers.drivers.OxfordInstruments._decsvisa.src.decs_visa_tools.decs_visa_settings import HOST
 from qcodes_contrib_drivers.drivers.OxfordInstruments._decsvisa.src.decs_visa_tools.decs_visa_settings import SHUTDOWN
 from qcodes_contrib_drivers.drivers.OxfordInstruments._decsvisa.src.decs_visa_tools.decs_visa_settings import WRITE_DELIM
+from qcodes_contrib_drivers.drivers.OxfordInstruments._decs_push import DECSPushCache
+from qcodes_contrib_drivers.drivers.field_sweep import FieldSweepMixin
 
 '''
 
@@ -136,9 +139,55 @@ class MagnetCurrentParameters(MultiParameter):
         """
         print("*** Current cannot be set directly with this function ***")
 
-class oiDECS(VisaInstrument):
-    """ Main implementation of the oi.DECS driver """
-    def __init__(self, name, **kwargs):
+def _format_pushed(value: Any) -> str:
+    """
+    Format a pushed value like a reply of the DECS<->VISA server, so that
+    the parsers and val_mappings of the parameters apply: integral numbers
+    are sent without decimals, e.g. magnet state 10 as '10' and not '10.0'.
+    """
+    if isinstance(value, bool) or (isinstance(value, float) and value.is_integer()):
+        return str(int(value))
+    return str(value)
+
+
+class oiDECS(FieldSweepMixin, VisaInstrument):
+    """ Main implementation of the oi.DECS driver
+
+    Commands are sent through the DECS<->VISA socket server. Optionally, the
+    driver also connects directly to the oi.DECS WAMP router and subscribes to
+    the topics given in ``push_topics``: the values published there are kept
+    in a local cache, so getting the corresponding parameters does not query
+    the instrument, and the wait_until_* functions are woken up by the
+    publications instead of polling every second.
+
+    ``start_field_sweep((x, y, z), coord=..., sweep_rate=...)`` sweeps the
+    field vector without blocking and records it during the sweep, see
+    :class:`~qcodes_contrib_drivers.drivers.field_sweep.FieldSweep`.
+
+    Args:
+        name: Name of the instrument.
+        wamp_url: WebSocket URL of the oi.DECS WAMP router,
+            e.g. "ws://192.168.0.10:8080/ws". None (default) disables
+            the push updates.
+        wamp_realm: WAMP realm of oi.DECS.
+        push_topics: oi.DECS topic URI per driver command, e.g.
+            {"get_MC_T": "<topic publishing the MC temperature>",
+            "get_MAG_STATE": "<topic publishing the magnet state>"}.
+            See the oi.DECS API documentation of your system for the URIs.
+    """
+    # the magnet may report holding for up to 2 s after a sweep command
+    field_sweep_interval = 0.5
+    field_sweep_settle_time = 2.0
+
+    def __init__(self, name, wamp_url: Optional[str] = None,
+                 wamp_realm: Optional[str] = None,
+                 push_topics: Optional[Mapping[str, str]] = None, **kwargs):
+
+        self._push: Optional[DECSPushCache] = None
+        if wamp_url is not None:
+            if wamp_realm is None or not push_topics:
+                raise ValueError("wamp_realm and push_topics are required with wamp_url")
+            self._push = DECSPushCache(wamp_url, wamp_realm, push_topics)
 
         running_on = platform.platform()
         if running_on.startswith("Windows"):
@@ -152,6 +201,14 @@ class oiDECS(VisaInstrument):
 
         super().__init__(name, f'TCPIP::{HOST}::{PORT}::SOCKET', terminator=WRITE_DELIM, **kwargs)
 
+        if self._push is not None:
+            try:
+                self._push.start()
+            except Exception:
+                # stops decs_visa and closes the socket and the event loop
+                self.close()
+                raise
+
         self.add_parameter(
             "PT1_Head_Temperature",
             unit="K",
@@ -497,6 +554,63 @@ class oiDECS(VisaInstrument):
         """VRM utility function"""
         self.set_magnet_state(10)
 
+    def _start_field_ramp(self, target, coord, sweep_rate, sweep_mode='RATE',
+                          persist_on_completion=0):
+        x, y, z = target
+        self.set_magnet_target(coord, x, y, z, sweep_mode, sweep_rate, persist_on_completion)
+        self.sweep_field()
+
+    def _field_ramping(self) -> bool:
+        return not self.Magnet_State().startswith('Holding')
+
+    def _read_swept_field(self) -> tuple[float, float, float]:
+        return self._get_field_data()
+
+    def wait_until(self, predicate: Callable[[], bool], cmd: str,
+                   timeout: Optional[float] = None,
+                   poll_interval: float = 1.0) -> None:
+        """
+        Block until ``predicate`` returns True.
+
+        If the value of ``cmd`` is pushed (see ``push_topics``), ``predicate``
+        is evaluated whenever a new value is published. Otherwise it is
+        evaluated every ``poll_interval`` seconds.
+
+        Args:
+            predicate: Function without arguments, usually reading a parameter.
+            cmd: The command whose value ``predicate`` depends on, e.g. 'get_MAG_STATE'.
+            timeout: Maximum time to wait in seconds, None to wait forever.
+            poll_interval: Time between evaluations without push updates.
+
+        Raises:
+            TimeoutError: If ``predicate`` is not True within ``timeout``.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        push = self._push
+        if push is not None and push.subscribed(cmd):
+            met = push.wait_for(lambda: not push.connected or predicate(), timeout)
+            if push.connected:
+                if not met:
+                    raise TimeoutError(f'Condition on {cmd} not met within {timeout} s')
+                return
+            # the WAMP connection was lost, continue by polling
+
+        while not predicate():
+            if deadline is not None and time.monotonic() + poll_interval > deadline:
+                raise TimeoutError(f'Condition on {cmd} not met within {timeout} s')
+            time.sleep(poll_interval)
+
+    def _wait_for_magnet_state(self, state: str, timeout: Optional[float] = None) -> None:
+        self.wait_until(lambda: self.Magnet_State() == state, 'get_MAG_STATE', timeout)
+
+    def _wait_for_ramp_start(self) -> None:
+        # give the magnet up to 2 s to leave the hold state after a command
+        try:
+            self.wait_until(lambda: self.Magnet_State() != 'Holding Not Persistent',
+                            'get_MAG_STATE', timeout=2)
+        except TimeoutError:
+            pass
+
     def sweep_small_field_step(self, coord):
         '''
         Function sweeps a single VRM group.
@@ -505,11 +619,8 @@ class oiDECS(VisaInstrument):
         # sweep VRM group
         self.sweep_field()
         # wait until sweep failed
-        time.sleep(2)
-        status = self.Magnet_State()
-        while status != 'Holding Not Persistent':
-            status = self.Magnet_State()
-            time.sleep(1)
+        self._wait_for_ramp_start()
+        self._wait_for_magnet_state('Holding Not Persistent')
         # sweep X, Y or Z group of VRM
         if coord=='X':
             self._param_setter('set_MAG_X_STATE', 10)
@@ -518,78 +629,86 @@ class oiDECS(VisaInstrument):
         elif coord=='Z':
             self._param_setter('set_MAG_Z_STATE', 10)
 
-    def wait_until_field_stable(self):
-        """VRM utility function"""
-        time.sleep(2)
-        status = self.Magnet_State()
-        while status != 'Holding Not Persistent':
-            status = self.Magnet_State()
-            time.sleep(1)
+    def wait_until_field_stable(self, timeout: Optional[float] = None):
+        """VRM utility function.
+        Takes an optional timeout in seconds, raises TimeoutError when exceeded."""
+        self._wait_for_ramp_start()
+        self._wait_for_magnet_state('Holding Not Persistent', timeout)
         print(f'Status: {self.Magnet_State()}.')
 
     def wait_until_field_stable_timeout(self,timeout=600):
         """VRM utility function.
         Takes timeout in seconds, switches magnet to hold in timeout*1.1 +10s.
         Default is 10min"""
-        start=time.time()
         tout=timeout*1.1+10
-        status=self.Magnet_State()
-        while status != 'Holding Not Persistent':
-            status=self.Magnet_State()
-            time.sleep(1)
-            currenttime=time.time()
-            if ((currenttime-start)>tout):
-                self.set_magnet_state(0)
-                time.sleep(5)
-                status=self.Magnet_State()
+        try:
+            self._wait_for_magnet_state('Holding Not Persistent', tout)
+        except TimeoutError:
+            self.set_magnet_state(0)
+            self._wait_for_magnet_state('Holding Not Persistent')
         print(f'Status: {self.Magnet_State()}.')
 
-    def wait_until_field_persistent(self):
-        """VRM utility function"""
-        status = self.Magnet_State()
-        while status != 'Holding Persistent':
-            status = self.Magnet_State()
-            time.sleep(1)
+    def wait_until_field_persistent(self, timeout: Optional[float] = None):
+        """VRM utility function.
+        Takes an optional timeout in seconds, raises TimeoutError when exceeded."""
+        self._wait_for_magnet_state('Holding Persistent', timeout)
         print(f'Status: {self.Magnet_State()}.')
 
-    def wait_until_field_depersisted(self):
-        """VRM utility function"""
-        status = self.Magnet_State()
-        while status != 'Holding Not Persistent':
-            status = self.Magnet_State()
-            time.sleep(1)
+    def wait_until_field_depersisted(self, timeout: Optional[float] = None):
+        """VRM utility function.
+        Takes an optional timeout in seconds, raises TimeoutError when exceeded."""
+        self._wait_for_magnet_state('Holding Not Persistent', timeout)
         print(f'Status: {self.Magnet_State()}.')
 
-    def wait_until_temperature_stable_std_control(self, stable_mean, stable_std, time_between_readings):
+    def wait_until_temperature_stable_std_control(self, stable_mean, stable_std, time_between_readings,
+                                                  timeout: Optional[float] = None):
         """
         Mixing chamber temperature control utility function
 
         Takes a moving average of 30 temperature readings and finds the mean and the std of the last 30 readings,
         until the difference between the mean and target value is below 'stable_mean' and the standard deviation is below 'stable_std'.
 
+        If the mixing chamber temperature is pushed (see ``push_topics``), a
+        reading is taken whenever a new temperature is published, but at most
+        every 'time_between_readings' seconds.
+
         Args:
             stable_mean: float - difference between the mean and target value to be achieved by the last 30 temperature readings
             stable_std: float - standard deviation to be achieved by the last 30 temperature readings
             time_between_readings: float - time between taking temperature readings
+            timeout: float - maximum time to wait in seconds, None (default) to wait forever
 
+        Raises:
+            TimeoutError: If the temperature is not stable within 'timeout'.
         """
         target_temp = self.Mixing_Chamber_Temperature_Target()
 
         print(f'Waiting for temperature to stablilise at {target_temp} K.')
 
-        #take 30 temperature readings
+        push = self._push if self._push is not None and self._push.subscribed('get_MC_T') else None
         t1 = time.time()
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def next_reading() -> float:
+            updates = push.updates('get_MC_T') if push is not None else 0
+            time.sleep(time_between_readings)
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining < 0:
+                raise TimeoutError(f'Temperature not stable within {timeout} s')
+            if push is not None:
+                # wait for a temperature published after the previous reading
+                self.wait_until(lambda: push.updates('get_MC_T') > updates,
+                                'get_MC_T', remaining)
+            return float(self.Mixing_Chamber_Temperature())
+
+        #take 30 temperature readings
         t_array = np.zeros(30)
         for n in range(0,30):
-            time.sleep(time_between_readings)
-            temp = self.Mixing_Chamber_Temperature()
-            t_array[n] = float(temp)
+            t_array[n] = next_reading()
 
         stab = False
         while stab is False:
-            time.sleep(time_between_readings)
-            temp = self.Mixing_Chamber_Temperature()
-            t_array = np.append(t_array, float(temp))
+            t_array = np.append(t_array, next_reading())
 
             t_array = t_array[1:]
             s = np.std(t_array)
@@ -608,7 +727,15 @@ class oiDECS(VisaInstrument):
         Args:
             cmd: the command to send to the instrument
         """
-        resp = self.visa_handle.query(cmd)
+        if self._push is not None:
+            value = self._push.get(cmd)
+            if value is not None:
+                if isinstance(value, (list, tuple)):
+                    return ','.join(_format_pushed(v) for v in value)
+                return _format_pushed(value)
+
+        with self._field_sweep_lock:
+            resp = self.visa_handle.query(cmd)
 
         return resp
 
@@ -627,5 +754,7 @@ class oiDECS(VisaInstrument):
 
     def close(self) -> None:
         # Kill off the WAMP and socket connections
+        if self._push is not None:
+            self._push.stop()
         self.write(SHUTDOWN)
         return super().close()
@@ -1,14 +1,15 @@
 # This Python file uses the following encoding: utf-8
 # Etienne Dumur <etienne.dumur@gmail.com>, october 2020
 import os
-from typing import Optional
-import pandas as pd
+from typing import Dict, Optional
 import subprocess
 import time
 
 
 from qcodes.instrument import Instrument
 
+from qcodes_contrib_drivers.drivers.log_tail import LogTailReader
+
 
 class Triton(Instrument):
     """
@@ -16,6 +17,17 @@ class Triton(Instrument):
     from a Oxford Triton fridge.
     """
 
+    # Columns of the converted log file holding the channel values
+    _temperature_columns = {'50k': 'PT1 Plate T(K)',
+                            '4k': 'PT2 Plate T(K)',
+                            'magnet': 'Magnet T(K)',
+                            'still': 'Still T(K)',
+                            '100mk': '100mK Plate T(K)',
+                            'mc': 'MC RuO2 T(K)'}
+    _pressure_columns = {'condensation': 'P2 Condense (Bar)',
+                         'tank': 'P1 Tank (Bar)',
+                         'forepump': 'P5 ForepumpBack (Bar)'}
+
     def __init__(self, name: str, file_path: str, converter_path: str,
                  threshold_temperature: float = 4, conversion_timer: float = 30,
                  magnet: bool = False, **kwargs) -> None:
@@ -61,6 +73,9 @@ class Triton(Instrument):
         self.converter_path = os.path.abspath(converter_path)
         self.conversion_timer = conversion_timer
         self._timer = time.time()
+        self._log_reader = LogTailReader()
+        self._latest_line: Optional[str] = None
+        self._latest: Dict[str, float] = {}
 
         self.add_parameter(name='pressure_condensation_line',
                            unit='Bar',
@@ -149,6 +164,45 @@ class Triton(Instrument):
         else:
             return None
 
+    def get_latest(self) -> Dict[str, float]:
+        """
+        Return the last row of the converted log file as a dictionary of
+        values by column name.
+
+        The vcl file is converted at most every self.conversion_timer
+        seconds, see vcl2csv. Only the header and the last line of the
+        converted file are read, and the row is parsed only when the last
+        line changed, so all temperature and pressure parameters share one
+        parse per conversion.
+
+        Returns:
+            dict: Values of the last row by column name, e.g. 'Still T(K)'.
+        """
+
+        # Convert the vcl file into csv file
+        self.vcl2csv()
+
+        txt_path = self.file_path[:-3]+'txt'
+        line = self._log_reader.last_line(txt_path)
+        if line is None:
+            raise ValueError('Converted log file holds no data: '+txt_path)
+
+        if line != self._latest_line:
+            with open(txt_path, encoding=self._log_reader.encoding) as f:
+                header = f.readline().rstrip('\r\n').split('\t')
+            values = line.split('\t')
+            latest = {}
+            for column, value in zip(header, values):
+                try:
+                    latest[column] = float(value)
+                except ValueError:
+                    # e.g. the date and time columns
+                    continue
+            self._latest = latest
+            self._latest_line = line
+
+        return self._latest
+
     def get_temperature(self, channel: str) -> float:
         """
         Return the last registered temperature of the channel.
@@ -160,32 +214,22 @@ class Triton(Instrument):
             temperature: Temperature of the channel in Kelvin.
         """
 
-        # Convert the vcl file into csv file
-        self.vcl2csv()
+        if channel not in self._temperature_columns:
+            raise ValueError('Unknown channel: '+channel)
+
+        latest = self.get_latest()
 
-        df = pd.read_csv(self.file_path[:-3]+'txt', delimiter="\t")
-
-        if channel == '50k':
-            return df.iloc[-1]['PT1 Plate T(K)']
-        elif channel == '4k':
-            return df.iloc[-1]['PT2 Plate T(K)']
-        elif channel == 'magnet':
-            return df.iloc[-1]['Magnet T(K)']
-        elif channel == 'still':
-            return df.iloc[-1]['Still T(K)']
-        elif channel == '100mk':
-            return df.iloc[-1]['100mK Plate T(K)']
-        elif channel == 'mc':
+        if channel == 'mc':
             # There are two thermometers for the mixing chamber.
             # Depending of the threshold temperature we return one or the other
-            temp = df.iloc[-1]['MC cernox T(K)']
+            temp = latest['MC cernox T(K)']
 
             if temp > self.threshold_temperature:
                 return temp
             else:
-                return df.iloc[-1]['MC RuO2 T(K)']
-        else:
-            raise ValueError('Unknown channel: '+channel)
+                return latest['MC RuO2 T(K)']
+
+        return latest[self._temperature_columns[channel]]
 
     def get_pressure(self, channel: str) -> float:
         """
@@ -198,16 +242,7 @@ class Triton(Instrument):
             pressure: Pressure of the channel in Bar.
         """
 
-        # Convert the vcl file into csv file
-        self.vcl2csv()
-
-        df = pd.read_csv(self.file_path[:-3]+'txt', delimiter="\t")
-
-        if channel == 'condensation':
-            return df.iloc[-1]['P2 Condense (Bar)']
-        elif channel == 'tank':
-            return df.iloc[-1]['P1 Tank (Bar)']
-        elif channel == 'forepump':
-            return df.iloc[-1]['P5 ForepumpBack (Bar)']
-        else:
+        if channel not in self._pressure_columns:
             raise ValueError('Unknown channel: '+channel)
+
+        return self.get_latest()[self._pressure_columns[channel]]
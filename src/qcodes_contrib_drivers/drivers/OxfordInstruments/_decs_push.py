@@ -0,0 +1,185 @@
+"""
+In-process WAMP client keeping the latest values published by oi.DECS.
+
+oi.DECS publishes value changes on WAMP topics. ``DECSPushCache`` runs an
+autobahn session on an asyncio event loop in a background thread, subscribes
+to a set of topics and stores the latest value of each. Reading a value is
+then a local dictionary lookup, and waiting for a value to reach a target is
+woken up by the publication instead of polling. The background loop also
+keeps the WebSocket alive (auto ping) while the instrument is idle.
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Callable, Mapping
+from typing import Any, Optional
+
+from autobahn.asyncio.wamp import ApplicationRunner, ApplicationSession
+
+log = logging.getLogger(__name__)
+
+
+class DECSPushCache:
+    """
+    Latest values of oi.DECS topics, updated by WAMP publications.
+
+    Args:
+        url: WebSocket URL of the oi.DECS WAMP router, e.g.
+            ``"ws://192.168.0.10:8080/ws"``.
+        realm: WAMP realm of oi.DECS.
+        topics: Topic URI per key. The keys are the names under which the
+            values are stored, e.g. the oi.DECS command names of the driver.
+        connect_timeout: Time in seconds to wait for the session to join.
+    """
+
+    def __init__(self, url: str, realm: str, topics: Mapping[str, str],
+                 connect_timeout: float = 10.0) -> None:
+        self.url = url
+        self.realm = realm
+        self.topics = dict(topics)
+        self.connect_timeout = connect_timeout
+        self._values: dict[str, tuple[float, Any]] = {}
+        self._updates: dict[str, int] = {}
+        self._generation = 0
+        self._condition = threading.Condition()
+        self._joined = threading.Event()
+        self._disconnected = threading.Event()
+        self._session: Optional[ApplicationSession] = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever,
+                                        name=f"DECSPushCache({url})", daemon=True)
+
+    def start(self) -> None:
+        """
+        Start the event loop thread, connect and subscribe to the topics.
+
+        Raises:
+            TimeoutError: If the session did not join within the connect timeout.
+        """
+        self._thread.start()
+        connecting = asyncio.run_coroutine_threadsafe(self._connect(), self._loop)
+        if not self._joined.wait(self.connect_timeout):
+            connecting.cancel()
+            self.stop()
+            raise TimeoutError(f"Could not join realm {self.realm} at {self.url} "
+                               f"within {self.connect_timeout} s")
+
+    def stop(self) -> None:
+        """Leave the session, stop the event loop thread and close the loop."""
+        if self._loop.is_closed():
+            return
+        session = self._session
+        if self._thread.is_alive() and session is not None and session.is_attached():
+            self._disconnected.clear()
+            leaving = asyncio.run_coroutine_threadsafe(self._leave(session), self._loop)
+            try:
+                leaving.result(timeout=5)
+                # the router acknowledges the GOODBYE and closes the connection
+                self._disconnected.wait(timeout=5)
+            except Exception:
+                log.warning(f"Failed to leave the oi.DECS session at {self.url}",
+                            exc_info=True)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread.is_alive():
+            self._thread.join(timeout=5)
+        if not self._thread.is_alive():
+            self._loop.close()
+        self._joined.clear()
+
+    @property
+    def connected(self) -> bool:
+        """True while the session is joined."""
+        return self._joined.is_set()
+
+    def subscribed(self, key: str) -> bool:
+        """True if updates of ``key`` are pushed."""
+        return self.connected and key in self.topics
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Return the latest published value of ``key``, or None if it is not
+        subscribed or nothing was published since connecting.
+        """
+        if not self.subscribed(key):
+            return None
+        with self._condition:
+            entry = self._values.get(key)
+        return None if entry is None else entry[1]
+
+    def age(self, key: str) -> Optional[float]:
+        """Return the time in seconds since ``key`` was last published."""
+        with self._condition:
+            entry = self._values.get(key)
+        return None if entry is None else time.monotonic() - entry[0]
+
+    def updates(self, key: str) -> int:
+        """Return the number of publications of ``key`` since connecting."""
+        with self._condition:
+            return self._updates.get(key, 0)
+
+    def wait_for(self, predicate: Callable[[], bool],
+                 timeout: Optional[float] = None) -> bool:
+        """
+        Block until ``predicate`` returns True. It is evaluated right away and
+        after every publication of a subscribed topic. It is evaluated without
+        holding the lock of the cache, so it may query the instrument.
+
+        Args:
+            predicate: Function without arguments, e.g. reading values with get.
+            timeout: Maximum time to wait in seconds, None to wait forever.
+
+        Returns:
+            The last result of ``predicate``, i.e. False on timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._condition:
+                generation = self._generation
+            if predicate():
+                return True
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            with self._condition:
+                published = self._condition.wait_for(
+                    lambda: self._generation != generation, remaining)
+            if not published:
+                return predicate()
+
+    def _on_event(self, key: str, *args: Any, **kwargs: Any) -> None:
+        if args:
+            value = args[0] if len(args) == 1 else list(args)
+        else:
+            value = kwargs.get("value", kwargs)
+        with self._condition:
+            self._values[key] = (time.monotonic(), value)
+            self._updates[key] = self._updates.get(key, 0) + 1
+            self._generation += 1
+            self._condition.notify_all()
+
+    @staticmethod
+    async def _leave(session: ApplicationSession) -> None:
+        session.leave()
+
+    async def _connect(self) -> None:
+        cache = self
+
+        class _Session(ApplicationSession):
+            async def onJoin(self, details: Any) -> None:
+                for key, uri in cache.topics.items():
+                    await self.subscribe(
+                        lambda *args, _key=key, **kwargs: cache._on_event(_key, *args, **kwargs),
+                        uri)
+                cache._session = self
+                cache._joined.set()
+
+            def onDisconnect(self) -> None:
+                log.warning(f"Disconnected from oi.DECS at {cache.url}")
+                cache._joined.clear()
+                cache._disconnected.set()
+                with cache._condition:
+                    cache._values.clear()
+                    cache._generation += 1
+                    cache._condition.notify_all()
+
+        runner = ApplicationRunner(self.url, self.realm)
+        await runner.run(_Session, start_loop=False)
@@ -1,12 +1,14 @@
 import re
 import itertools
+from contextlib import contextmanager
 from time import sleep as sleep_s
+import numpy as np
 from qcodes.parameters import DelegateParameter
 from qcodes.instrument import VisaInstrument
 from qcodes import validators
 from pyvisa.errors import VisaIOError
 from typing import (
-    Tuple, Sequence, List, Dict, Set, Union, Optional)
+    Tuple, Sequence, List, Dict, Set, Union, Optional, Iterator)
 from packaging.version import parse
 
 # Version 0.5.0
@@ -105,6 +107,49 @@ def compress_channel_list(channel_list: str) -> str:
 relay_lines = 24
 relays_per_line = 9
 
+# Relay states as boolean arrays indexed by [line, tap].  Row 0 is unused so
+# that line numbers can be used as indices directly.
+RelayMask = np.ndarray
+
+
+def _empty_mask() -> RelayMask:
+    return np.zeros((relay_lines + 1, relays_per_line + 1), dtype=bool)
+
+
+def state_to_mask(state: State) -> RelayMask:
+    mask = _empty_mask()
+    if not state:
+        return mask
+    lines, taps = np.array(state, dtype=int).reshape(-1, 2).T
+    if lines.min() < 1 or lines.max() > relay_lines:
+        raise ValueError(f'Expected lines 1 to {relay_lines}, got {state}')
+    if taps.min() < 0 or taps.max() > relays_per_line:
+        raise ValueError(f'Expected taps 0 to {relays_per_line}, got {state}')
+    mask[lines, taps] = True
+    return mask
+
+
+def mask_to_state(mask: RelayMask) -> State:
+    taps, lines = np.nonzero(mask.T)
+    return list(zip(lines.tolist(), taps.tolist()))
+
+
+def mask_to_compressed_list(mask: RelayMask) -> str:
+    intervals = []
+    for tap in range(mask.shape[1]):
+        lines = np.flatnonzero(mask[:, tap])
+        if not lines.size:
+            continue
+        gaps = np.flatnonzero(np.diff(lines) != 1)
+        starts = np.concatenate(([lines[0]], lines[gaps + 1]))
+        ends = np.concatenate((lines[gaps], [lines[-1]]))
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            if start == end:
+                intervals.append(f'{start}!{tap}')
+            else:
+                intervals.append(f'{start}!{tap}:{end}!{tap}')
+    return '(@' + ','.join(intervals) + ')'
+
 
 def _state_diff(before: State, after: State) -> Tuple[State, State, State]:
     initial = frozenset(before)
@@ -112,8 +157,17 @@ def _state_diff(before: State, after: State) -> Tuple[State, State, State]:
     return list(target - initial), list(initial - target), list(target)
 
 
+def _mask_diff(before: RelayMask,
+               after: RelayMask) -> Tuple[RelayMask, RelayMask]:
+    changed = before ^ after
+    return changed & after, changed & before
+
+
 class QSwitch(VisaInstrument):
 
+    _relays: RelayMask
+    _pending_relays: Optional[RelayMask]
+
     def __init__(self, name: str, address: str, **kwargs) -> None:
         """Connect to a QSwitch
 
@@ -126,6 +180,7 @@ class QSwitch(VisaInstrument):
         super().__init__(name, address, terminator='\n', **kwargs)
         self._set_up_serial()
         self._set_up_debug_settings()
+        self._set_up_relay_state()
         self._set_up_simple_functions()
         self.connect_message()
         self._check_for_wrong_model()
@@ -197,21 +252,41 @@ class QSwitch(VisaInstrument):
     # -----------------------------------------------------------------------
 
     def close_relays(self, relays: State) -> None:
-        currently = channel_list_to_state(self._state)
-        union = list(itertools.chain(currently, relays))
-        self._effectuate(union)
+        self._change_relays(to_close=relays)
 
     def close_relay(self, line: int, tap: int) -> None:
         self.close_relays([(line, tap)])
 
     def open_relays(self, relays: State) -> None:
-        currently = frozenset(channel_list_to_state(self._state))
-        subtraction = frozenset(relays)
-        self._effectuate(list(currently - subtraction))
+        self._change_relays(to_open=relays)
 
     def open_relay(self, line: int, tap: int) -> None:
         self.open_relays([(line, tap)])
 
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Collect relay changes and send them as one operation
+
+        Inside the context, relay changes (by number or by name) are only
+        recorded.  On exit, the relays that need to close are closed with a
+        single command, and then the relays that need to open are opened
+        with a single command.  Relays closed and opened again within the
+        context are not touched.  If the context is left by an exception,
+        the recorded changes are discarded.  Nested transactions are part
+        of the outermost one.
+        """
+        if self._pending_relays is not None:
+            yield
+            return
+        self._pending_relays = self._relays.copy()
+        try:
+            yield
+        except BaseException:
+            self._pending_relays = None
+            raise
+        target, self._pending_relays = self._pending_relays, None
+        self._effectuate_mask(target)
+
     # -----------------------------------------------------------------------
     # Manipulation by name
     # -----------------------------------------------------------------------
@@ -219,37 +294,23 @@ class QSwitch(VisaInstrument):
     OneOrMore = Union[str, Sequence[str]]
 
     def ground(self, lines: OneOrMore) -> None:
-        connections: List[Tuple[int, int]] = []
-        if isinstance(lines, str):
-            line = self._to_line(lines)
-            self.close_relay(line, 0)
-            taps = range(1, relays_per_line + 1)
-            connections = list(itertools.zip_longest([], taps, fillvalue=line))
-            self.open_relays(connections)
-        else:
-            numbers = map(self._to_line, lines)
-            grounds = list(itertools.zip_longest(numbers, [], fillvalue=0))
-            self.close_relays(grounds)
-            for tap in range(1, relays_per_line + 1):
-                connections += itertools.zip_longest(
-                                    map(self._to_line, lines), [], fillvalue=tap)
-            self.open_relays(connections)
+        numbers = self._to_lines(lines)
+        taps = range(1, relays_per_line + 1)
+        self._change_relays(
+            to_close=[(line, 0) for line in numbers],
+            to_open=list(itertools.product(numbers, taps)))
 
     def connect(self, lines: OneOrMore) -> None:
-        if isinstance(lines, str):
-            self.close_relay(self._to_line(lines), 9)
-            self.open_relay(self._to_line(lines), 0)
-        else:
-            numbers = map(self._to_line, lines)
-            pairs = list(itertools.zip_longest(numbers, [], fillvalue=9))
-            self.close_relays(pairs)
-            numbers = map(self._to_line, lines)
-            connections = list(itertools.zip_longest(numbers, [], fillvalue=0))
-            self.open_relays(connections)
+        numbers = self._to_lines(lines)
+        self._change_relays(
+            to_close=[(line, 9) for line in numbers],
+            to_open=[(line, 0) for line in numbers])
 
     def breakout(self, line: str, tap: str) -> None:
-        self.close_relay(self._to_line(line), self._to_tap(tap))
-        self.open_relay(self._to_line(line), 0)
+        number = self._to_line(line)
+        self._change_relays(
+            to_close=[(number, self._to_tap(tap))],
+            to_open=[(number, 0)])
 
     def arrange(self, breakouts: Optional[Dict[str, int]] = None,
                 lines: Optional[Dict[str, int]] = None) -> None:
@@ -378,6 +439,11 @@ class QSwitch(VisaInstrument):
         except KeyError:
             raise ValueError(f'Unknown line "{name}"')
 
+    def _to_lines(self, names: OneOrMore) -> List[int]:
+        if isinstance(names, str):
+            return [self._to_line(names)]
+        return [self._to_line(name) for name in names]
+
     def _to_tap(self, name: str) -> int:
         try:
             return self._tap_names[name]
@@ -388,20 +454,37 @@ class QSwitch(VisaInstrument):
         self.state_force_update()
         return self._state
 
+    @property
+    def _state(self) -> str:
+        return mask_to_compressed_list(self._relays)
+
     def _set_state_raw(self, channel_list: str) -> None:
-        self._state = channel_list
+        self._relays = state_to_mask(channel_list_to_state(channel_list))
 
     def _set_state(self, channel_list: str) -> None:
         self._effectuate(channel_list_to_state(channel_list))
 
+    def _change_relays(self, to_close: State = (), to_open: State = ()) -> None:
+        target = (self._relays if self._pending_relays is None
+                  else self._pending_relays).copy()
+        target |= state_to_mask(to_close)
+        target &= ~state_to_mask(to_open)
+        self._effectuate_mask(target)
+
     def _effectuate(self, state: State) -> None:
-        currently = channel_list_to_state(self._state)
-        positive, negative, total = _state_diff(currently, state)
-        if positive:
-            self.write(f'clos {state_to_compressed_list(positive)}')
-        if negative:
-            self.write(f'open {state_to_compressed_list(negative)}')
-        self._set_state_raw(state_to_compressed_list(total))
+        self._effectuate_mask(state_to_mask(state))
+
+    def _effectuate_mask(self, target: RelayMask) -> None:
+        if self._pending_relays is not None:
+            self._pending_relays = target
+            return
+        closing, opening = _mask_diff(self._relays, target)
+        if closing.any():
+            self.write(f'clos {mask_to_compressed_list(closing)}')
+            self._relays = self._relays | closing
+        if opening.any():
+            self.write(f'open {mask_to_compressed_list(opening)}')
+        self._relays = target
 
     def _set_up_debug_settings(self) -> None:
         self._record_commands = False
@@ -409,6 +492,10 @@ class QSwitch(VisaInstrument):
         self._message_flush_timeout_ms = 1
         self._round_off = None
 
+    def _set_up_relay_state(self) -> None:
+        self._relays = _empty_mask()
+        self._pending_relays = None
+
     def _set_up_serial(self) -> None:
         # No harm in setting the speed even if the connection is not serial.
         self.visa_handle.baud_rate = 9600  # type: ignore
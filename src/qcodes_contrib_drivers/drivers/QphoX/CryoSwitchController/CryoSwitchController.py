@@ -20,6 +20,12 @@ class Cryoswitch:
         self.HW_rev_N = int(self.get_HW_revision()[-1])
 
         self.wait_time = 0.5
+        self.poll_interval = 0.02
+        self.ADC_settle_codes = 8
+        self.ADC_settle_time = 0.1
+        self.bias_timeout = 1
+        self.converter_timeout = 2
+        self.power_timeout = 1
         self.pulse_duration_ms = 15
         self.converter_voltage = 5
         self.MEASURED_converter_voltage = 0
@@ -189,10 +195,39 @@ class Cryoswitch:
         error = abs((measured - set) / set)
         return error
 
+    def poll_until(self, read, ready, timeout, interval=None):
+        if interval is None:
+            interval = self.poll_interval
+        deadline = time.monotonic() + timeout
+        value = read()
+        while not ready(value) and time.monotonic() < deadline:
+            time.sleep(interval)
+            value = read()
+        return value
+
+    def read_settled(self, read, timeout=None):
+        ## Reads until the code stayed within ADC_settle_codes for ADC_settle_time,
+        ## a window of several time constants of the filtered ADC inputs. Returns
+        ## the last code if that does not happen within wait_time.
+        if timeout is None:
+            timeout = self.wait_time
+        readings = []
+
+        def settled(code):
+            now = time.monotonic()
+            readings.append((now, code))
+            window_start = now - self.ADC_settle_time
+            first = [idx for idx, (t, _) in enumerate(readings) if t <= window_start]
+            if not first:
+                return False
+            codes = [c for _, c in readings[first[-1]:]]
+            return max(codes) - min(codes) <= self.ADC_settle_codes
+
+        return self.poll_until(read, settled, timeout)
+
     def measure_ADC(self, channel):
         self.labphox.ADC_cmd('select', channel)
-        time.sleep(self.wait_time)
-        return self.labphox.ADC_cmd('get')
+        return self.read_settled(lambda: self.labphox.ADC_cmd('get'))
 
     def get_converter_voltage(self):
         converter_gain = self.measured_adc_ref * self.converter_divider / self.ADC_12B_res
@@ -234,8 +269,7 @@ class Cryoswitch:
     def get_V_ref(self):
         if self.ADC_cal_ref:
             self.labphox.ADC3_cmd('select', 8)
-            time.sleep(self.wait_time)
-            code = self.labphox.ADC3_cmd('get')
+            code = self.read_settled(lambda: self.labphox.ADC3_cmd('get'))
             Ref_2V5_code = code
             ADC_ref = 2.5 * self.ADC_12B_res / Ref_2V5_code
             return round(ADC_ref, 4)
@@ -245,8 +279,9 @@ class Cryoswitch:
 
     def enable_negative_supply(self):
         self.labphox.gpio_cmd('EN_CHGP', 1)
-        time.sleep(1)
-        bias_voltage = self.get_bias_voltage()
+        bias_voltage = self.poll_until(self.get_bias_voltage,
+                                       lambda voltage: self.calculate_error(voltage, -5) <= self.tolerance,
+                                       self.bias_timeout)
         if self.verbose:
             self.check_voltage(bias_voltage, -5, tolerance=self.tolerance, pre_str='BIAS STATUS:')
         return bias_voltage
@@ -279,9 +314,10 @@ class Cryoswitch:
                 self.labphox.DAC_cmd('set', DAC=1, value=code)
                 # if Vout < self.converter_voltage:
                 #     self.discharge()
-                time.sleep(2)
                 self.converter_voltage = Vout
-                measured_voltage = self.get_converter_voltage()
+                measured_voltage = self.poll_until(self.get_converter_voltage,
+                                                   lambda voltage: self.calculate_error(voltage, Vout) <= self.tolerance,
+                                                   self.converter_timeout)
 
                 if self.verbose:
                     self.check_voltage(measured_voltage, Vout, tolerance=self.tolerance, pre_str='CONVERTER STATUS:')
@@ -535,16 +571,100 @@ class Cryoswitch:
         else:
             return []
 
+    def pulse_batch(self, operations, threshold=None):
+        ## operations: sequence of (port, contact, polarity), pulsed in order.
+        ## Returns the current profiles as rows of a NaN padded array and
+        ## whether each pulse passed verify_pulses. Only the pulses which passed
+        ## are saved to the tracked states, all pulses sent are logged. States,
+        ## pulse log and waveforms are written once for the whole batch, nothing
+        ## is plotted.
+        operations = [(port, contact, 1 if polarity else 0) for port, contact, polarity in operations]
+        for port, contact, polarity in operations:
+            if not self.validate_port_contact(port, contact):
+                print(f'Port or contact out of range: Port {port}, Contact {contact}')
+                return None
+
+        selected = np.zeros(len(operations), dtype=bool)
+        raw_profiles = []
+        for idx, (port, contact, polarity) in enumerate(operations):
+            if self.debug:
+                print(f'Pulsing Port:{port}, Contact {contact}, Polarity {polarity}')
+            if self.select_output_channel(port, contact, polarity):
+                selected[idx] = True
+                raw_profiles.append(self.send_pulse())
+                self.disable_output_channels()
+            else:
+                raw_profiles.append(np.empty(0))
+
+        profiles = self.stack_profiles(raw_profiles)
+        success = self.verify_pulses(profiles, threshold) & selected
+
+        done = [operation for operation, ok in zip(operations, selected) if ok]
+        if self.track_states:
+            self.save_switch_states([operation for operation, ok in zip(operations, success) if ok])
+        if self.pulse_logging:
+            self.log_pulses(done, np.nan_to_num(self.peak_currents(profiles[selected])))
+        if self.log_wav:
+            self.log_waveforms(done, profiles[selected])
+        return profiles, success
+
+    def stack_profiles(self, profiles):
+        length = max((len(profile) for profile in profiles), default=0)
+        stacked = np.full((len(profiles), length), np.nan)
+        for idx, profile in enumerate(profiles):
+            stacked[idx, :len(profile)] = profile
+        return stacked
+
+    def peak_currents(self, profiles):
+        profiles = np.atleast_2d(profiles)
+        if profiles.shape[1] == 0:
+            return np.full(profiles.shape[0], np.nan)
+        peaks = np.max(np.nan_to_num(profiles, nan=-np.inf), axis=1)
+        peaks[np.isneginf(peaks)] = np.nan
+        return peaks
+
+    def verify_pulses(self, profiles, threshold=None):
+        ## A pulse passes if its peak current reaches the threshold, by default
+        ## the warning threshold of the pulse log.
+        if threshold is None:
+            threshold = self.warning_threshold_current
+        peaks = self.peak_currents(profiles)
+        return ~np.isnan(peaks) & (np.nan_to_num(peaks, nan=-np.inf) >= threshold)
+
+    def apply_states(self, contacts, force=False, threshold=None):
+        ## contacts: {port: contact}, contact 0 leaves the port disconnected.
+        ## Disconnects the contacts tracked as connected and connects the
+        ## requested ones in a single batch.
+        states = self.get_switches_state()
+        operations = []
+        for port, contact in contacts.items():
+            port_state = states['port_' + port]
+            for other_contact in range(1, 7):
+                if other_contact != contact and port_state['contact_' + str(other_contact)] == 1:
+                    operations.append((port, other_contact, 0))
+            if contact and (force or port_state['contact_' + str(contact)] != 1):
+                operations.append((port, contact, 1))
+
+        if not operations:
+            return operations, np.empty((0, 0)), np.empty(0, dtype=bool)
+        result = self.pulse_batch(operations, threshold)
+        if result is None:
+            return None
+        profiles, success = result
+        return operations, profiles, success
+
     def save_switch_state(self, port, contact, polarity):
+        self.save_switch_states([(port, contact, polarity)])
+
+    def save_switch_states(self, operations):
         file = open(self.track_states_file)
         states = json.load(file)
         file.close()
 
         SN = self.SN
-        port = 'port_' + str(port)
-        contact = 'contact_' + str(contact)
         if SN in states.keys():
-            states[SN][port][contact] = polarity
+            for port, contact, polarity in operations:
+                states[SN]['port_' + str(port)]['contact_' + str(contact)] = polarity
 
             with open(self.track_states_file, 'w') as outfile:
                 json.dump(states, outfile, indent=4, sort_keys=True)
@@ -590,7 +710,31 @@ class Cryoswitch:
         with open(name, 'w') as outfile:
             json.dump(waveform, outfile, indent=4, sort_keys=True)
 
+    def log_waveforms(self, operations, profiles):
+        if not operations:
+            return
+        name = self.log_wav_dir + '\\' + str(int(time.time())) + '_' + str(
+            self.MEASURED_converter_voltage) + 'V_batch' + str(len(operations)) + '.json'
+        waveforms = {'time': time.time(), 'voltage': self.MEASURED_converter_voltage,
+                     'port': [port for port, _, _ in operations],
+                     'contact': [contact for _, contact, _ in operations],
+                     'polarity': [polarity for _, _, polarity in operations],
+                     'SF': self.sampling_freq,
+                     'data': [list(profile[~np.isnan(profile)]) for profile in profiles]}
+        with open(name, 'w') as outfile:
+            json.dump(waveforms, outfile, indent=4, sort_keys=True)
+
     def log_pulse(self, port, contact, polarity, max_current):
+        with open(self.pulse_logging_filename, 'a') as logging_file:
+            logging_file.write(self.pulse_log_line(port, contact, polarity, max_current))
+
+    def log_pulses(self, operations, max_currents):
+        lines = [self.pulse_log_line(port, contact, polarity, max_current)
+                 for (port, contact, polarity), max_current in zip(operations, max_currents)]
+        with open(self.pulse_logging_filename, 'a') as logging_file:
+            logging_file.writelines(lines)
+
+    def pulse_log_line(self, port, contact, polarity, max_current):
         if polarity:
             direction = 'Connect   '
         else:
@@ -603,8 +747,7 @@ class Cryoswitch:
         else:
             warning_string = ''
 
-        with open(self.pulse_logging_filename, 'a') as logging_file:
-            logging_file.write(pulse_string + warning_string + '\n')
+        return pulse_string + warning_string + '\n'
 
     def get_pulse_history(self, port=None, pulse_number=None):
         if not pulse_number:
@@ -772,7 +915,7 @@ class Cryoswitch:
         self.enable_converter()
         # self.set_output_voltage(5)
 
-        time.sleep(1)
+        self.poll_until(self.get_power_status, bool, self.power_timeout)
         self.enable_output_channels()
         self.select_switch_model('R583423141')
 
@@ -2,6 +2,7 @@ from qcodes.instrument import Instrument, ChannelList, InstrumentChannel
 from qcodes.validators import Numbers,Bool,Enum
 from qcodes_contrib_drivers.drivers.QphoX.CryoSwitchController.CryoSwitchController import Cryoswitch
 import os
+from collections.abc import Sequence
 from typing import Optional
 
 class CryoSwitchChannel(InstrumentChannel):
@@ -284,6 +285,67 @@ class CryoSwitchControllerDriver(Instrument):
         """
         return self._controller.disconnect(port, contact)
 
+    def pulse_batch(self, operations: Sequence[tuple[str, int, int]],
+                    threshold: Optional[float] = None):
+        """
+        Applies a sequence of current pulses without plotting or logging
+        between them, and verifies all pulses at once. Only the pulses that
+        succeeded update the active contacts of the channels and the
+        tracked switch states.
+
+        Args:
+            operations: Tuples (port, contact, polarity), with polarity 1 to
+                connect and 0 to disconnect the contact.
+            threshold (float|None): Minimum peak current in mA of a successful
+                pulse. Defaults to the warning threshold of the pulse log.
+
+        Returns:
+            tuple: The current waveforms as rows of a NaN padded array, and a
+            boolean array telling which pulses succeeded. None if a port or
+            contact is out of range, in which case no pulse is applied.
+        """
+        result = self._controller.pulse_batch(operations, threshold)
+        if result is not None:
+            self._track_active_contacts(operations, result[1])
+        return result
+
+    def apply_states(self, contacts: dict[str, int], force: bool = False,
+                     threshold: Optional[float] = None):
+        """
+        Switches several ports at once. Contacts tracked as connected are
+        disconnected and the requested contacts are connected, all in a
+        single batch of pulses.
+
+        Args:
+            contacts (dict): The contact to connect for each port letter A-D.
+                Contact 0 leaves the port disconnected.
+            force (bool): Pulse requested contacts that are already tracked
+                as connected. (default False)
+            threshold (float|None): Minimum peak current in mA of a successful
+                pulse.
+
+        Returns:
+            tuple: The applied (port, contact, polarity) operations, their
+            current waveforms and whether each pulse succeeded.
+        """
+        result = self._controller.apply_states(contacts, force, threshold)
+        if result is not None:
+            self._track_active_contacts(result[0], result[2])
+        return result
+
+    def _track_active_contacts(self, operations: Sequence[tuple[str, int, int]],
+                               success: Sequence[bool]):
+        # only pulses which were applied and verified change the active contact
+        for (port, contact, polarity), ok in zip(operations, success):
+            if not ok:
+                continue
+            channel = self.channels[ord(port) - ord('A')]
+            if polarity:
+                channel._active_contact = contact
+            elif channel._active_contact == contact:
+                channel._active_contact = 0
+            channel.active_contact()
+
     def get_idn(self):
         """
         A dummy getidn function for the instrument initialization
@@ -16,15 +16,20 @@ Authors:
 """
 
 
+import hashlib
 import logging
 from functools import partial
 import time
-from typing import Union
+from typing import Dict, Optional, Union
+
+import numpy as np
 
 from qcodes.instrument import VisaInstrument
 from qcodes.instrument import InstrumentChannel, ChannelList
 from qcodes import validators as vals
 
+from qcodes_contrib_drivers.drivers.lazy_submodules import LazySubmoduleMixin
+
 log = logging.getLogger(__name__)
 
 _MODULATION_SIGNAL_DOC_POOL = {
@@ -1753,6 +1758,310 @@ class OutputFrequencySweep(InstrumentChannel):
         self.write(f'SOUR{self.hwchan}:SWE:STEP {val}')
 
 
+class OutputListMode(InstrumentChannel):
+
+    #: Validity range of the dwell time of one list entry in seconds
+    DWELL_RANGE = (0.5e-3, 100)
+
+    def __init__(self, parent: 'RohdeSchwarz_SMW200A', name: str, hwchan: int):
+        """Combines all the parameters concerning the list mode of one RF output.
+
+        In list mode the generator steps through a table of frequency/level
+        pairs stored in the instrument. The steps are triggered internally,
+        by an external trigger signal or by a bus command, so no SCPI write
+        and no settling of the parameter system is needed per point. The
+        tables are uploaded as binary blocks with `upload_list`.
+
+        Args:
+            parent: the parent instrument of this channel
+            name  : the internal QCoDeS name of this channel
+            hwchan: the internal number of the hardware channel used in the communication
+
+        Attributes:
+            selected: (ReadOnly) Name of the currently selected list file.
+            mode: Cycle mode for the list processing. Values are:
+                'AUTO': Each trigger triggers exactly one complete list cycle.
+                'STEP': Each trigger triggers one list step only.
+            trigger_source: Trigger source for the list mode. Values are:
+                'AUTO': The list is processed continuously.
+                'SING': Each list execute command triggers one list cycle.
+                'BUS':  Each trigger command (*TRG) triggers the list.
+                'EXT':  The list is triggered by an external trigger signal.
+                'EAUT': External trigger, then the list is processed continuously.
+            dwell_mode: 'FIX' uses the same dwell time for all entries, 'LIST'
+                uses the uploaded dwell time table.
+            dwell: Dwell time used for all entries in dwell mode 'FIX'.
+            points: (ReadOnly) Number of entries of the selected list.
+            index: (ReadOnly) Index of the current list entry.
+            start_index: First entry of the list range to process.
+            stop_index: Last entry of the list range to process.
+            running: (ReadOnly) Get the current list state. Return values are 'ON' or 'OFF'.
+            execute: Triggers one list cycle in trigger source 'SING'. Use no braces () here!
+            reset: Resets the list to the starting point. Use no braces () here!
+        """
+        self.hwchan = hwchan
+        super().__init__(parent, name)
+
+        self.add_parameter('selected',
+                           label='Selected list',
+                           set_cmd=False,
+                           get_cmd=f'SOUR{self.hwchan}:LIST:SEL?',
+                           get_parser=lambda s: s.strip().strip('"\''),
+                           docstring="(ReadOnly) Name of the currently selected list file.")
+
+        self.add_parameter('mode',
+                           label='Cycle mode for list processing',
+                           set_cmd=f'SOUR{self.hwchan}:LIST:' + 'MODE {}',
+                           get_cmd=f'SOUR{self.hwchan}:LIST:MODE?',
+                           vals=vals.Enum('AUTO', 'STEP'),
+                           docstring="""
+                           Cycle mode for list processing. Values are:
+                           'AUTO' = Each trigger triggers exactly one complete list cycle.
+                           'STEP' = Each trigger triggers one list step only.
+                           """)
+
+        self.add_parameter('trigger_source',
+                           label='Trigger source for list mode',
+                           set_cmd=f'SOUR{self.hwchan}:LIST:TRIG:' + 'SOUR {}',
+                           get_cmd=f'SOUR{self.hwchan}:LIST:TRIG:SOUR?',
+                           vals=vals.Enum('AUTO', 'SING', 'BUS', 'EXT', 'EAUT'),
+                           docstring="""
+                           Trigger source for the list mode. Values are:
+                           'AUTO' = The list is processed continuously.
+                           'SING' = Each execute command triggers one list cycle.
+                           'BUS'  = Each trigger command (*TRG) triggers the list.
+                           'EXT'  = The list is triggered by an external trigger signal.
+                           'EAUT' = External trigger, then continuous processing.
+                           """)
+
+        self.add_parameter('dwell_mode',
+                           label='Dwell time mode for list',
+                           set_cmd=f'SOUR{self.hwchan}:LIST:DWEL:' + 'MODE {}',
+                           get_cmd=f'SOUR{self.hwchan}:LIST:DWEL:MODE?',
+                           vals=vals.Enum('FIX', 'LIST'),
+                           docstring="'FIX' uses the same dwell time for all entries,"
+                                     " 'LIST' uses the uploaded dwell time table.")
+
+        self.add_parameter('dwell',
+                           label='Dwell time for list entries',
+                           set_cmd=f'SOUR{self.hwchan}:LIST:' + 'DWEL {}',
+                           get_cmd=f'SOUR{self.hwchan}:LIST:DWEL?',
+                           get_parser=float,
+                           vals=vals.Numbers(*self.DWELL_RANGE),
+                           unit='s',
+                           docstring="Dwell time used for all entries in dwell mode 'FIX'."
+                                     " Valid range is 0.5ms to 100s.")
+
+        self.add_parameter('points',
+                           label='Number of list entries',
+                           set_cmd=False,
+                           get_cmd=f'SOUR{self.hwchan}:LIST:FREQ:POIN?',
+                           get_parser=int,
+                           docstring="(ReadOnly) Number of entries of the selected list.")
+
+        self.add_parameter('index',
+                           label='Current list index',
+                           set_cmd=False,
+                           get_cmd=f'SOUR{self.hwchan}:LIST:IND?',
+                           get_parser=int,
+                           docstring="(ReadOnly) Index of the current list entry.")
+
+        self.add_parameter('start_index',
+                           label='Start index of list range',
+                           set_cmd=f'SOUR{self.hwchan}:LIST:IND:' + 'STAR {}',
+                           get_cmd=f'SOUR{self.hwchan}:LIST:IND:STAR?',
+                           get_parser=int,
+                           vals=vals.Ints(0),
+                           docstring="First entry of the list range to process.")
+
+        self.add_parameter('stop_index',
+                           label='Stop index of list range',
+                           set_cmd=f'SOUR{self.hwchan}:LIST:IND:' + 'STOP {}',
+                           get_cmd=f'SOUR{self.hwchan}:LIST:IND:STOP?',
+                           get_parser=int,
+                           vals=vals.Ints(0),
+                           docstring="Last entry of the list range to process.")
+
+        self.add_parameter('running',
+                           label='Current list state',
+                           set_cmd=False,
+                           get_cmd=f'SOUR{self.hwchan}:LIST:RUNN?',
+                           val_mapping={'ON': 1, 'OFF': 0},
+                           docstring="(ReadOnly) Get the current list state. Return"
+                                     " values are 'ON' or 'OFF'.")
+
+        self.add_function('execute',
+                          call_cmd=f'SOUR{self.hwchan}:LIST:TRIG:EXEC',
+                          docstring="Triggers one list cycle in trigger source 'SING'."
+                                    " Use no braces () here!")
+
+        self.add_function('reset',
+                          call_cmd=f'SOUR{self.hwchan}:LIST:RES',
+                          docstring="Resets the list to the starting point."
+                                    " Use no braces () here!")
+
+    def _validate_list(self, frequencies, levels, dwell
+                       ) -> tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        """
+        Convert the list tables to float arrays and check their shape and range.
+        """
+        output = getattr(self.root_instrument, f'rfoutput{self.hwchan}')
+        freqs = np.asarray(frequencies, dtype=np.float64)
+        if freqs.ndim != 1 or freqs.size == 0:
+            raise ValueError('frequencies must be a non-empty 1D sequence')
+        levs = np.asarray(levels, dtype=np.float64)
+        if levs.ndim == 0:
+            levs = np.full_like(freqs, levs)
+        if levs.shape != freqs.shape:
+            raise ValueError(f'got {levs.size} levels for {freqs.size} frequencies')
+        dwells = None
+        if dwell is not None and np.ndim(dwell) > 0:
+            dwells = np.asarray(dwell, dtype=np.float64)
+            if dwells.shape != freqs.shape:
+                raise ValueError(f'got {dwells.size} dwell times for {freqs.size}'
+                                 ' frequencies')
+
+        ranges = [('frequencies', freqs, output.frequency.vals),
+                  ('levels', levs, output.level.vals)]
+        if dwells is not None:
+            ranges.append(('dwell times', dwells, self.dwell.vals))
+        for label, values, validator in ranges:
+            low, high = validator.min_value, validator.max_value
+            invalid = ~np.isfinite(values) | (values < low) | (values > high)
+            if invalid.any():
+                index = int(np.argmax(invalid))
+                raise ValueError(f'{label}[{index}] = {float(values[index])!r} is invalid: '
+                                 f'must be between {low} and {high} inclusive.')
+        return freqs, levs, dwells
+
+    def _write_block(self, header: str, values: np.ndarray):
+        """
+        Write a float table as IEEE 488.2 definite length binary block.
+        """
+        data = values.astype('<f8').tobytes()
+        length = str(len(data))
+        message = f'{header} #{len(length)}{length}'.encode('ascii') + data + b'\n'
+        self.root_instrument.visa_handle.write_raw(message)
+
+    def upload_list(self, name: str, frequencies, levels, dwell=None,
+                    force: bool = False) -> bool:
+        """
+        Select the list file `name` and upload the list tables to it.
+
+        The tables are transferred as binary blocks. The instrument keeps
+        track of the lists it uploaded, so uploading the same tables to the
+        same list again only selects the list.
+
+        Args:
+            name: name of the list file in the instrument
+            frequencies: frequencies of the list entries in Hz
+            levels: output levels of the list entries in dBm, either one value
+                per entry or one value for all entries
+            dwell: dwell times of the list entries in seconds, either one value
+                per entry (dwell mode 'LIST') or one value for all entries
+                (dwell mode 'FIX'). None keeps the current dwell settings.
+            force: upload the tables even if the list is known to contain them
+
+        Returns:
+            True if the tables were uploaded, False if only the list was selected
+        """
+        freqs, levs, dwells = self._validate_list(frequencies, levels, dwell)
+        if dwells is None and dwell is not None:
+            self.dwell(float(dwell))
+            self.dwell_mode('FIX')
+
+        digest = hashlib.sha256()
+        for values in (freqs, levs, dwells):
+            if values is not None:
+                digest.update(values.tobytes())
+        fingerprint = digest.hexdigest()
+
+        self.select_list(name)
+        if not force and self.root_instrument.list_cache.get(name) == fingerprint:
+            return False
+
+        root = self.root_instrument
+        root.list_cache.pop(name, None)
+        root.write('FORM:BORD NORM')
+        root.write('FORM:DATA PACK')
+        try:
+            self._write_block(f'SOUR{self.hwchan}:LIST:FREQ', freqs)
+            self._write_block(f'SOUR{self.hwchan}:LIST:POW', levs)
+            if dwells is not None:
+                self._write_block(f'SOUR{self.hwchan}:LIST:DWEL:LIST', dwells)
+        finally:
+            root.write('FORM:DATA ASC')
+        if dwells is not None:
+            self.dwell_mode('LIST')
+        root.list_cache[name] = fingerprint
+        return True
+
+    def select_list(self, name: str):
+        """
+        Select (and create, if it does not exist) the list file `name`.
+
+        Args:
+            name: name of the list file in the instrument
+        """
+        self.write(f'SOUR{self.hwchan}:LIST:SEL "{name}"')
+        self.selected.cache.set(name)
+
+    def delete_list(self, name: str):
+        """
+        Delete the list file `name` from the instrument.
+
+        Args:
+            name: name of the list file in the instrument
+        """
+        self.write(f'SOUR{self.hwchan}:LIST:DEL "{name}"')
+        self.root_instrument.list_cache.pop(name, None)
+
+    def learn(self, timeout: Optional[float] = None):
+        """
+        Learn the hardware settings of all entries of the selected list.
+
+        After learning, the generator switches between the entries with
+        the stored hardware settings instead of calculating them, which
+        allows the fastest list processing. Learning has to be repeated
+        after the list was changed.
+
+        Args:
+            timeout: VISA timeout in seconds while waiting for the instrument
+                to finish, None keeps the current timeout
+        """
+        if timeout is None:
+            timeout = self.root_instrument.timeout()
+        with self.root_instrument.timeout.set_to(timeout):
+            self.ask(f'SOUR{self.hwchan}:LIST:LEAR;*OPC?')
+
+    def start(self, trigger_source: Optional[str] = None,
+              mode: Optional[str] = None):
+        """
+        Switch the RF output to list mode and arm the list.
+
+        Args:
+            trigger_source: (optional) trigger source of the list, see `trigger_source`
+            mode: (optional) cycle mode of the list, see `mode`
+        """
+        if trigger_source is not None:
+            self.trigger_source(trigger_source)
+        if mode is not None:
+            self.mode(mode)
+        getattr(self.root_instrument, f'rfoutput{self.hwchan}').mode('LIST')
+
+    def stop(self):
+        """
+        Switch the RF output back to the fixed frequency mode.
+        """
+        getattr(self.root_instrument, f'rfoutput{self.hwchan}').mode('CW')
+
+    def trigger(self):
+        """
+        Send a bus trigger, used with trigger source 'BUS'.
+        """
+        self.root_instrument.write('*TRG')
+
+
 class OutputChannel(InstrumentChannel):
     _MAXFREQ_POOL = {
         1: {
@@ -1787,8 +2096,8 @@ class OutputChannel(InstrumentChannel):
             mode: selects the mode of the oscillator. Valid values are:
                 'FIX': fixed frequency mode (CW is a synonym)
                 'SWE': set sweep mode (use sweep_start/sweep_stop/sweep_center/sweep_span)
-                'LIST': use a special loadable list of frequencies - the list functions
-                are not yet implemented here.
+                'LIST': use a special loadable list of frequencies (see the
+                list_mode submodules).
             sweep_center: set/read the center frequency of the sweep.
             sweep_span: set/read the span of frequency sweep range.
             sweep_start: set/read the start frequency of the sweep.
@@ -1870,7 +2179,8 @@ class OutputChannel(InstrumentChannel):
                            Selects the mode of the oscillator. Valid values are:
                            'FIX'  = fixed frequency mode (CW is a synonym)
                            'SWE'  = set sweep mode (use start/stop/center/span)
-                           'LIST' = use a special loadable list of frequencies (nyi here)
+                           'LIST' = use a special loadable list of frequencies
+                                    (see the list_mode submodules)
                            """)
 
         # Parameter for the sweep mode
@@ -1984,20 +2294,26 @@ class OutputChannel(InstrumentChannel):
 
 
 
-class RohdeSchwarz_SMW200A(VisaInstrument):
-#class RohdeSchwarz_SMW200A(MockVisa):
+class RohdeSchwarz_SMW200A(LazySubmoduleMixin, VisaInstrument):
+#class RohdeSchwarz_SMW200A(LazySubmoduleMixin, MockVisa):
     """This is the qcodes driver for the Rohde & Schwarz SMW200A vector signal
     generator.
 
     Do not forget to change the class for real / simulation mode.
 
+    With ``lazy_submodules=True`` the (many) modulation, sweep, LF, pulse and
+    IQ submodules are constructed on first access only, which shortens the
+    startup and keeps unused features out of snapshots and `getall`. Use
+    `build_submodules` to construct all of them at once.
+
     Status:
         coding: almost finished
         communication tests: done
         usage in experiment: outstanding
     """
 
-    def __init__(self, name, address, **kwargs):
+    def __init__(self, name, address, lazy_submodules: bool = False, **kwargs):
+        self.lazy_submodules = lazy_submodules
         super().__init__(name, address, **kwargs)
 
         # for security check the ID from the device
@@ -2016,148 +2332,110 @@ class RohdeSchwarz_SMW200A(VisaInstrument):
                            docstring="(ReadOnly) List of installed options.")
 
         # RF output submodules
-        rfchannels = ChannelList(self, "OutputChannels", OutputChannel,
-                                 snapshotable=False)
         if 'SMW-B203' in self.options or 'SMW-B206' in self.options \
                 or 'SMW-B207' in self.options or 'SMW-B212' in self.options \
                 or 'SMW-B220' in self.options:
             self.rfoutput_no = 2
         else:
             self.rfoutput_no = 1
-        for chnum in range(1, self.rfoutput_no+1):
-            name = f'rfoutput{chnum}'
-            rfchannel = OutputChannel(self, name, chnum)
-            rfchannels.append(rfchannel)
-            self.add_submodule(name, rfchannel)
-        rfchannels.lock()
-        self.add_submodule('output_channels', rfchannels)
+        rfnums = range(1, self.rfoutput_no+1)
+        self.lfoutput_no = 2 # TODO: wie fragen wir das ab?
+        self.am_no = 2
+        self.fm_no = 2
+        self.pm_no = 2
+        self.pgen_no = 1
+        self.iqoutput_no = 2
+        self.list_cache: Dict[str, str] = {}
+
+        self._add_submodule_group('output_channels', "OutputChannels", OutputChannel,
+                                  [(f'rfoutput{chnum}', chnum) for chnum in rfnums])
 
         # RF output sweep submodules (for Level and Frequency)
-        rflevelsweeps = ChannelList(self, "OutputLevelSweep", OutputLevelSweep,
-                                    snapshotable=False)
-        for rfnum in range(1, self.rfoutput_no+1):
-            name = f'level_sweep{rfnum}'
-            rfsweep = OutputLevelSweep(self, name, rfnum)
-            rflevelsweeps.append(rfsweep)
-            self.add_submodule(name, rfsweep)
-        rflevelsweeps.lock()
-        self.add_submodule('rflevelsweep_channels', rflevelsweeps)
-
-        rffreqsweeps = ChannelList(self, "OutputFrequencySweep", OutputFrequencySweep,
-                                   snapshotable=False)
-        for rfnum in range(1, self.rfoutput_no+1):
-            name = f'freq_sweep{rfnum}'
-            rfsweep = OutputFrequencySweep(self, name, rfnum)
-            rffreqsweeps.append(rfsweep)
-            self.add_submodule(name, rfsweep)
-        rffreqsweeps.lock()
-        self.add_submodule('rffreqsweep_channels', rffreqsweeps)
+        self._add_submodule_group('rflevelsweep_channels', "OutputLevelSweep",
+                                  OutputLevelSweep,
+                                  [(f'level_sweep{rfnum}', rfnum) for rfnum in rfnums])
+        self._add_submodule_group('rffreqsweep_channels', "OutputFrequencySweep",
+                                  OutputFrequencySweep,
+                                  [(f'freq_sweep{rfnum}', rfnum) for rfnum in rfnums])
+
+        # RF output list mode submodules
+        self._add_submodule_group('rflistmode_channels', "OutputListMode", OutputListMode,
+                                  [(f'list_mode{rfnum}', rfnum) for rfnum in rfnums])
 
         # LF output submodules
-        lfchannels = ChannelList(self, "LFOutputChannels", LFOutputChannel,
-                                 snapshotable=False)
-        self.lfoutput_no = 2 # TODO: wie fragen wir das ab?
-        for rfnum in range(1, self.rfoutput_no+1):
-            for lfnum in range(1, self.lfoutput_no+1):
-                name = f'lf{rfnum}output{lfnum}'
-                lfchannel = LFOutputChannel(self, name, rfnum, lfnum)
-                lfchannels.append(lfchannel)
-                self.add_submodule(name, lfchannel)
-        lfchannels.lock()
-        self.add_submodule('lfoutput_channels', lfchannels)
+        self._add_submodule_group('lfoutput_channels', "LFOutputChannels", LFOutputChannel,
+                                  [(f'lf{rfnum}output{lfnum}', rfnum, lfnum)
+                                   for rfnum in rfnums
+                                   for lfnum in range(1, self.lfoutput_no+1)])
 
         # LF output sweep submodules
-        lfsweeps = ChannelList(self, "LFOutputSweep", LFOutputSweep,
-                               snapshotable=False)
-        for rfnum in range(1, self.rfoutput_no+1):
-            name = f'lf{rfnum}sweep'
-            lfsweep = LFOutputSweep(self, name, rfnum)
-            lfsweeps.append(lfsweep)
-            self.add_submodule(name, lfsweep)
-        lfsweeps.lock()
-        self.add_submodule('lfsweep_channels', lfsweeps)
+        self._add_submodule_group('lfsweep_channels', "LFOutputSweep", LFOutputSweep,
+                                  [(f'lf{rfnum}sweep', rfnum) for rfnum in rfnums])
 
         #Amplitude Modulation submodules
-        amchannels = ChannelList(self, "AMChannels", AmplitudeModulation,
-                                 snapshotable=False)
-        self.am_no = 2
-        for rfnum in range(1, self.rfoutput_no+1):
-            for chnum in range(1, self.am_no+1):
-                name = f'am{rfnum}_{chnum}'
-                amchannel = AmplitudeModulation(self, name, rfnum, chnum)
-                amchannels.append(amchannel)
-                self.add_submodule(name, amchannel)
-        amchannels.lock()
-        self.add_submodule('am_channels', amchannels)
+        self._add_submodule_group('am_channels', "AMChannels", AmplitudeModulation,
+                                  [(f'am{rfnum}_{chnum}', rfnum, chnum)
+                                   for rfnum in rfnums
+                                   for chnum in range(1, self.am_no+1)])
 
         if 'SMW-B22' in self.options or 'SMW-B20' in self.options:
             #Frequency Modulation submodules
-            fmchannels = ChannelList(self, "FMChannels", FrequencyModulation,
-                                     snapshotable=False)
-            self.fm_no = 2
-            for rfnum in range(1, self.rfoutput_no+1):
-                for chnum in range(1, self.fm_no+1):
-                    name = f'fm{rfnum}_{chnum}'
-                    fmchannel = FrequencyModulation(self, name, rfnum, chnum)
-                    fmchannels.append(fmchannel)
-                    self.add_submodule(name, fmchannel)
-            fmchannels.lock()
-            self.add_submodule('fm_channels', fmchannels)
+            self._add_submodule_group('fm_channels', "FMChannels", FrequencyModulation,
+                                      [(f'fm{rfnum}_{chnum}', rfnum, chnum)
+                                       for rfnum in rfnums
+                                       for chnum in range(1, self.fm_no+1)])
 
             #Phase Modulation submodules
-            pmchannels = ChannelList(self, "PMChannels", PhaseModulation,
-                                     snapshotable=False)
-            self.pm_no = 2
-            for rfnum in range(1, self.rfoutput_no+1):
-                for chnum in range(1, self.pm_no+1):
-                    name = f'pm{rfnum}_{chnum}'
-                    pmchannel = PhaseModulation(self, name, rfnum, chnum)
-                    pmchannels.append(pmchannel)
-                    self.add_submodule(name, pmchannel)
-            pmchannels.lock()
-            self.add_submodule('pm_channels', pmchannels)
+            self._add_submodule_group('pm_channels', "PMChannels", PhaseModulation,
+                                      [(f'pm{rfnum}_{chnum}', rfnum, chnum)
+                                       for rfnum in rfnums
+                                       for chnum in range(1, self.pm_no+1)])
 
         #Pulse modulation submodule
         if 'SMW-K22' in self.options:
-            for rfnum in range(1, self.rfoutput_no+1):
-                name = f'pulsemod{rfnum}'
-                pulsemchannel = PulseModulation(self, name, rfnum)
-                self.add_submodule(name, pulsemchannel)
+            self._add_submodule_group(None, "PulseModulation", PulseModulation,
+                                      [(f'pulsemod{rfnum}', rfnum) for rfnum in rfnums])
 
             if 'SMW-K23' in self.options:
                 #Pulse generator
-                pgenchannels = ChannelList(self, "PGenChannels", PulseGenerator,
-                                           snapshotable=False)
-                self.pgen_no = 1
-                for chnum in range(1, self.pgen_no+1):
-                    name = f'pulsegen{chnum}'
-                    pgenchannel = PulseGenerator(self, name, chnum)
-                    pgenchannels.append(pgenchannel)
-                    self.add_submodule(name, pgenchannel)
-                pgenchannels.lock()
-                self.add_submodule('pgen_channels', pgenchannels)
+                self._add_submodule_group('pgen_channels', "PGenChannels", PulseGenerator,
+                                          [(f'pulsegen{chnum}', chnum)
+                                           for chnum in range(1, self.pgen_no+1)])
                 self.add_parameter('genTriggerPulse',
                                    label='Trigger Pulse',
-                                   set_cmd=self.genTriggerPulse,
+                                   set_cmd=self.gen_trigger_pulse,
                                    get_cmd=False,
                                    docstring="(WriteOnly) Generates on trigger pulse.")
 
         #IQ modulation submodule
-        for rfnum in range(1, self.rfoutput_no+1):
-            name = f'iqmod{rfnum}'
-            IQmodchannel = IQModulation(self, name, rfnum)
-            self.add_submodule(name, IQmodchannel)
+        self._add_submodule_group(None, "IQModulation", IQModulation,
+                                  [(f'iqmod{rfnum}', rfnum) for rfnum in rfnums])
 
         #analog IQ outputs submodule
-        iqchannels = ChannelList(self, "IQChannels", IQChannel, snapshotable=False)
-        self.iqoutput_no = 2
-        for iq_num in range(1, self.iqoutput_no+1):
-            name = f'iqoutput{iq_num}'
-            iqchannel = IQChannel(self, name, iq_num)
-            iqchannels.append(iqchannel)
-            self.add_submodule(name, iqchannel)
-        iqchannels.lock()
-        self.add_submodule('iqoutput_channels', iqchannels)
+        self._add_submodule_group('iqoutput_channels', "IQChannels", IQChannel,
+                                  [(f'iqoutput{iq_num}', iq_num)
+                                   for iq_num in range(1, self.iqoutput_no+1)])
+
+
+    def _add_submodule_group(self, list_submodule: Optional[str], list_name: str,
+                             chan_type: type, channels: list) -> None:
+        """
+        Add a group of submodules of the same type and, optionally, a channel
+        list holding all of them. In lazy mode the submodules are constructed
+        on first access.
+
+        Args:
+            list_submodule: name of the channel list submodule, None for no list
+            list_name: internal name of the channel list
+            chan_type: class of the submodules
+            channels: one tuple (name, *args) per submodule, the submodule is
+                constructed with chan_type(self, name, *args)
+        """
+        for name, *args in channels:
+            self.add_lazy_submodule(name, partial(chan_type, self, name, *args))
+        if list_submodule is not None:
+            self.add_lazy_channel_list(list_submodule, list_name, chan_type,
+                                       [name for name, *_ in channels])
 
 
     def get_id(self):
@@ -2239,8 +2517,8 @@ class RohdeSchwarz_SMW200A(VisaInstrument):
         if not 'SMW-K22' in self.options or not 'SMW-K23' in self.options:
             raise RuntimeError('Invalid options installed (SMW-K22 and SMW-K23 needed)')
         # get the required submodules
-        pgen = self.submodules['pulsegen1']
-        pmod = self.submodules['pulsemod1']
+        pgen = self.pulsegen1
+        pmod = self.pulsemod1
         # configure the submodules
         pgen.polarity('NORM')
         pmod.delay(0)
@@ -2269,7 +2547,9 @@ class RohdeSchwarz_SMW200A(VisaInstrument):
         """
         Read all parameters and retun them to the caller. This will scan all
         submodules with all parameters, so in this function no changes are
-        necessary for new modules or parameters.
+        necessary for new modules or parameters. With lazy submodules, only
+        the submodules constructed so far are scanned, unless one is
+        requested explicitly.
 
         Args:
             submod: (optional) returns only the parameters for this submodule.
@@ -2282,6 +2562,8 @@ class RohdeSchwarz_SMW200A(VisaInstrument):
             # ID and options only if all modules are returned
             retval.update({"ID": self.idn})
             retval.update({"Options": self.options})
+        elif submod in self.pending_submodules:
+            getattr(self, submod)
 
         for m in self.submodules:
             mod = self.submodules[m]
@@ -67,6 +67,17 @@ class MockVisaHandle:
               'SOUR1:SWE:STEP:LOG?': '1.0',
               'SOUR1:SWE:STEP?': '1000000.0',
 
+              'SOUR1:LIST:SEL?': '"/var/user/list"',
+              'SOUR1:LIST:MODE?': 'AUTO',
+              'SOUR1:LIST:TRIG:SOUR?': 'SING',
+              'SOUR1:LIST:DWEL:MODE?': 'FIX',
+              'SOUR1:LIST:DWEL?': '0.01',
+              'SOUR1:LIST:FREQ:POIN?': '0',
+              'SOUR1:LIST:IND?': '0',
+              'SOUR1:LIST:IND:STAR?': '0',
+              'SOUR1:LIST:IND:STOP?': '0',
+              'SOUR1:LIST:RUNN?': '0',
+
               'SOUR:LFO1:BAND?': 'BW10',
               'SOUR:LFO1:STAT?': '0',
               'SOUR:LFO1:OFFS?': '0',
@@ -1,15 +1,47 @@
+import re
+import time
 from collections import ChainMap
-from typing import Any, Dict
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Dict, Optional, Tuple
 
 # import qcodes.validators as vals
-from qcodes.instrument.channel import ChannelList
 
+from ..lazy_submodules import LazySubmoduleMixin
 from .sdg_channel import SiglentSDGChannel
 from .sdx import SiglentSDx
 
 
-class SiglentSDGx(SiglentSDx):
+# queries returning all fields of a command group, e.g. "C1:BSWV?"
+_CACHEABLE_QUERY = re.compile(r"^(C\d+:)?(OUTP|BSWV|MDWV|SWWV|BTWV|ARWV|SYNC|INVT)\?$")
+
+
+class SiglentSDGx(LazySubmoduleMixin, SiglentSDx):
+    """
+    Base driver for Siglent SDG waveform generators.
+
+    Most channel parameters are single fields of a composite query such as
+    ``C1:BSWV?``. To avoid sending the same query once per field, the
+    responses of these queries are cached: within a ``cached_responses()``
+    block (which every snapshot uses) and, if ``response_cache_ttl`` is
+    larger than zero, for that many seconds. Any write to the instrument
+    clears the cache.
+
+    With ``lazy_submodules=True`` the channels (about 140 parameters each)
+    are constructed on first access only.
+    """
+
+    #: Time in seconds for which composite query responses are reused
+    #: outside of ``cached_responses()`` blocks. 0 disables this.
+    response_cache_ttl: float = 0.0
+
     def __init__(self, *args, **kwargs):
+        self._response_cache: Dict[str, Tuple[float, str]] = {}
+        self._response_cache_depth = 0
+        # name -> content hash of the arbitrary waves uploaded by this driver
+        self.arbitrary_wave_library: Dict[str, str] = {}
+
         n_channels = kwargs.pop("n_channels", 0)
         channel_type = kwargs.pop("channel_type", SiglentSDGChannel)
         channel_kwargs = {"n_channels": n_channels}
@@ -24,18 +56,68 @@ class SiglentSDGx(SiglentSDx):
                 channel_kwargs[ch_param] = kwargs.pop(ch_param)
 
         self._ranges = kwargs.pop("ranges", {})
+        self.lazy_submodules = kwargs.pop("lazy_submodules", False)
 
         super().__init__(*args, **kwargs)
 
-        channels = ChannelList(self, "channels", SiglentSDGChannel, snapshotable=False)
-
+        channel_names = []
         for channel_number in range(1, n_channels + 1):
             name = f"channel{channel_number}"
-            channel = channel_type(self, name, channel_number, **channel_kwargs)
-            self.add_submodule(name, channel)
-            channels.append(channel)
+            self.add_lazy_submodule(
+                name,
+                partial(channel_type, self, name, channel_number, **channel_kwargs),
+            )
+            channel_names.append(name)
+
+        self.add_lazy_channel_list(
+            "channels", "channels", SiglentSDGChannel, channel_names
+        )
 
-        self.add_submodule("channels", channels)
+    @contextmanager
+    def cached_responses(self) -> Iterator[None]:
+        """
+        Context manager within which every composite query is sent at most
+        once, unless a write in between invalidates its response.
+        """
+        self._response_cache_depth += 1
+        try:
+            yield
+        finally:
+            self._response_cache_depth -= 1
+            if self._response_cache_depth == 0:
+                self._response_cache.clear()
+
+    def clear_response_cache(self) -> None:
+        self._response_cache.clear()
+
+    def ask_raw(self, cmd: str) -> str:
+        if not _CACHEABLE_QUERY.match(cmd):
+            return super().ask_raw(cmd)
+        if self._response_cache_depth == 0 and self.response_cache_ttl <= 0:
+            return super().ask_raw(cmd)
+
+        now = time.monotonic()
+        cached = self._response_cache.get(cmd)
+        if cached is not None and (
+            self._response_cache_depth > 0 or now - cached[0] < self.response_cache_ttl
+        ):
+            return cached[1]
+
+        response = super().ask_raw(cmd)
+        self._response_cache[cmd] = (now, response)
+        return response
+
+    def write_raw(self, cmd: str) -> None:
+        self._response_cache.clear()
+        super().write_raw(cmd)
+
+    def snapshot_base(
+        self,
+        update: Optional[bool] = False,
+        params_to_skip_update: Optional[Sequence[str]] = None,
+    ) -> Dict[Any, Any]:
+        with self.cached_responses():
+            return super().snapshot_base(update, params_to_skip_update)
 
 
 class Siglent_SDG_60xx(SiglentSDGx):
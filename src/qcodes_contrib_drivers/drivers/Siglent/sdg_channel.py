@@ -1,7 +1,10 @@
 import functools
+import hashlib
+from contextlib import nullcontext
 from functools import partial
-from typing import Dict, Mapping, Optional, Set, Tuple, Union
+from typing import Any, Dict, Mapping, Optional, Sequence, Set, Tuple, Union
 
+import numpy as np
 from qcodes.parameters import Parameter
 from qcodes.parameters import create_on_off_val_mapping as _create_on_off_val_mapping
 from qcodes.validators.validators import Enum as EnumVals
@@ -57,6 +60,15 @@ class SiglentSDGChannel(SiglentChannel):
 
         self._add_invert_parameter()
 
+    def snapshot_base(
+        self,
+        update: Optional[bool] = False,
+        params_to_skip_update: Optional[Sequence[str]] = None,
+    ) -> Dict[Any, Any]:
+        cached_responses = getattr(self.root_instrument, "cached_responses", nullcontext)
+        with cached_responses():
+            return super().snapshot_base(update, params_to_skip_update)
+
     # ---------------------------------------------------------------
 
     def _add_output_parameters(self, *, extra_params: Set[str]):
@@ -1807,6 +1819,80 @@ class SiglentSDGChannel(SiglentChannel):
             get_parser=extract_arwv_field("NAME"),
         )
 
+    def upload_arbitrary_wave(
+        self,
+        name: str,
+        data: np.ndarray,
+        *,
+        frequency: Optional[float] = None,
+        amplitude: Optional[float] = None,
+        offset: Optional[float] = None,
+        phase: Optional[float] = None,
+        select: bool = True,
+        force: bool = False,
+    ) -> bool:
+        """
+        Upload an arbitrary wave with ``WVDT`` as a binary block.
+
+        Uploaded waves are tracked by name and content hash, so uploading
+        the same data under the same name again is skipped.
+
+        Args:
+            name: Name of the wave on the instrument.
+            data: Samples as int16, or as floats in [-1, 1] which are
+                scaled to the full int16 range.
+            frequency: Frequency of the wave in Hz.
+            amplitude: Peak-to-peak amplitude in V.
+            offset: Offset in V.
+            phase: Phase in degrees.
+            select: Select the wave on this channel after uploading.
+            force: Upload even if the same wave was uploaded before.
+
+        Returns:
+            True if the wave was uploaded, False if the upload was skipped.
+        """
+        samples = np.asarray(data)
+        if samples.ndim != 1 or len(samples) < 2:
+            raise ValueError("Arbitrary wave data must be a 1D array of at least 2 samples")
+        if np.issubdtype(samples.dtype, np.floating):
+            if np.any(np.abs(samples) > 1):
+                raise ValueError("Float arbitrary wave data must be within [-1, 1]")
+            samples = np.round(samples * np.iinfo(np.int16).max)
+        elif samples.dtype != np.int16 and (
+            samples.min() < np.iinfo(np.int16).min or samples.max() > np.iinfo(np.int16).max
+        ):
+            raise ValueError("Integer arbitrary wave data must fit into int16")
+        payload = samples.astype("<i2").tobytes()
+
+        header = f"{self._ch_num_prefix}WVDT WVNM,{name}"
+        for key, value in (
+            ("FREQ", frequency),
+            ("AMPL", amplitude),
+            ("OFST", offset),
+            ("PHASE", phase),
+        ):
+            if value is not None:
+                header += f",{key},{value}"
+        header += ",WAVEDATA,"
+
+        library = self.root_instrument.arbitrary_wave_library
+        digest = hashlib.sha256(header.encode() + payload).hexdigest()
+        uploaded = force or library.get(name) != digest
+        if uploaded:
+            self.root_instrument.clear_response_cache()
+            self.root_instrument.visa_handle.write_raw(header.encode() + payload)
+            library[name] = digest
+
+        if select:
+            self.select_arbitrary_wave(name)
+        return uploaded
+
+    def select_arbitrary_wave(self, name: str) -> None:
+        """
+        Select a stored arbitrary wave by name.
+        """
+        self.arbitrary_wave_name(name)
+
     def _add_sync_parameters(self, *, n_channels):
         if n_channels < 2:
             return
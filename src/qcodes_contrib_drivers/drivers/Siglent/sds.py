@@ -7,7 +7,7 @@ import re
 import numpy as np
 import numpy.typing as npt
 
-from typing import Callable, Tuple
+from typing import Callable, Dict, Optional, Sequence, Tuple
 
 
 class TriggerMode(Enum):
@@ -40,6 +40,53 @@ class WaveformSetup:
     start_idx: int = 0
 
 
+@dataclass
+class AcquisitionScaling:
+    """
+    Scaling of the analog channels of one acquisition
+
+    vdiv
+        volts per division, by channel number
+
+    offset
+        offset in volts, by channel number
+
+    sample_rate
+        samples per second
+    """
+
+    vdiv: Dict[int, float]
+    offset: Dict[int, float]
+    sample_rate: float
+
+
+_VDIV_RE = re.compile(r"^C[0-9]+:VDIV[ ]*([0-9eE+\-.,]+)[ ]*V$")
+_OFST_RE = re.compile(r"^C[0-9]+:OFST[ ]*([0-9eE+\-.,]+)[ ]*V$")
+_SARA_RE = re.compile(r"^SARA[ ]*([0-9eE+\-.,]+)[ ]*([kKMG]?)[ ]*[sS]a[ ]*/[ ]*s$")
+
+
+def _parse_float(response: str, regex: re.Pattern) -> float:
+    groups = regex.match(response)
+    if groups is None:
+        raise ValueError(f"Unexpected response {response!r}")
+    return float(groups[1].replace(",", "."))
+
+
+def _parse_sample_rate(response: str, regex: re.Pattern = _SARA_RE) -> int:
+    groups = regex.match(response)
+    if groups is None:
+        raise ValueError(f"Unexpected response {response!r}")
+    value = float(groups[1].replace(",", "."))
+    multiplier = {
+        "k": 1e3,
+        "K": 1e3,
+        "M": 1e6,
+        "G": 1e9,
+    }
+    value *= multiplier.get(groups[2], 1.0)
+    return int(value)
+
+
 # Not a proper QCoDeS instrument
 # TODO: Add channels, add parameters, add parameter axes
 class Siglent_SDS_120NxE(SiglentSDx):
@@ -76,44 +123,25 @@ class Siglent_SDS_120NxE(SiglentSDx):
     def get_sample_rate(
         self,
         *,
-        _RE=re.compile(r"^SARA[ ]*([0-9eE+\-.,]+)[ ]*([kKMG]?)[ ]*[sS]a[ ]*/[ ]*s$"),
+        _RE=_SARA_RE,
     ) -> int:
-        response = self.ask("SARA?")
-        groups = _RE.match(response)
-        assert groups is not None
-        value = float(groups[1].replace(",", "."))
-        multiplier = {
-            "k": 1e3,
-            "K": 1e3,
-            "M": 1e6,
-            "G": 1e9,
-        }
-        value *= multiplier.get(groups[2], 1.0)
-        return int(value)
+        return _parse_sample_rate(self.ask("SARA?"), _RE)
 
     def get_vdiv(
         self,
         channel: int = 1,
         *,
-        _RE=re.compile(r"^C[0-9]+:VDIV[ ]*([0-9eE+\-.,]+)[ ]*V$"),
+        _RE=_VDIV_RE,
     ) -> float:
-        response = self.ask(f"C{channel:d}:VDIV?")
-        groups = _RE.match(response)
-        assert groups is not None
-        value = float(groups[1].replace(",", "."))
-        return value
+        return _parse_float(self.ask(f"C{channel:d}:VDIV?"), _RE)
 
     def get_ofst(
         self,
         channel: int = 1,
         *,
-        _RE=re.compile(r"^C[0-9]+:OFST[ ]*([0-9eE+\-.,]+)[ ]*V$"),
+        _RE=_OFST_RE,
     ) -> float:
-        response = self.ask(f"C{channel:d}:OFST?")
-        groups = _RE.match(response)
-        assert groups is not None
-        value = float(groups[1].replace(",", "."))
-        return value
+        return _parse_float(self.ask(f"C{channel:d}:OFST?"), _RE)
 
     def get_raw_analog_waveform_data(self, channel: int = 1) -> npt.NDArray:
         return self.visa_handle.query_binary_values(
@@ -160,6 +188,135 @@ class Siglent_SDS_120NxE(SiglentSDx):
         Vofs = self.get_ofst(channel)
         return Vdiv * self.get_raw_analog_waveform_data(channel) / 25 + Vofs
 
+    def get_acquisition_scaling(self, channels: Sequence[int]) -> AcquisitionScaling:
+        """
+        Query the scaling of the given channels once, so that it can be
+        reused for several waveform transfers of the same setup.
+
+        All values are read with one compound query. If the reply cannot
+        be split into one value per query, they are queried one by one.
+        """
+        queries = [
+            f"C{channel:d}:{command}?"
+            for channel in channels
+            for command in ("VDIV", "OFST")
+        ]
+        replies = self.ask(";".join(queries + ["SARA?"])).split(";")
+        try:
+            if len(replies) != len(queries) + 1:
+                raise ValueError(
+                    f"Expected {len(queries) + 1} values, got {len(replies)}"
+                )
+            values = iter(replies)
+            vdiv: Dict[int, float] = {}
+            offset: Dict[int, float] = {}
+            for channel in channels:
+                vdiv[channel] = _parse_float(next(values).strip(), _VDIV_RE)
+                offset[channel] = _parse_float(next(values).strip(), _OFST_RE)
+            sample_rate = _parse_sample_rate(next(values).strip())
+        except ValueError:
+            return AcquisitionScaling(
+                vdiv={channel: self.get_vdiv(channel) for channel in channels},
+                offset={channel: self.get_ofst(channel) for channel in channels},
+                sample_rate=self.get_sample_rate(),
+            )
+        return AcquisitionScaling(vdiv=vdiv, offset=offset, sample_rate=sample_rate)
+
+    def get_channels_waveform_data(
+        self,
+        channels: Sequence[int],
+        scaling: Optional[AcquisitionScaling] = None,
+        out: Optional[npt.NDArray[np.float32]] = None,
+    ) -> npt.NDArray[np.float32]:
+        """
+        Transfer several channels back to back and scale them into one
+        (channels, samples) float32 array.
+
+        Args:
+            channels: channel numbers to transfer
+            scaling: scaling from get_acquisition_scaling. Queried once
+                for all channels if not given. Pass it in when taking many
+                acquisitions with the same vertical setup to avoid the
+                queries altogether.
+            out: optional preallocated (channels, samples) array to
+                write into
+        """
+        if scaling is None:
+            scaling = self.get_acquisition_scaling(channels)
+
+        for row, channel in enumerate(channels):
+            raw = self.get_raw_analog_waveform_data(channel)
+            if out is None:
+                out = np.empty((len(channels), len(raw)), dtype=np.float32)
+            if out.shape != (len(channels), len(raw)):
+                raise ValueError(
+                    f"Channel {channel} returned {len(raw)} samples, "
+                    f"expected an array of shape {out.shape}"
+                )
+            np.multiply(raw, scaling.vdiv[channel] / 25, out=out[row], casting="unsafe")
+            out[row] += scaling.offset[channel]
+
+        assert out is not None
+        return out
+
+    def get_channels_waveform(
+        self, channels: Sequence[int], scaling: Optional[AcquisitionScaling] = None
+    ) -> Tuple[npt.NDArray, npt.NDArray[np.float32]]:
+        """
+        Returns the time axis and a (channels, samples) array of the
+        given channels.
+        """
+        if scaling is None:
+            scaling = self.get_acquisition_scaling(channels)
+        wfsu = self.get_waveform_setup()
+        data = self.get_channels_waveform_data(channels, scaling)
+        axis = self._get_waveform_axis(
+            scaling.sample_rate, wfsu, get_num_samples=lambda: data.shape[1]
+        )
+        return (axis, data)
+
+    def set_sequence_mode(self, enabled: bool, num_segments: int = 2):
+        """
+        Enable or disable sequence (segmented) acquisition, in which each
+        trigger is stored as a separate segment in the history.
+        """
+        if enabled:
+            self.write(f"SEQ ON,{num_segments:d}")
+        else:
+            self.write("SEQ OFF")
+
+    def get_history_frames_data(
+        self,
+        channels: Sequence[int],
+        frames: Sequence[int],
+        scaling: Optional[AcquisitionScaling] = None,
+    ) -> npt.NDArray[np.float32]:
+        """
+        Transfer the given history frames (e.g. the segments of a sequence
+        acquisition) into one (frames, channels, samples) float32 array.
+        The scaling is queried only once for all frames.
+        """
+        if scaling is None:
+            scaling = self.get_acquisition_scaling(channels)
+
+        self.write("HSMD ON")
+        try:
+            out: Optional[npt.NDArray[np.float32]] = None
+            for index, frame in enumerate(frames):
+                self.write(f"FRAM {frame:d}")
+                if out is None:
+                    first = self.get_channels_waveform_data(channels, scaling)
+                    out = np.empty((len(frames),) + first.shape, dtype=np.float32)
+                    out[0] = first
+                else:
+                    self.get_channels_waveform_data(channels, scaling, out=out[index])
+        finally:
+            self.write("HSMD OFF")
+
+        if out is None:
+            return np.empty((0, len(channels), 0), dtype=np.float32)
+        return out
+
     def _get_waveform_axis(
         self,
         sample_rate: float,
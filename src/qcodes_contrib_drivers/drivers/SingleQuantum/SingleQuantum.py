@@ -140,6 +140,15 @@ class SQTalk(threading.Thread):
 
 
 class SQCounts(threading.Thread):
+    """Receives the count stream of the detectors.
+
+    The stream consists of lines of comma separated numbers (time stamp
+    followed by the counts of each detector). Lines are reassembled across
+    ``recv`` calls, each received chunk is parsed at once with numpy, and
+    the rows are stored in a ring buffer of ``CNTS_BUFFER`` rows. Threads
+    waiting for new rows are woken up by ``condition``.
+    """
+
     def __init__(
             self,
             TCP_IP_ADR='localhost',
@@ -148,6 +157,7 @@ class SQCounts(threading.Thread):
         threading.Thread.__init__(self)
         self.lock = threading.Lock()
         self.rlock = threading.RLock()
+        self.condition = threading.Condition(self.lock)
         self.TCP_IP_ADR = TCP_IP_ADR
         self.TCP_IP_PORT = TCP_IP_PORT
 
@@ -158,39 +168,135 @@ class SQCounts(threading.Thread):
         self.BUFFER = 1000000
         self.shutdown = False
 
-        self.cnts = []
         self.CNTS_BUFFER = CNTS_BUFFER
         self.n = 0
+        self._partial = b''
+        self._buffer = None
+        self._head = 0
 
     def close(self):
         # print("Closing Socket")
         self.socket.close()
-        self.shutdown = True
-
-    def get_n(self, n):
-        n0 = self.n
-        while self.n < n0 + n:
-            time.sleep(0.001)
-        cnts = self.cnts
-        return cnts[-n:]
+        with self.condition:
+            self.shutdown = True
+            self.condition.notify_all()
+
+    @property
+    def cnts(self):
+        """The buffered rows, oldest first."""
+        with self.lock:
+            return self._latest(min(self.n, self.CNTS_BUFFER))
+
+    def get_n(self, n, timeout=None):
+        """Wait for n new rows and return them.
+
+        Args:
+            n (int): number of rows
+            timeout (float): maximum waiting time in s, None to wait forever
+        Return (numpy_array): the rows, with shape (n, number of columns)
+        """
+        with self.condition:
+            if n > self.CNTS_BUFFER:
+                self._resize(n)
+            target = self.n + n
+            self.condition.wait_for(
+                lambda: self.n >= target or self.shutdown, timeout)
+            if self.n < target:
+                if self.shutdown:
+                    raise IOError('Count stream closed')
+                raise TimeoutError(f'Received {n - target + self.n} of {n} '
+                                   f'counts within {timeout} s')
+            return self._latest(n)
 
     def run(self):
         while self.shutdown is False:
-            data_raw = str(self.socket.recv(self.BUFFER), 'utf-8')
-
-            data_newline = data_raw.split('\n')
-
-            v = []
-            for d in data_newline[0].split(','):
-                v.append(float(d))
-
-            with self.lock:
-                self.cnts.append(v)
-                # Keep Size of self.cnts
-                len_ = len(self.cnts)
-                if len_ > self.CNTS_BUFFER:
-                    self.cnts = self.cnts[len_ - self.CNTS_BUFFER:]
-                self.n += 1
+            try:
+                data_raw = self.socket.recv(self.BUFFER)
+            except OSError:
+                break
+            if not data_raw:
+                break
+            self.feed(data_raw)
+        with self.condition:
+            self.shutdown = True
+            self.condition.notify_all()
+
+    def feed(self, data_raw):
+        """Add received bytes to the stream.
+
+        Only complete lines are parsed; an incomplete last line is kept until
+        the rest of it is received.
+        """
+        data = self._partial + data_raw
+        end = data.rfind(b'\n')
+        if end < 0:
+            self._partial = data
+            return
+        self._partial = data[end + 1:]
+        rows = self._parse(data[:end])
+        if rows is not None and len(rows):
+            self._append(rows)
+
+    def _parse(self, block):
+        text = block.decode('utf-8', errors='replace').replace('\r', '').strip('\n')
+        if not text:
+            return None
+        n_rows = text.count('\n') + 1
+        try:
+            values = np.array(text.replace('\n', ',').split(','), dtype=float)
+        except ValueError:
+            values = None
+        if values is not None and values.size % n_rows == 0:
+            rows = values.reshape(n_rows, -1)
+            if self._buffer is None or rows.shape[1] == self._buffer.shape[1]:
+                return rows
+        return self._parse_lines(text)
+
+    def _parse_lines(self, text):
+        """Parse line by line, skipping malformed lines."""
+        rows = []
+        for line in text.split('\n'):
+            try:
+                row = np.array(line.split(','), dtype=float)
+            except ValueError:
+                continue
+            if rows and len(row) != len(rows[0]):
+                continue
+            if self._buffer is not None and len(row) != self._buffer.shape[1]:
+                continue
+            rows.append(row)
+        if not rows:
+            return None
+        return np.array(rows)
+
+    def _append(self, rows):
+        with self.condition:
+            if self._buffer is None:
+                self._buffer = np.empty((self.CNTS_BUFFER, rows.shape[1]))
+            size = len(self._buffer)
+            received = len(rows)
+            rows = rows[-size:]
+            first = min(len(rows), size - self._head)
+            self._buffer[self._head:self._head + first] = rows[:first]
+            self._buffer[:len(rows) - first] = rows[first:]
+            self._head = (self._head + len(rows)) % size
+            self.n += received
+            self.condition.notify_all()
+
+    def _latest(self, n):
+        if self._buffer is None:
+            return np.empty((0, 0))
+        indices = (self._head - n + np.arange(n)) % len(self._buffer)
+        return self._buffer[indices]
+
+    def _resize(self, size):
+        if self._buffer is not None:
+            available = min(self.n, self.CNTS_BUFFER)
+            buffer = np.empty((size, self._buffer.shape[1]))
+            buffer[:available] = self._latest(available)
+            self._buffer = buffer
+            self._head = available % size
+        self.CNTS_BUFFER = size
 
 
 class ChannelArray(ParameterWithSetpoints):
@@ -117,21 +117,65 @@ class SIM928(VisaInstrument):
         Returns:
             The response string from the module.
         """
-        if not isinstance(i, int):
-            i = self.module_nr[i]
-        msg = 'SNDT {},"{}"'.format(i, cmd)
-        self.write(msg)
-        time.sleep(100e-3)
-        msg = 'GETN? {},128'.format(i)
-        msg = self.ask(msg)
-        # first read consumes the terminator of the message from the submodule,
-        # so we have a terminator from the message to us still in the input
-        # buffer.
-        self.visa_handle.read()
+        i = self._slot(i)
+        self.write('SNDT {},"{}"'.format(i, cmd))
+        return self._read_module(i)
+
+    def _read_module(self, i):
+        """
+        Read a response from the output queue of a module.
 
+        Polls the number of bytes waiting on the port with ``NINP?`` and
+        fetches them with ``GETN?`` until the terminator of the response has
+        arrived. While nothing is waiting, the polling interval doubles from
+        1 ms up to 20 ms, so that a slow module does not keep the mainframe
+        busy with ``NINP?`` queries.
+
+        Args:
+            i (int): Slot number of the module to read from.
+
+        Returns:
+            The response string from the module, without terminator.
+        """
+        timeout = self.timeout()
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        response = ''
+        interval = 1e-3
+        while True:
+            waiting = int(self.ask('NINP? {}'.format(i)))
+            if waiting > 0:
+                data, complete = self._get_module_bytes(i, min(waiting, 128))
+                response += data
+                if complete:
+                    return response
+                interval = 1e-3
+            elif deadline is not None and time.perf_counter() > deadline:
+                raise TimeoutError('No response from module {} within {} s'
+                                   .format(i, timeout))
+            else:
+                time.sleep(interval)
+                interval = min(2 * interval, 20e-3)
+
+    def _get_module_bytes(self, i, n):
+        """
+        Fetch up to ``n`` bytes from the port of module ``i``.
+
+        Returns:
+            The bytes as string and whether they end with the terminator of
+            the module's response.
+        """
+        msg = self.ask('GETN? {},{}'.format(i, n))
         if msg[:2] != '#3':
             raise RuntimeError('Unexpected format of answer: {}'.format(msg))
-        return msg[5:]
+        count = int(msg[2:5])
+        data = msg[5:]
+        if len(data) < count:
+            # the read stopped at the terminator of the message from the
+            # module, so the terminator of the message to us is still in the
+            # input buffer.
+            self.visa_handle.read()
+            return data, True
+        return data, False
 
     def write_module(self, i, cmd):
         """
@@ -142,9 +186,25 @@ class SIM928(VisaInstrument):
                 of the module to write to.
             cmd (str): The VISA command string.
         """
+        self.write('SNDT {},"{}"'.format(self._slot(i), cmd))
+
+    def write_modules(self, commands):
+        """
+        Write command strings to several modules in a single message to the
+        mainframe, with NO response expected.
+
+        Args:
+            commands (Dict[str]): A dictionary where keys are module slot
+                numbers or names and values are the command strings.
+        """
+        if commands:
+            self.write(';'.join('SNDT {},"{}"'.format(self._slot(i), cmd)
+                                for i, cmd in commands.items()))
+
+    def _slot(self, i):
         if not isinstance(i, int):
-            i = self.module_nr[i]
-        self.write('SNDT {},"{}"'.format(i, cmd))
+            return self.module_nr[i]
+        return i
 
     def set_voltage(self, i, voltage):
         """
@@ -187,6 +247,33 @@ class SIM928(VisaInstrument):
             i = self.module_nr[i]
         return float(self.ask_module(i, 'VOLT?'))
 
+    def get_voltages(self, modules=None):
+        """
+        Get the output voltages of several modules.
+
+        The queries are sent to all modules in one message first, and the
+        responses are collected afterwards, so the modules process them in
+        parallel.
+
+        Args:
+            modules (List[int, str]): Slot numbers or module names of the
+                modules to get the voltages of. Default all modules.
+
+        Returns:
+            Dict[float]: The voltages by module name (as in ``slot_names``)
+            or slot number.
+        """
+        if modules is None:
+            modules = self.modules
+        slots = [self._slot(i) for i in modules]
+        self.write_modules({i: 'VOLT?' for i in slots})
+        voltages = {}
+        for i in slots:
+            name = self.slot_names.get(i, i)
+            voltages[name] = float(self._read_module(i))
+            self.parameters['volt_{}'.format(name)].cache.set(voltages[name])
+        return voltages
+
     def set_smooth(self, voltagedict, equitime=False):
         """
         Set the voltages as specified in ``voltagedict` smoothly,
@@ -215,12 +302,13 @@ class SIM928(VisaInstrument):
             vdict[name] = voltagedict[i]
             self.parameters['volt_{}'.format(name)].validate(vdict[name])
 
+        startvals = self.get_voltages(list(vdict))
         intermediate = []
         if equitime:
             maxsteps = 0
             deltav = {}
             for i in vdict:
-                deltav[i] = vdict[i]-self.parameters['volt_{}'.format(i)]()
+                deltav[i] = vdict[i]-startvals[i]
                 stepsize = self.parameters['volt_{}_step'.format(i)]()
                 steps = abs(int(np.ceil(deltav[i]/stepsize)))
                 if steps > maxsteps:
@@ -232,9 +320,7 @@ class SIM928(VisaInstrument):
                                           deltav[i]*(maxsteps-s-1)/maxsteps
         else:
             done = []
-            prevvals = {}
-            for i in vdict:
-                prevvals[i] = self.parameters['volt_{}'.format(i)]()
+            prevvals = dict(startvals)
             while len(done) != len(vdict):
                 intermediate.append({})
                 for i in vdict:
@@ -251,10 +337,13 @@ class SIM928(VisaInstrument):
                         intermediate[-1][i] = prevvals[i] - stepsize
                     prevvals[i] = intermediate[-1][i]
 
-        for voltages in intermediate:
-            for i in voltages:
-                self.set_voltage(i, voltages[i])
-            time.sleep(self.smooth_timestep())
+        for step, voltages in enumerate(intermediate):
+            if step:
+                time.sleep(self.smooth_timestep())
+            self.write_modules({i: 'VOLT {:.3f}'.format(v)
+                                for i, v in voltages.items()})
+            for i, v in voltages.items():
+                self.parameters['volt_{}'.format(i)].cache.set(v)
 
     def get_module_status(self, i):
         """
@@ -1,6 +1,7 @@
 from functools import partial
+import time
 import numpy as np
-from typing import Any, Iterable, Tuple, Union
+from typing import Any, Iterable, Iterator, Optional, Sequence, Tuple, Union
 from numpy.typing import NDArray
 from qcodes.instrument import VisaInstrument
 from qcodes.parameters import (
@@ -11,6 +12,22 @@ from qcodes.parameters import (
 from qcodes.validators import Numbers, Enum, Strings, Arrays, ComplexNumbers
 
 
+def decode_buffer(rawdata: bytes, out: Optional[NDArray] = None) -> NDArray:
+    """
+    Decode the binary response of ``TRCL ?``: every point is a 16 bit
+    mantissa followed by a 16 bit exponent, with the value
+    ``mantissa * 2 ** (exponent - 124)``.
+
+    Args:
+        rawdata: The binary data.
+        out: Optional float64 array with one element per point to decode
+            into, e.g. a slice of a preallocated array.
+    """
+    points = np.frombuffer(rawdata, dtype="<i2").reshape(-1, 2)
+    # int16 mantissas would select the float32 loop of ldexp
+    return np.ldexp(points[:, 0].astype(np.float64), points[:, 1] - 124, out=out)
+
+
 class SR844(VisaInstrument):
     """
     This is the qcodes driver for the Stanford Research Systems SR844
@@ -585,6 +602,77 @@ class SR844(VisaInstrument):
         self.write(f"SRAT {SR}")
         self.sweep_setpoints.update_units_if_constant_sample_rate()
 
+    def read_buffer(
+        self, channel: int, start: int, count: int, out: Optional[NDArray] = None
+    ) -> NDArray:
+        """
+        Read points from the buffer of a channel with a single ``TRCL ?``
+        transfer.
+
+        Args:
+            channel: The channel (1 or 2).
+            start: Index of the first point to read.
+            count: Number of points to read.
+            out: Optional float64 array of length ``count`` to decode into.
+        """
+        self.write(f"TRCL ? {channel}, {start}, {count}")
+        return decode_buffer(self.visa_handle.read_raw(), out)
+
+    def stream_buffers(
+        self,
+        n_points: int,
+        channels: Sequence[int] = (1, 2),
+        out: Optional[NDArray] = None,
+        poll_interval: float = 0.1,
+        timeout: Optional[float] = None,
+    ) -> Iterator[Tuple[int, NDArray]]:
+        """
+        Read the channel buffers while data is being stored.
+
+        Polls the number of stored points and reads only the new points of
+        every channel, so that the data can be processed during a long
+        acquisition instead of being transferred all at once at the end.
+        The buffer storage has to be started separately, e.g. with
+        ``buffer_start``.
+
+        Args:
+            n_points: Number of points to read per channel.
+            channels: The channels to read.
+            out: Optional float64 array of shape
+                ``(len(channels), n_points)`` holding all points read.
+            poll_interval: Time in s to wait before polling again if no new
+                points are stored.
+            timeout: Maximum time in s to wait for new points, None to wait
+                forever.
+
+        Yields:
+            The index of the first new point and an array of shape
+            ``(len(channels), number of new points)``, which is a view of
+            ``out``.
+
+        Raises:
+            TimeoutError: If no new points are stored within ``timeout``.
+        """
+        if out is None:
+            out = np.empty((len(channels), n_points))
+        read = 0
+        last_change = time.perf_counter()
+        while read < n_points:
+            stored = min(self.buffer_npts(), n_points)
+            if stored > read:
+                for row, channel in enumerate(channels):
+                    self.read_buffer(channel, read, stored - read, out[row, read:stored])
+                yield read, out[:, read:stored]
+                read = stored
+                last_change = time.perf_counter()
+                continue
+            if timeout is not None and time.perf_counter() - last_change > timeout:
+                raise TimeoutError(
+                    f"No new points stored within {timeout} s, "
+                    f"got {read} of {n_points}"
+                )
+            time.sleep(poll_interval)
+
     def _get_complex_voltage(self) -> complex:
         x, y = self.snap("X", "Y")
         return x + 1.0j * y
@@ -699,8 +787,7 @@ class ChannelTrace(ParameterWithSetpoints):
         return self.parse_binary(rawdata)
 
     def parse_binary(self, rawdata: bytes) -> NDArray:
-        realdata = np.frombuffer(rawdata, dtype="<i2")
-        return realdata[::2] * 2.0 ** (realdata[1::2] - 124)
+        return decode_buffer(rawdata)
 
     def poll_raw_binary_data(self, N: int) -> Any:
         assert isinstance(self.root_instrument, SR844)
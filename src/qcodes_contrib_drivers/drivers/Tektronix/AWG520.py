@@ -19,6 +19,7 @@
 # Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
 
 
+import hashlib
 import time
 import logging
 import numpy as np
@@ -26,6 +27,37 @@ import struct
 from qcodes.instrument import VisaInstrument
 from qcodes import validators as vals
 
+# One sample of a waveform or pattern file: the value as a little endian
+# float32 followed by the two marker bits, 5 bytes without padding.
+WAVEFORM_RECORD = np.dtype([('v', '<f4'), ('m', 'u1')])
+
+
+def pack_waveform(w, m1, m2):
+    """
+    Packs a waveform and its markers into the sample records of an AWG520
+    waveform or pattern file, the same bytes as ``struct.pack('<fB', ...)``
+    for every sample.
+
+    Args:
+        w (float[numpoints]) : waveform
+        m1 (int[numpoints])  : marker1
+        m2 (int[numpoints])  : marker2
+
+    Returns:
+        bytes: The packed records.
+    """
+    m = np.asarray(m1) + np.multiply(m2, 2)
+    records = np.empty(len(w), dtype=WAVEFORM_RECORD)
+    records['v'] = w
+    records['m'] = np.trunc(m)
+    return records.tobytes()
+
+
+def _block(data):
+    """Prefixes ``data`` with an IEEE 488.2 definite length block header."""
+    length = str(len(data))
+    return ('#' + str(len(length)) + length).encode() + data
+
 
 class Tektronix_AWG520(VisaInstrument):
     """
@@ -61,12 +93,12 @@ class Tektronix_AWG520(VisaInstrument):
         """
         super().__init__(name, address, **kw)
 
-        self._address = address
         self._values = {}
         self._values['files'] = {}
         self._clock = clock
         self._numpoints = numpoints
         self._fname = ''
+        self._upload_cache = {}
 
         self.add_function('reset', call_cmd='*RST')
         self.add_parameter('state',
@@ -199,14 +231,47 @@ class Tektronix_AWG520(VisaInstrument):
         return self.visa_handle.ask('mmem:cdir?')
 
     def set_current_folder_name(self, file_path):
+        self.clear_upload_cache()
         self.visa_handle.write('mmem:cdir "%s"' % file_path)
 
     def change_folder(self, dir):
+        self.clear_upload_cache()
         self.visa_handle.write('mmem:cdir "%s"' % dir)
 
     def goto_root(self):
+        self.clear_upload_cache()
         self.visa_handle.write('mmem:cdir')
 
+    def clear_upload_cache(self):
+        """
+        Forgets which files were uploaded, so that the next send_waveform,
+        send_pattern or send_sequence call sends its file again. Needed if
+        files on the instrument were changed other than through this driver.
+        """
+        self._upload_cache = {}
+
+    def _upload_file(self, filename, content, force_upload=False):
+        """
+        Writes a file to the current folder of the instrument, unless the
+        same content was already uploaded under the same filename.
+
+        Input:
+            filename (str) : filename
+            content (bytes) : file content
+            force_upload (bool) : upload even if the file is cached
+
+        Output:
+            bool : True if the file was sent
+        """
+        digest = hashlib.blake2b(content, digest_size=16).digest()
+        if not force_upload and self._upload_cache.get(filename) == digest:
+            logging.debug(__name__ + ' : %s already uploaded, skipping' % filename)
+            return False
+        mes = ('MMEM:DATA "%s",' % filename).encode() + _block(content)
+        self.visa_handle.write_raw(mes + self.visa_handle.write_termination.encode())
+        self._upload_cache[filename] = digest
+        return True
+
     def make_directory(self, dir, root):
         """
         makes a directory
@@ -436,10 +501,12 @@ class Tektronix_AWG520(VisaInstrument):
         return self
     # Send waveform to the device
 
-    def send_waveform(self, w, m1, m2, filename, clock):
+    def send_waveform(self, w, m1, m2, filename, clock, force_upload=False):
         """
         Sends a complete waveform. All parameters need to be specified.
         choose a file extension 'wfm' (must end with .pat)
+        The file is not sent again if it was already uploaded with the same
+        content, unless force_upload is True.
         See also: resend_waveform()
 
         Input:
@@ -448,6 +515,7 @@ class Tektronix_AWG520(VisaInstrument):
             m2 (int[numpoints])  : marker2
             filename (str)    : filename
             clock (int)          : frequency (Hz)
+            force_upload (bool)  : send even if the file is cached
 
         Output:
             None
@@ -466,23 +534,11 @@ class Tektronix_AWG520(VisaInstrument):
         self._values['files'][filename]['clock'] = clock
         self._values['files'][filename]['numpoints'] = len(w)
 
-        m = m1 + np.multiply(m2, 2)
-        ws = ''
-        for i in range(0, len(w)):
-            ws = ws + struct.pack('<fB', w[i], int(m[i]))
-        s1 = 'MMEM:DATA "%s",' % filename
-        s3 = 'MAGIC 1000\n'
-        s5 = ws
-        s6 = 'CLOCK %.10e\n' % clock
+        content = (b'MAGIC 1000\n' + _block(pack_waveform(w, m1, m2)) +
+                   ('CLOCK %.10e\n' % clock).encode())
+        self._upload_file(filename, content, force_upload)
 
-        s4 = '#' + str(len(str(len(s5)))) + str(len(s5))
-        lenlen = str(len(str(len(s6) + len(s5) + len(s4) + len(s3))))
-        s2 = '#' + lenlen + str(len(s6) + len(s5) + len(s4) + len(s3))
-
-        mes = s1 + s2 + s3 + s4 + s5 + s6
-        self.visa_handle.write(mes)
-
-    def send_pattern(self, w, m1, m2, filename, clock):
+    def send_pattern(self, w, m1, m2, filename, clock, force_upload=False):
         """
         Sends a pattern file.
         similar to waveform except diff file extension
@@ -495,6 +551,7 @@ class Tektronix_AWG520(VisaInstrument):
             m2 (int[numpoints])  : marker2
             filename (str)    : filename
             clock (int)          : frequency (Hz)
+            force_upload (bool)  : send even if the file is cached
 
         Output:
             None
@@ -512,22 +569,9 @@ class Tektronix_AWG520(VisaInstrument):
         self._values['files'][filename]['clock']=clock
         self._values['files'][filename]['numpoints']=len(w)
 
-        m = m1 + np.multiply(m2, 2)
-        ws = ''
-        for i in range(0, len(w)):
-            ws = ws + struct.pack('<fB', w[i], int(m[i]))
-
-        s1 = 'MMEM:DATA "%s",' % filename
-        s3 = 'MAGIC 2000\n'
-        s5 = ws
-        s6 = 'CLOCK %.10e\n' % clock
-
-        s4 = '#' + str(len(str(len(s5)))) + str(len(s5))
-        lenlen=str(len(str(len(s6) + len(s5) + len(s4) + len(s3))))
-        s2 = '#' + lenlen + str(len(s6) + len(s5) + len(s4) + len(s3))
-
-        mes = s1 + s2 + s3 + s4 + s5 + s6
-        self.visa_handle.write(mes)
+        content = (b'MAGIC 2000\n' + _block(pack_waveform(w, m1, m2)) +
+                   ('CLOCK %.10e\n' % clock).encode())
+        self._upload_file(filename, content, force_upload)
 
 
     def resend_waveform(self, channel, w=[], m1=[], m2=[], clock=[]):
@@ -573,13 +617,16 @@ class Tektronix_AWG520(VisaInstrument):
         """
         pass
 
-    def send_sequence(self, wfs, rep, wait, goto, logic_jump, filename):
+    def send_sequence(self, wfs, rep, wait, goto, logic_jump, filename,
+                      force_upload=False):
         """
         Sends a sequence file (for the moment only for ch1)
 
         Args:
 
            wfs:  list of filenames
+           force_upload: send even if the same sequence file was already
+               uploaded
 
         Returs:
 
@@ -588,11 +635,9 @@ class Tektronix_AWG520(VisaInstrument):
         logging.debug(__name__ + ' : Sending sequence %s to instrument' % filename)
         N = str(len(rep))
         try:
-            wfs.remove(N*[None])
+            wfs.remove(len(rep)*[None])
         except ValueError:
             pass
-        s1 = 'MMEM:DATA "%s",' % filename
-
         if len(np.shape(wfs)) ==1:
             s3 = 'MAGIC 3001\n'
             s5 = ''
@@ -606,14 +651,10 @@ class Tektronix_AWG520(VisaInstrument):
                 s5 = s5+ '"%s","%s",%s,%s,%s,%s\n'%(wfs[0][k],wfs[1][k],rep[k],wait[k],goto[k],logic_jump[k])
 
         s4 = 'LINES %s\n'%N
-        lenlen=str(len(str(len(s5) + len(s4) + len(s3))))
-        s2 = '#' + lenlen + str(len(s5) + len(s4) + len(s3))
-
+        self._upload_file(filename, (s3 + s4 + s5).encode(), force_upload)
 
-        mes = s1 + s2 + s3 + s4 + s5
-        self.visa_handle.write(mes)
-
-    def send_sequence2(self,wfs1,wfs2,rep,wait,goto,logic_jump,filename):
+    def send_sequence2(self,wfs1,wfs2,rep,wait,goto,logic_jump,filename,
+                       force_upload=False):
         """
         Sends a sequence file
 
@@ -625,6 +666,8 @@ class Tektronix_AWG520(VisaInstrument):
             goto: list
             logic_jump: list
             filename: name of output file (must end with .seq)
+            force_upload: send even if the same sequence file was already
+                uploaded
 
         Returns:
             None
@@ -633,7 +676,6 @@ class Tektronix_AWG520(VisaInstrument):
 
 
         N = str(len(rep))
-        s1 = 'MMEM:DATA "%s",' % filename
         s3 = 'MAGIC 3002\n'
         s4 = 'LINES %s\n'%N
         s5 = ''
@@ -642,12 +684,7 @@ class Tektronix_AWG520(VisaInstrument):
         for k in range(len(rep)):
             s5 = s5+ '"%s","%s",%s,%s,%s,%s\n'%(wfs1[k],wfs2[k],rep[k],wait[k],goto[k],logic_jump[k])
 
-        lenlen=str(len(str(len(s5) + len(s4) + len(s3))))
-        s2 = '#' + lenlen + str(len(s5) + len(s4) + len(s3))
-
-
-        mes = s1 + s2 + s3 + s4 + s5
-        self.visa_handle.write(mes)
+        self._upload_file(filename, (s3 + s4 + s5).encode(), force_upload)
 
     def set_sequence(self,filename):
         """
@@ -658,9 +695,10 @@ class Tektronix_AWG520(VisaInstrument):
         """
         self.visa_handle.write('SOUR%s:FUNC:USER "%s","MAIN"' % (1, filename))
 
-    def load_and_set_sequence(self,wfs,rep,wait,goto,logic_jump,filename):
+    def load_and_set_sequence(self,wfs,rep,wait,goto,logic_jump,filename,
+                              force_upload=False):
         """
         Loads and sets the awg sequecne
         """
-        self.send_sequence(wfs,rep,wait,goto,logic_jump,filename)
+        self.send_sequence(wfs,rep,wait,goto,logic_jump,filename,force_upload)
         self.set_sequence(filename)
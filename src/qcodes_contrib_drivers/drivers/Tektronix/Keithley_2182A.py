@@ -6,11 +6,13 @@ with particular focus on the MEASure and FETCh commands and related functionalit
 """
 
 from functools import partial
-from typing import TYPE_CHECKING, Any, Optional
+from typing import TYPE_CHECKING, Any, Optional, Union
 import time
 
+import numpy as np
+
 from qcodes.instrument import VisaInstrument, VisaInstrumentKWArgs
-from qcodes.validators import Numbers, Validator
+from qcodes.validators import Ints, Numbers, Validator
 from qcodes.parameters import create_on_off_val_mapping
 
 if TYPE_CHECKING:
@@ -22,6 +24,20 @@ if TYPE_CHECKING:
 # Create standard on/off value mapping
 on_off_vals = create_on_off_val_mapping(on_val="ON", off_val="OFF")
 
+# Commands that change the trigger model or the TRACe buffer set up by
+# Keithley2182A.configure_buffer
+_BUFFER_CONFIG_COMMANDS = (
+    "*RST",
+    "SYST:PRES",
+    "MEAS",
+    "CONF",
+    "INIT:CONT",
+    "TRIG:COUN",
+    "SAMP:COUN",
+    "TRAC:FEED ",
+    "TRAC:POIN",
+)
+
 
 class ApertureTimeValidator(Validator):
     """
@@ -145,6 +161,8 @@ class Keithley2182A(VisaInstrument):
         super().__init__(name, address, **kwargs)
 
         self._trigger_sent = False
+        # (num_readings, binary) of the currently configured reading buffer
+        self._buffer_config: Optional[tuple[int, bool]] = None
 
         # Mode mapping for measurement functions
         self._mode_map = {
@@ -295,6 +313,24 @@ class Keithley2182A(VisaInstrument):
 
         self.connect_message()
 
+    def write_raw(self, cmd: str) -> None:
+        self._check_buffer_config(cmd)
+        super().write_raw(cmd)
+
+    def ask_raw(self, cmd: str) -> str:
+        self._check_buffer_config(cmd)
+        return super().ask_raw(cmd)
+
+    def _check_buffer_config(self, cmd: str) -> None:
+        """
+        Forget the buffer configuration if ``cmd`` changes it, so that the
+        next burst configures the instrument again.
+        """
+        for command in cmd.split(";"):
+            if command.strip().lstrip(":").upper().startswith(_BUFFER_CONFIG_COMMANDS):
+                self._buffer_config = None
+                return
+
     def _get_mode_param(self, param: str, parser: "Callable[[str], Any]") -> Any:
         """
         Get a parameter value for the current measurement mode.
@@ -395,6 +431,118 @@ class Keithley2182A(VisaInstrument):
             self.initiate_measurement()
         self.write("*TRG")
 
+    def configure_buffer(self, num_readings: int, binary: bool = True) -> None:
+        """
+        Configure the trigger model and the TRACe buffer for a burst of readings.
+
+        The instrument is set up to take ``num_readings`` readings per
+        ``INIT`` and to store them in its reading buffer. The configuration
+        is only sent if it differs from the last one, so repeated bursts
+        of the same length do not pay for reconfiguration. Commands that
+        change the trigger model or the buffer, such as ``MEAS``, ``CONF``
+        or ``*RST``, make the next call send the configuration again.
+
+        Args:
+            num_readings: Number of readings per burst (1 to 1024)
+            binary: Transfer the buffer as binary single precision floats
+                (``FORM:DATA SRE``) instead of ASCII
+        """
+        Ints(min_value=1, max_value=1024).validate(num_readings, "num_readings")
+        if self._buffer_config is not None and self._buffer_config[0] == num_readings:
+            self._buffer_config = (num_readings, binary)
+            return
+
+        self.abort_measurement()
+        self.write("INIT:CONT OFF")
+        self.write("TRIG:COUN 1")
+        self.write(f"SAMP:COUN {num_readings}")
+        self.write("TRAC:FEED SENS")
+        self.write(f"TRAC:POIN {max(num_readings, 2)}")
+        self._buffer_config = (num_readings, binary)
+
+    def start_buffered_acquisition(
+        self, num_readings: int, binary: bool = True
+    ) -> None:
+        """
+        Start a burst of buffered readings and return immediately.
+
+        The readings are collected by the instrument at the speed set by
+        the integration time, without any bus traffic. Use
+        :meth:`fetch_buffered_acquisition` to wait for and retrieve them,
+        which allows other instruments to be operated in the meantime.
+
+        Args:
+            num_readings: Number of readings to take (1 to 1024)
+            binary: Transfer the buffer in binary format
+        """
+        self.configure_buffer(num_readings, binary)
+        self.write("TRAC:CLE;:TRAC:FEED:CONT NEXT;:INIT")
+        self._trigger_sent = True
+
+    def fetch_buffered_acquisition(
+        self, timeout: Optional[float] = None
+    ) -> np.ndarray:
+        """
+        Wait for a burst started with :meth:`start_buffered_acquisition`
+        to complete and read the whole buffer in one transfer.
+
+        Args:
+            timeout: VISA timeout in seconds used while waiting for the
+                burst to complete. Defaults to the instrument timeout.
+
+        Returns:
+            Array of the measured voltages
+        """
+        if self._buffer_config is None:
+            raise RuntimeError(
+                "No buffered acquisition configured. "
+                "Call start_buffered_acquisition first."
+            )
+        num_readings, binary = self._buffer_config
+
+        with self.timeout.set_to(timeout if timeout is not None else self.timeout()):
+            self.ask("*OPC?")
+        self._trigger_sent = False
+
+        if binary:
+            self.write("FORM:BORD SWAP;:FORM:DATA SRE")
+            try:
+                raw = self.visa_handle.query_binary_values(
+                    "TRAC:DATA?",
+                    datatype="f",
+                    is_big_endian=False,
+                    container=np.ndarray,
+                )
+            finally:
+                self.write("FORM:DATA ASC")
+            data = np.asarray(raw, dtype=float)
+        else:
+            response = self.ask("TRAC:DATA?")
+            data = np.array(response.split(","), dtype=float)
+
+        return data[:num_readings]
+
+    def measure_voltage_buffered(
+        self,
+        num_readings: int,
+        binary: bool = True,
+        timeout: Optional[float] = None,
+    ) -> np.ndarray:
+        """
+        Take a burst of voltage readings using the internal reading buffer.
+
+        Args:
+            num_readings: Number of readings to take (1 to 1024)
+            binary: Transfer the buffer in binary format
+            timeout: VISA timeout in seconds used while waiting for the
+                burst to complete
+
+        Returns:
+            Array of the measured voltages
+        """
+        self.start_buffered_acquisition(num_readings, binary=binary)
+        return self.fetch_buffered_acquisition(timeout=timeout)
+
     def configure_voltage_measurement(
         self,
         voltage_range: Optional[float] = None,
@@ -461,6 +609,7 @@ class Keithley2182A(VisaInstrument):
         # Wait for reset to complete
         time.sleep(1)
         self._trigger_sent = False
+        self._buffer_config = None
 
     def self_test(self) -> bool:
         """
@@ -514,27 +663,38 @@ class Keithley2182A(VisaInstrument):
         self.analog_filter(settings["analog_filter"])
         self.digital_filter(settings["digital_filter"])
 
-    def measure_voltage_statistics(self, num_measurements: int = 10) -> dict:
+    def measure_voltage_statistics(
+        self,
+        num_measurements: int = 10,
+        buffered: bool = False,
+        binary: bool = True,
+    ) -> dict:
         """
         Take multiple voltage measurements and return statistics.
 
         Args:
             num_measurements: Number of measurements to take
+            buffered: Take the measurements as one burst into the reading
+                buffer instead of one ``MEAS`` query per measurement
+            binary: Transfer the buffer in binary format (buffered only)
 
         Returns:
-            Dictionary with mean, std, min, max values
+            Dictionary with mean, std, min, max values and the
+            measurements, as a list, or as an array if ``buffered``
         """
-        import numpy as np
-
-        measurements = []
-        for _ in range(num_measurements):
-            measurements.append(self._measure_voltage())
+        measurements: Union[np.ndarray, list[float]]
+        if buffered:
+            measurements = self.measure_voltage_buffered(
+                num_measurements, binary=binary
+            )
+        else:
+            measurements = [self._measure_voltage() for _ in range(num_measurements)]
 
         return {
-            "mean": np.mean(measurements),
-            "stdev": np.std(measurements) if len(measurements) > 1 else 0,
-            "min": np.min(measurements),
-            "max": np.max(measurements),
+            "mean": float(np.mean(measurements)),
+            "stdev": float(np.std(measurements)) if len(measurements) > 1 else 0.0,
+            "min": float(np.min(measurements)),
+            "max": float(np.max(measurements)),
             "count": len(measurements),
             "measurements": measurements,
         }
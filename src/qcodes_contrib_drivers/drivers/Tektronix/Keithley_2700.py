@@ -26,6 +26,7 @@ import logging
 from functools import partial
 
 from qcodes.instrument import VisaInstrument
+from qcodes_contrib_drivers.drivers.coalesced_queries import CoalescedQueryMixin
 from qcodes.validators import Strings as StringValidator
 from qcodes.validators import Ints as IntsValidator
 from qcodes.validators import Numbers as NumbersValidator
@@ -61,7 +62,7 @@ def parsestr(v):
     return v.strip().strip('"')
 
 
-class Keithley_2700(VisaInstrument):
+class Keithley_2700(CoalescedQueryMixin, VisaInstrument):
     '''
     This is the qcodes driver for the Keithley_2700 Multimeter
 
@@ -76,7 +77,23 @@ class Keithley_2700(VisaInstrument):
 
     This driver does not contain all commands available, but only the ones
     most commonly used.
+
+    The settings are read with compound queries (see get_all), falling back
+    to one query per parameter if the instrument rejects them.
     '''
+    coalesced_parameters = ['mode', 'trigger_count', 'trigger_delay',
+                            'trigger_continuous', 'averaging', 'digits',
+                            'nplc', 'integrationtime', 'range', 'display']
+    # the queries of nplc, range, etc. depend on the measurement mode
+    coalesced_query_dependencies = ('mode',)
+
+    # parameters whose query depends on the current mode
+    _current_mode_parameters = {'averaging': 'AVER:STAT',
+                                'digits': 'DIG',
+                                'nplc': 'NPLC',
+                                'range': 'RANG',
+                                'integrationtime': 'APER'}
+
     def __init__(self, name, address, reset=False, **kwargs):
         super().__init__(name, address, **kwargs)
 
@@ -120,20 +137,20 @@ class Keithley_2700(VisaInstrument):
                            set_parser=bool_to_str)
 
         self.add_parameter('averaging',
-                           get_cmd=partial(self._current_mode_get, 'AVER:STAT',
-                                           parser=parsebool),
+                           get_cmd=partial(self._current_mode_get, 'AVER:STAT'),
+                           get_parser=parsebool,
                            set_cmd=partial(self._current_mode_set,
                                            par='AVER:STAT'),
                            set_parser=bool_to_str)
 
         self.add_parameter('digits',
-                           get_cmd=partial(self._current_mode_get, 'DIG',
-                                           parser=int),
+                           get_cmd=partial(self._current_mode_get, 'DIG'),
+                           get_parser=int,
                            set_cmd=partial(self._current_mode_set, par='DIG'))
 
         self.add_parameter('nplc',
-                           get_cmd=partial(self._current_mode_get, 'NPLC',
-                                           parser=float),
+                           get_cmd=partial(self._current_mode_get, 'NPLC'),
+                           get_parser=float,
                            set_cmd=partial(self._current_mode_set, par='NPLC',
                                            mode=None),
                            unit='APER',
@@ -143,8 +160,8 @@ class Keithley_2700(VisaInstrument):
                                       'use get_integrationtime().'))
 
         self.add_parameter('range',
-                           get_cmd=partial(self._current_mode_get, 'RANG',
-                                           parser=float),
+                           get_cmd=partial(self._current_mode_get, 'RANG'),
+                           get_parser=float,
                            set_cmd=partial(self._current_mode_set, par='RANG'),
                            unit='RANG',
                            docstring=('Sets the measurement range.\n'
@@ -153,8 +170,8 @@ class Keithley_2700(VisaInstrument):
                                       'details).'))
 
         self.add_parameter('integrationtime',
-                           get_cmd=partial(self._current_mode_get, 'APER',
-                                           parser=float),
+                           get_cmd=partial(self._current_mode_get, 'APER'),
+                           get_parser=float,
                            set_cmd=partial(self._current_mode_set, par='APER',
                                            mode=None),
                            unit='s',
@@ -195,11 +212,8 @@ class Keithley_2700(VisaInstrument):
         '''
         logging.info('Get all relevant data from device')
 
-        for p in ['mode', 'trigger_count', 'trigger_continuous', 'averaging',
-                  'digits', 'nplc', 'integrationtime', 'range', 'display']:
-            logging.debug('get %s' % p)
-            par = getattr(self, p)
-            par.get()
+        # mode is a coalesced query dependency, so it is read first
+        self.get_coalesced()
 
         # self.get_trigger_delay()
         # self.get_trigger_source()
@@ -210,6 +224,12 @@ class Keithley_2700(VisaInstrument):
         # self.get_averaging_type()
         # self.get_autorange()
 
+    def _coalesced_query(self, parameter):
+        if parameter.short_name in self._current_mode_parameters:
+            return self._mode_par(None,
+                                  self._current_mode_parameters[parameter.short_name])
+        return super()._coalesced_query(parameter)
+
     def _current_mode_get(self, par, mode=None, parser=None):
         cmd = self._mode_par(mode, par)
         r = self.ask(cmd)
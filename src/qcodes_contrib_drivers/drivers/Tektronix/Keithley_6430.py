@@ -1,7 +1,9 @@
 # Qcodes driver Keithley 6430 SMU
 # Based on QtLab legacy driver
 # https://github.com/qdev-dk/qtlab/blob/master/instrument_plugins/Keithley_6430.py
-from typing import Tuple
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
 
 from qcodes.instrument import VisaInstrument
 from qcodes.validators import Ints, Numbers, Bool, Strings, Enum
@@ -330,6 +332,100 @@ class Keithley_6430(VisaInstrument):
         v, i, r = [float(n) for n in s.split(',')][:3]
         return v, i, r
 
+    # Maximum number of values in one :SOUR:LIST command; longer lists are
+    # uploaded with :SOUR:LIST:<mode>:APP
+    _list_chunk_size = 100
+    # Maximum number of points in a list sweep (size of the reading buffer)
+    _list_max_points = 2500
+    _source_limits = {'VOLT': 210., 'CURR': 105e-3}
+
+    def sweep(self,
+              values: Sequence[float],
+              source_mode: Optional[str] = None,
+              binary: bool = True,
+              timeout: Optional[float] = None) -> np.ndarray:
+        """
+        Run a source-measure sweep on the instrument.
+
+        The source values are uploaded as one list (``:SOUR:LIST``), the
+        trigger count is set to the number of points, and all points are
+        sourced and measured by the instrument with a single ``:READ?``.
+        The readings are transferred in one block, in binary format by
+        default. The source mode (e.g. fixed), the data elements and the
+        trigger count are restored afterwards.
+
+        Args:
+            values: Source values, in V or A depending on the source mode.
+            source_mode: 'VOLT' or 'CURR'. Defaults to the present source
+                mode.
+            binary: Transfer the readings as single precision floats
+                (``:FORM:DATA SRE``) instead of ASCII.
+            timeout: VISA timeout in seconds for the whole sweep. Defaults
+                to the instrument timeout.
+
+        Returns:
+            Array of shape (N, 3) with columns voltage (V), current (A) and
+            resistance (Ohm). As for ``read``, values not included in the
+            sense mode are not valid.
+        """
+        if source_mode is None:
+            source_mode = self.source_mode()
+        elif source_mode != self.source_mode.get_latest():
+            self.source_mode(source_mode)
+        if source_mode not in self._source_limits:
+            raise ValueError(f"Invalid source mode {source_mode}")
+
+        points = np.asarray(values, dtype=float)
+        if points.ndim != 1 or not 1 <= len(points) <= self._list_max_points:
+            raise ValueError(f"Sweep must be a 1D sequence of 1 to "
+                             f"{self._list_max_points} values")
+        limit = self._source_limits[source_mode]
+        if not np.all(np.isfinite(points)) or np.any(np.abs(points) > limit):
+            raise ValueError(f"Sweep values must be finite and within "
+                             f"+-{limit} for source mode {source_mode}")
+
+        if not (self.output_enabled() or self.output_auto_off_enabled()):
+            raise Exception(
+                    "Either source must be turned on manually or "
+                    "``output_auto_off_enabled`` has to be enabled before "
+                    "running a sweep."
+                    )
+
+        # restored after the sweep, as other parameters depend on them
+        elements = self.ask(':FORM:ELEM?').strip()
+        mode = self.ask(f':SOUR:{source_mode}:MODE?').strip()
+        trigger_count = int(self.ask(':TRIG:COUN?'))
+
+        try:
+            for start in range(0, len(points), self._list_chunk_size):
+                chunk = ','.join(f'{v:.8g}' for v in
+                                 points[start:start + self._list_chunk_size])
+                append = ':APP' if start else ''
+                self.write(f':SOUR:LIST:{source_mode}{append} {chunk}')
+            self.write(f':SOUR:{source_mode}:MODE LIST')
+            self.write(':FORM:ELEM VOLT,CURR,RES')
+            self.trigger_count(len(points))
+
+            with self.timeout.set_to(timeout if timeout is not None
+                                     else self.timeout()):
+                if binary:
+                    self.write(':FORM:BORD SWAP;:FORM:DATA SRE')
+                    raw = self.visa_handle.query_binary_values(
+                        ':READ?', datatype='f', is_big_endian=False,
+                        container=np.ndarray)
+                    data = np.asarray(raw, dtype=float)
+                else:
+                    data = np.array(self.ask(':READ?').split(','),
+                                    dtype=float)
+        finally:
+            if binary:
+                self.write(':FORM:DATA ASC')
+            self.write(f':SOUR:{source_mode}:MODE {mode}')
+            self.write(f':FORM:ELEM {elements}')
+            self.trigger_count(trigger_count)
+
+        return data.reshape(-1, 3)
+
     def _read_value(self, quantity: str) -> float:
         """
         Read voltage, current or resistance through the sensing module.
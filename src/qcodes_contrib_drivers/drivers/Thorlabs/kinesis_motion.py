@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""Concurrent moves of several Thorlabs Kinesis motor controllers
+
+Each controller gets a worker thread that issues the moves of that controller
+in order and then blocks on its Kinesis message queue until the completion
+message arrives. Moves on different controllers therefore run concurrently,
+and waiting for them costs no polling.
+"""
+import logging
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from concurrent.futures import FIRST_EXCEPTION, Future, ThreadPoolExecutor, wait
+from typing import Any, Optional, Union
+
+from .private.CC import _Thorlabs_CC
+
+log = logging.getLogger(__name__)
+
+Device = Union[str, _Thorlabs_CC]
+
+
+class KinesisMotionCoordinator:
+    """Coordinates moves of several Thorlabs Kinesis motor controllers
+
+    Moves are returned as futures which resolve to the position reached. A
+    move that was stopped before reaching its target fails with a
+    ``RuntimeError``.
+
+    Args:
+        devices: Motor controllers to coordinate, e.g. ``KDC101`` instances.
+        timeout: Default maximum time in seconds to wait for moves in
+            :meth:`wait` and :meth:`run_trajectory`. None waits forever.
+    """
+    _MOVED = _Thorlabs_CC._CONDITIONS.index('moved')
+    _HOMED = _Thorlabs_CC._CONDITIONS.index('homed')
+    _STOPPED = _Thorlabs_CC._CONDITIONS.index('stopped')
+
+    def __init__(self,
+                 devices: Iterable[_Thorlabs_CC],
+                 timeout: Optional[float] = None):
+        self.devices = {device.name: device for device in devices}
+        self.timeout = timeout
+        self._executors = {
+            name: ThreadPoolExecutor(max_workers=1,
+                                     thread_name_prefix=f'kinesis_{name}')
+            for name in self.devices
+        }
+        self._moves: dict['Future[float]', str] = {}
+
+    def __enter__(self) -> 'KinesisMotionCoordinator':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def move_to(self, device: Device, position: float) -> 'Future[float]':
+        """Move a device to an absolute position
+
+        Args:
+            device: The device, or its name.
+            position: The target position.
+
+        Returns:
+            Future resolving to the position reached.
+        """
+        return self._submit(device, lambda dev: dev.move_to(position, block=False),
+                            self._MOVED)
+
+    def move_by(self, device: Device, displacement: float) -> 'Future[float]':
+        """Move a device by a relative amount
+
+        Args:
+            device: The device, or its name.
+            displacement: The amount to move.
+
+        Returns:
+            Future resolving to the position reached.
+        """
+        return self._submit(device, lambda dev: dev.move_by(displacement, block=False),
+                            self._MOVED)
+
+    def home(self, device: Device) -> 'Future[float]':
+        """Home a device
+
+        Args:
+            device: The device, or its name.
+
+        Returns:
+            Future resolving to the home position.
+        """
+        return self._submit(device, lambda dev: dev.go_home(block=False),
+                            self._HOMED)
+
+    def move_all(self, positions: Mapping[Device, float]) -> dict[str, 'Future[float]']:
+        """Move several devices to absolute positions at the same time
+
+        Args:
+            positions: Target position per device or device name.
+
+        Returns:
+            Future per device name.
+        """
+        return {self._device(device).name: self.move_to(device, position)
+                for device, position in positions.items()}
+
+    def wait(self,
+             moves: Union[Mapping[str, 'Future[float]'], Iterable['Future[float]']],
+             timeout: Optional[float] = None) -> Any:
+        """Wait for moves to complete
+
+        If a move fails or the timeout expires, all coordinated devices are
+        stopped before the error is raised.
+
+        Args:
+            moves: Futures returned by this coordinator, or a mapping of them.
+            timeout: Maximum time in seconds. Defaults to :attr:`timeout`.
+
+        Returns:
+            The positions reached, as a dict if ``moves`` is a mapping and as
+            a list otherwise.
+
+        Raises:
+            TimeoutError: If the moves did not complete in time.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        futures = list(moves.values()) if isinstance(moves, Mapping) else list(moves)
+        done, pending = wait(futures, timeout, return_when=FIRST_EXCEPTION)
+        failed = [future for future in done if future.exception() is not None]
+        if pending or failed:
+            self.stop_all()
+            if failed:
+                raise failed[0].exception()  # type: ignore[misc]
+            raise TimeoutError(f'{len(pending)} moves did not complete '
+                               f'within {timeout} s')
+        if isinstance(moves, Mapping):
+            return {name: future.result() for name, future in moves.items()}
+        return [future.result() for future in futures]
+
+    def run_trajectory(self,
+                       waypoints: Sequence[Mapping[Device, float]],
+                       timeout: Optional[float] = None,
+                       callback: Optional[Callable[[int, dict[str, float]], None]] = None
+                       ) -> list[dict[str, float]]:
+        """Move through a sequence of multi-axis waypoints
+
+        The devices of a waypoint move at the same time, and the next waypoint
+        starts once all of them have arrived.
+
+        Args:
+            waypoints: Target position per device or device name, per waypoint.
+            timeout: Maximum time in seconds per waypoint.
+                Defaults to :attr:`timeout`.
+            callback: Called as ``callback(index, positions)`` after each
+                waypoint has been reached, e.g. to take a measurement.
+
+        Returns:
+            The positions reached at each waypoint.
+        """
+        reached = []
+        for index, waypoint in enumerate(waypoints):
+            positions = self.wait(self.move_all(waypoint), timeout)
+            reached.append(positions)
+            if callback is not None:
+                callback(index, positions)
+        return reached
+
+    def stop_all(self, immediate: bool = False) -> None:
+        """Stop all coordinated devices without waiting
+
+        Pending moves fail once their device reports that it stopped.
+
+        Args:
+            immediate: Stop immediately instead of using the velocity profile.
+        """
+        for device in self.devices.values():
+            device.stop(immediate=immediate, block=False)
+
+    def close(self, timeout: float = 5) -> None:
+        """Cancel the moves and stop the worker threads
+
+        Moves which have not started yet are cancelled, and devices which
+        are still moving are stopped, so that their workers receive the
+        stop message. ``CC_WaitForMessage`` cannot time out, so the workers
+        are only waited for up to ``timeout``.
+
+        Args:
+            timeout: Maximum time in seconds to wait for the workers.
+        """
+        for executor in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        running = [future for future in list(self._moves) if not future.done()]
+        for name in {self._moves.get(future) for future in running}:
+            if name is not None:
+                self.devices[name].stop(block=False)
+        _, pending = wait(running, timeout)
+        if pending:
+            log.warning('%d Kinesis moves did not stop within %s s',
+                        len(pending), timeout)
+
+    def _device(self, device: Device) -> _Thorlabs_CC:
+        name = device if isinstance(device, str) else device.name
+        try:
+            return self.devices[name]
+        except KeyError:
+            raise KeyError(f'{name} is not a coordinated device') from None
+
+    def _submit(self,
+                device: Device,
+                start: Callable[[_Thorlabs_CC], None],
+                condition: int) -> 'Future[float]':
+        dev = self._device(device)
+        future = self._executors[dev.name].submit(self._run, dev, start, condition)
+        self._moves[future] = dev.name
+        future.add_done_callback(lambda done: self._moves.pop(done, None))
+        return future
+
+    def _run(self,
+             device: _Thorlabs_CC,
+             start: Callable[[_Thorlabs_CC], None],
+             condition: int) -> float:
+        start(device)
+        while True:
+            message_type, message_id, _ = device._wait_for_message()
+            if message_type != 2:
+                continue
+            if message_id == condition:
+                return device.position.get()
+            if message_id == self._STOPPED:
+                raise RuntimeError(f'{device.name} stopped at '
+                                   f'{device.position.get()} before completing the move')
@@ -54,7 +54,7 @@ class _Thorlabs_CC(_Thorlabs_Kinesis):
         self._load_settings()
         self._set_limits_approach(1)
 
-        sleep(3)
+        self._wait_for_first_poll(polling)
 
         self._clear_message_queue()
 
@@ -206,6 +206,7 @@ class _Thorlabs_CC(_Thorlabs_Kinesis):
             block: will wait for completion. Defaults to True.
         """
         self.log.info('home the device.')
+        self._clear_message_queue()
         self._check_error(self._dll.CC_Home(self._serial_number))
         self.homed = True
         if block:
@@ -214,47 +215,55 @@ class _Thorlabs_CC(_Thorlabs_Kinesis):
     def wait_for_completion(self, status: str = 'homed', max_time: float = 5) -> None:
         """Wait for the current function to be finished.
 
+        Waits on the Kinesis message queue until the device posts the
+        completion message of ``status``; messages of other kinds are
+        discarded. ``CC_WaitForMessage`` cannot time out, so with a
+        ``max_time`` it is only called once ``CC_MessageQueueSize`` reports
+        a queued message.
+
         Args:
             status: expected status. Defaults to 'homed'.
-            max_time: maximum waiting time for the internal loop.
+            max_time: maximum waiting time in seconds, 0 to wait forever.
         """
         self.log.debug('wait for the current function to be completed')
-        message_type = ctypes.c_ushort()
-        message_id = ctypes.c_ushort()
-        message_data = ctypes.c_ulong()
-        cond = self._CONDITIONS.index(status)
-
         if status == 'stopped':
             if not self.is_moving():
                 return None
         elif status == 'homed':
             max_time = 0
 
-        while self._dll.CC_MessageQueueSize(self._serial_number) <= 0:
-            sleep(.2)
+        cond = self._CONDITIONS.index(status)
+        deadline = None if max_time == 0 else time() + max_time
+        while True:
+            if deadline is not None:
+                while self._dll.CC_MessageQueueSize(self._serial_number) <= 0:
+                    if time() > deadline:
+                        raise RuntimeError(f'waited for {max_time} for {status} '
+                                           'to complete')
+                    sleep(.01)
+            message_type, message_id, _ = self._wait_for_message()
+            if message_type == 2 and message_id == cond:
+                return None
+            if deadline is not None and time() > deadline:
+                raise RuntimeError(f'waited for {max_time} for {status} to complete, '
+                                   f'message type: {message_type} ({message_id})')
 
-        self._dll.CC_WaitForMessage(
+    def _wait_for_message(self) -> tuple[int, int, int]:
+        """Block until the device posts a message and pop it from the queue.
+
+        Returns:
+            tuple: message type, message id and message data
+        """
+        message_type = ctypes.c_ushort()
+        message_id = ctypes.c_ushort()
+        message_data = ctypes.c_ulong()
+        ret = self._dll.CC_WaitForMessage(
             self._serial_number, ctypes.byref(message_type),
             ctypes.byref(message_id), ctypes.byref(message_data)
         )
-
-        start = time()
-        while int(message_type.value) != 2 or int(message_id.value) != cond:
-            end = time()
-            if end - start > max_time and max_time != 0:
-                raise RuntimeError(f'waited for {max_time} for {status} to complete'
-                                   f'message type: {message_type.value} ({message_id.value})')
-
-            if self._dll.CC_MessageQueueSize(self._serial_number) <= 0:
-                sleep(.2)
-                continue
-            self._dll.CC_WaitForMessage(
-                self._serial_number,
-                ctypes.byref(message_type),
-                ctypes.byref(message_id),
-                ctypes.byref(message_data)
-            )
-        return None
+        if not ret:
+            raise RuntimeError(f'failed to wait for a message from {self.serial_number}')
+        return message_type.value, message_id.value, message_data.value
 
     def _device_unit_to_real(self, device_unit: int, unit_type: int) -> float:
         """Converts a device unit to a real world unit
@@ -527,15 +536,11 @@ class _Thorlabs_CC(_Thorlabs_Kinesis):
         ret = self._dll.CC_SetMoveAbsolutePosition(self._serial_number,
                                                    ctypes.c_int(pos))
         self._check_error(ret)
+        self._clear_message_queue()
         ret = self._dll.CC_MoveAbsolute(self._serial_number)
         self._check_error(ret)
         if block:
-            diff = abs(self._get_position() - position)
-            diff -= 360 if diff > 180 else diff
-            while abs(diff) > .001:
-                sleep(.2)
-                diff = abs(self._get_position() - position)
-                diff -= 360 if diff > 180 else diff
+            self.wait_for_completion(status='moved', max_time=15)
 
     def is_moving(self) -> bool:
         """check if the motor cotnroller is moving."""
@@ -558,6 +563,7 @@ class _Thorlabs_CC(_Thorlabs_Kinesis):
         """
         self.log.info(f'move to {position}')
         pos = self._real_to_device_unit(position, 0)
+        self._clear_message_queue()
         ret = self._dll.CC_MoveToPosition(self._serial_number,
                                           ctypes.c_int(pos))
         self._check_error(ret)
@@ -575,6 +581,7 @@ class _Thorlabs_CC(_Thorlabs_Kinesis):
         """
         self.log.info(f'move by {displacement}')
         dis = self._real_to_device_unit(displacement, 0)
+        self._clear_message_queue()
         ret = self._dll.CC_MoveRelative(self._serial_number,
                                         ctypes.c_int(dis))
         self._check_error(ret)
@@ -624,7 +631,7 @@ class _Thorlabs_CC(_Thorlabs_Kinesis):
                 self.wait_for_completion(status='moved')
         self.position.get()
 
-    def stop(self, immediate: bool = False) -> None:
+    def stop(self, immediate: bool = False, block: bool = True) -> None:
         """Stop the current move
 
         Args:
@@ -632,6 +639,7 @@ class _Thorlabs_CC(_Thorlabs_Kinesis):
                 True: stops immediately (with risk of losing track of position).
                 False: stops using the current velocity profile.
                 Defaults to False.
+            block: will wait until stopped. Defaults to True.
         """
         self.log.info('stop the current move')
         if immediate:
@@ -639,7 +647,8 @@ class _Thorlabs_CC(_Thorlabs_Kinesis):
         else:
             ret = self._dll.CC_StopProfiled(self._serial_number)
         self._check_error(ret)
-        self.wait_for_completion(status='stopped')
+        if block:
+            self.wait_for_completion(status='stopped')
         self.position.get()
 
     def close(self):
@@ -710,6 +719,22 @@ class _Thorlabs_CC(_Thorlabs_Kinesis):
         self.log.info('stop polling')
         self._dll.CC_StopPolling(self._serial_number)
 
+    def _wait_for_first_poll(self, polling: int, timeout: float = 3) -> None:
+        """Wait until polling has reported the status of the device.
+
+        Args:
+            polling: polling rate in ms.
+            timeout: maximum waiting time in seconds.
+        """
+        self._dll.CC_RequestStatusBits(self._serial_number)
+        deadline = time() + timeout
+        while not self._dll.CC_GetStatusBits(self._serial_number):
+            if time() > deadline:
+                self.log.warning(f'no status reported within {timeout} s')
+                return None
+            sleep(polling / 1000)
+        return None
+
     def _clear_message_queue(self) -> None:
         self.log.info('clear messages queue')
         self._dll.CC_ClearMessageQueue(self._serial_number)
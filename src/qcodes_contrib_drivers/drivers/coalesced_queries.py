@@ -0,0 +1,196 @@
+"""
+Mixin to read many parameters of a SCPI instrument with compound queries.
+
+SCPI instruments accept several queries in one message, separated by ``;``,
+and answer them in one response, again separated by ``;``. Reading all
+parameters of an instrument this way costs a few bus round trips instead
+of one per parameter, which matters for slow (e.g. GPIB) instruments when
+taking station snapshots.
+"""
+import logging
+from collections.abc import Iterable, Sequence
+from typing import Any, Optional
+
+from qcodes.instrument import Instrument
+from qcodes.parameters import Parameter
+from qcodes.parameters.command import Command
+
+log = logging.getLogger(__name__)
+
+
+class CoalescedQueryMixin(Instrument):
+    """
+    Mixin for SCPI instruments that reads parameters with compound queries.
+
+    Use it as the first base class of a driver, e.g.
+    ``class MyDMM(CoalescedQueryMixin, VisaInstrument)``.
+
+    Parameters with a plain string ``get_cmd`` are coalesced automatically.
+    Drivers whose parameters use callables to build their queries can
+    override :meth:`_coalesced_query` to return the query string of such a
+    parameter. Drivers can restrict which parameters are read during a
+    snapshot with :attr:`coalesced_parameters`.
+
+    If the instrument returns an unexpected number of values for a compound
+    query, the parameters are read one by one instead and compound queries
+    are not attempted again for this instance. A compound query that fails
+    with an error (e.g. a timeout) falls back to individual queries as well,
+    but compound queries are only disabled after
+    :attr:`coalesced_query_max_failures` such failures in a row.
+    """
+
+    #: Names of the parameters read with compound queries during a snapshot.
+    #: ``None`` means all parameters that have a known query.
+    coalesced_parameters: Optional[Sequence[str]] = None
+
+    #: Maximum number of queries joined into one message.
+    coalesced_query_max_count: int = 16
+
+    #: Set to False after the instrument rejected a compound query.
+    coalesced_queries_supported: bool = True
+
+    #: Number of failed compound queries in a row after which compound
+    #: queries are disabled.
+    coalesced_query_max_failures: int = 3
+
+    #: Names of parameters the queries of other parameters depend on, e.g.
+    #: the measurement mode. They are read before the queries of the other
+    #: parameters are built, so that those do not rely on a stale cache.
+    coalesced_query_dependencies: Sequence[str] = ()
+
+    _coalesced_query_failures: int = 0
+
+    def _coalesced_query(self, parameter: Parameter) -> Optional[str]:
+        """
+        Return the query string of a parameter, or None if the parameter
+        cannot be read as part of a compound query.
+        """
+        get_raw = parameter.get_raw
+        if isinstance(get_raw, Command):
+            cmd_str = getattr(get_raw, "cmd_str", None)
+            if isinstance(cmd_str, str):
+                return cmd_str
+        return None
+
+    def get_coalesced(
+        self, parameter_names: Optional[Iterable[str]] = None
+    ) -> dict[str, Any]:
+        """
+        Read several parameters with as few compound queries as possible and
+        update their caches. Parameters without a known query are read
+        individually. The parameters in :attr:`coalesced_query_dependencies`
+        are read first, and are always included.
+
+        Args:
+            parameter_names: Names of the parameters to read. Defaults to
+                :attr:`coalesced_parameters`.
+
+        Returns:
+            Dictionary of the parameter values by name
+        """
+        if parameter_names is None:
+            parameter_names = self._default_coalesced_parameters()
+
+        dependencies = list(self.coalesced_query_dependencies)
+        values = self._get_coalesced_values(dependencies)
+        values.update(self._get_coalesced_values(
+            [name for name in parameter_names if name not in dependencies]))
+        return values
+
+    def _get_coalesced_values(self, parameter_names: Iterable[str]) -> dict[str, Any]:
+        queries: dict[str, str] = {}
+        values: dict[str, Any] = {}
+        for name in parameter_names:
+            parameter = self.parameters[name]
+            query = (
+                self._coalesced_query(parameter)
+                if isinstance(parameter, Parameter) and self.coalesced_queries_supported
+                else None
+            )
+            if query is None:
+                values[name] = parameter.get()
+            else:
+                queries[name] = query
+
+        names = list(queries)
+        for start in range(0, len(names), self.coalesced_query_max_count):
+            chunk = names[start:start + self.coalesced_query_max_count]
+            values.update(self._get_chunk(chunk, [queries[name] for name in chunk]))
+
+        return values
+
+    def _default_coalesced_parameters(self) -> list[str]:
+        if self.coalesced_parameters is not None:
+            return list(self.coalesced_parameters)
+        return [
+            name
+            for name, parameter in self.parameters.items()
+            if isinstance(parameter, Parameter)
+            and parameter.gettable
+            and parameter._snapshot_get
+            and self._coalesced_query(parameter) is not None
+        ]
+
+    def _get_chunk(self, names: list[str], queries: list[str]) -> dict[str, Any]:
+        replies: Optional[list[str]] = None
+        if self.coalesced_queries_supported:
+            replies = self._ask_compound(queries)
+
+        if replies is None:
+            return {name: self.parameters[name].get() for name in names}
+
+        values = {}
+        for name, reply in zip(names, replies):
+            parameter = self.parameters[name]
+            assert isinstance(parameter, Parameter)
+            value = parameter._from_raw_value_to_value(reply)
+            parameter.cache.set(value)
+            values[name] = value
+        return values
+
+    def _ask_compound(self, queries: list[str]) -> Optional[list[str]]:
+        """
+        Send the queries as one message and split the reply. Returns None
+        if the query failed, and disables compound queries if the instrument
+        does not answer with one value per query or failed too often.
+        """
+        message = ";".join(
+            query if i == 0 or query.startswith((":", "*")) else f":{query}"
+            for i, query in enumerate(queries)
+        )
+        try:
+            replies = self.ask(message).split(";")
+        except Exception as err:
+            self._coalesced_query_failures += 1
+            log.warning(f"{self.name}: compound query failed ({err}), "
+                        "falling back to individual queries")
+            device_clear = getattr(self, "device_clear", None)
+            if device_clear is not None:
+                device_clear()
+            if self._coalesced_query_failures >= self.coalesced_query_max_failures:
+                self.coalesced_queries_supported = False
+            return None
+
+        if len(replies) != len(queries):
+            log.warning(f"{self.name}: expected {len(queries)} values from "
+                        f"compound query, got {len(replies)}; falling back "
+                        "to individual queries")
+            self.coalesced_queries_supported = False
+            return None
+        self._coalesced_query_failures = 0
+        return [reply.strip() for reply in replies]
+
+    def snapshot_base(
+        self,
+        update: Optional[bool] = False,
+        params_to_skip_update: Optional[Sequence[str]] = None,
+    ) -> dict[Any, Any]:
+        if not update:
+            return super().snapshot_base(update, params_to_skip_update)
+
+        skip = set(params_to_skip_update or ())
+        names = [
+            name for name in self._default_coalesced_parameters() if name not in skip
+        ]
+        values = self.get_coalesced(names)
+        return super().snapshot_base(update, list(skip) + list(values))
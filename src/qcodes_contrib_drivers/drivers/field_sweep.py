@@ -0,0 +1,241 @@
+"""
+Continuous field sweeps of magnet power supplies.
+
+Setting the field of a magnet power supply usually blocks until the ramp has
+finished, so measurements are taken at a few fixed fields and the time spent
+ramping in between is lost. :class:`FieldSweep` instead starts the ramp and
+returns right away. A background thread reads the field of the supply at a
+fixed interval and stores the time stamped readbacks in a ring buffer.
+Measurements taken while the magnet ramps are time stamped as well, and are
+tagged with the field interpolated to their time stamps.
+
+Drivers support this through :class:`FieldSweepMixin`, which starts the ramp
+and the poller with :meth:`FieldSweepMixin.start_field_sweep`.
+"""
+import threading
+import time
+from abc import abstractmethod
+from collections.abc import Callable, Sequence
+from typing import Any, Optional, Union
+
+import numpy as np
+from qcodes.instrument import Instrument
+
+from .sampling import RingBufferSampler
+
+FieldReading = Union[float, Sequence[float]]
+
+
+class FieldSweep(RingBufferSampler):
+    """
+    Background poller recording the field of a ramping magnet.
+
+    The poller calls ``read`` and ``ramping`` every ``interval`` seconds and
+    stops once ``ramping`` returns False, after one last readback of the
+    final field. Readbacks are time stamped with :func:`time.time` at the
+    middle of the read. Only the last ``capacity`` readbacks are kept.
+
+    ``read`` may return a single value, or a sequence of values for vector
+    magnets; :meth:`field_at` then interpolates each component.
+
+    Args:
+        read: Returns the present field (or current) of the supply.
+        ramping: Returns True while the supply is ramping.
+        interval: Time in seconds between readbacks.
+        capacity: Number of readbacks kept in the ring buffer.
+        settle_time: Time in seconds after starting during which ``ramping``
+            returning False does not end the sweep, for supplies that take a
+            moment to report that a ramp has started.
+        lock: Lock held while talking to the supply, shared with the driver
+            so that the poller does not interleave with other commands.
+    """
+
+    def __init__(self, read: Callable[[], FieldReading],
+                 ramping: Callable[[], bool],
+                 interval: float = 0.1, capacity: int = 100_000,
+                 settle_time: float = 0.0,
+                 lock: Optional[threading.RLock] = None) -> None:
+        super().__init__(read, interval, capacity, lock)
+        self.settle_time = settle_time
+        self._ramping = ramping
+        self._tags: list[tuple[float, Any]] = []
+
+    def __enter__(self) -> 'FieldSweep':
+        return self
+
+    def stop(self) -> None:
+        """
+        Stop recording readbacks. This does not stop the ramp of the supply.
+        """
+        super().stop()
+
+    def readbacks(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return the recorded readbacks, oldest first.
+
+        Returns:
+            The time stamps and the fields. The fields have one column per
+            component if ``read`` returns sequences.
+        """
+        times, values = self.samples()
+        if times.size == 0:
+            return times, np.empty(0)
+        return times, values[:, 0] if values.shape[1] == 1 else values
+
+    def field_at(self, timestamps: Union[float, Sequence[float], np.ndarray]) -> np.ndarray:
+        """
+        Interpolate the recorded field to the given time stamps.
+
+        Time stamps outside the recorded readbacks give NaN, except those
+        after the end of a finished ramp, which give the final field.
+
+        Args:
+            timestamps: Time stamps as returned by :func:`time.time`.
+
+        Returns:
+            The fields, with an additional last axis per component for
+            vector readings.
+        """
+        times, values = self.samples()
+        if times.size == 0:
+            return np.full(np.shape(timestamps), np.nan)
+        fields = self.interpolate(timestamps, values[-1] if self.finished else np.nan)
+        return fields[..., 0] if values.shape[1] == 1 else fields
+
+    def tag(self, value: Any, timestamp: Optional[float] = None) -> None:
+        """
+        Record a measured value to be tagged with the field.
+
+        Args:
+            value: The measured value.
+            timestamp: Time stamp of the measurement, defaults to now.
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        with self._condition:
+            self._tags.append((timestamp, value))
+
+    def measure(self, *parameters: Any) -> list[Any]:
+        """
+        Get parameters and tag their values with the field, time stamped at
+        the middle of the measurement.
+
+        Args:
+            *parameters: QCoDeS parameters (or anything with ``get``).
+
+        Returns:
+            The measured values.
+        """
+        start = time.time()
+        values = [parameter.get() for parameter in parameters]
+        self.tag(values, (start + time.time()) / 2)
+        return values
+
+    def tagged(self) -> tuple[np.ndarray, np.ndarray, list[Any]]:
+        """
+        Return the tagged measurements with the interpolated field.
+
+        The fields are interpolated when this is called, so measurements
+        taken just before the latest readback get their field once the
+        next readback has been recorded.
+
+        Returns:
+            The time stamps, the fields and the values of the measurements.
+        """
+        with self._condition:
+            tags = list(self._tags)
+        timestamps = np.array([timestamp for timestamp, _ in tags])
+        return timestamps, self.field_at(timestamps), [value for _, value in tags]
+
+    def _finished(self) -> bool:
+        assert self.started_at is not None
+        return not self._ramping() and time.time() - self.started_at >= self.settle_time
+
+
+class FieldSweepMixin(Instrument):
+    """
+    Mixin for magnet power supplies adding continuous field sweeps.
+
+    Use it as the first base class of a driver, e.g.
+    ``class MyMagnet(FieldSweepMixin, VisaInstrument)``. The driver must
+    implement the abstract methods :meth:`_start_field_ramp`,
+    :meth:`_field_ramping` and :meth:`_read_swept_field`, otherwise it
+    cannot be instantiated.
+
+    Commands sent through ``write_raw`` and ``ask_raw`` hold a lock shared
+    with the poller, so the driver can still be used while a sweep runs.
+    """
+
+    #: Default time in seconds between readbacks of a sweep.
+    field_sweep_interval: float = 0.1
+
+    #: Time in seconds the supply may take to report that a ramp started.
+    field_sweep_settle_time: float = 0.5
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self._field_sweep_lock = threading.RLock()
+        self._field_sweep: Optional[FieldSweep] = None
+        super().__init__(*args, **kwargs)
+
+    def start_field_sweep(self, target: Any, interval: Optional[float] = None,
+                          capacity: int = 100_000, **ramp_options: Any) -> FieldSweep:
+        """
+        Start ramping to ``target`` and return without waiting.
+
+        Args:
+            target: The target field.
+            interval: Time in seconds between readbacks. Defaults to
+                :attr:`field_sweep_interval`.
+            capacity: Number of readbacks kept.
+            **ramp_options: Passed on to the driver when starting the ramp.
+
+        Returns:
+            The running sweep. Use :meth:`FieldSweep.measure` to take
+            measurements during the ramp and :meth:`FieldSweep.wait` to wait
+            for it to finish.
+
+        Raises:
+            RuntimeError: If another sweep of this instrument is running.
+        """
+        if self._field_sweep is not None and self._field_sweep.running:
+            raise RuntimeError(f"{self.name} is already sweeping the field")
+        with self._field_sweep_lock:
+            self._start_field_ramp(target, **ramp_options)
+        self._field_sweep = FieldSweep(
+            self._read_swept_field, self._field_ramping,
+            interval=self.field_sweep_interval if interval is None else interval,
+            capacity=capacity, settle_time=self.field_sweep_settle_time,
+            lock=self._field_sweep_lock)
+        return self._field_sweep.start()
+
+    @abstractmethod
+    def _start_field_ramp(self, target: Any) -> None:
+        """
+        Start ramping the field to ``target`` without waiting. Drivers may
+        accept additional keyword arguments, the ``ramp_options`` of
+        :meth:`start_field_sweep`.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def _field_ramping(self) -> bool:
+        """Return True while the supply is ramping."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def _read_swept_field(self) -> FieldReading:
+        """Return the present field of the supply."""
+        raise NotImplementedError
+
+    def write_raw(self, cmd: str) -> None:
+        with self._field_sweep_lock:
+            super().write_raw(cmd)
+
+    def ask_raw(self, cmd: str) -> str:
+        with self._field_sweep_lock:
+            return super().ask_raw(cmd)
+
+    def close(self) -> None:
+        if self._field_sweep is not None:
+            self._field_sweep.stop()
+        super().close()
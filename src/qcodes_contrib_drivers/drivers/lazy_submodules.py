@@ -0,0 +1,113 @@
+"""
+Mixin to construct the submodules of an instrument on first access.
+
+Drivers for feature-rich instruments add many submodules with many
+parameters each, although a measurement usually uses only a few of them.
+With lazy construction, a submodule is only instantiated (and thus only
+appears in snapshots) once it is accessed as an attribute, so the startup
+time and memory of a driver scale with the features actually used.
+"""
+from collections.abc import Callable, Iterable
+from typing import Any, Union
+
+from qcodes.instrument import ChannelList, ChannelTuple, InstrumentBase, InstrumentModule
+
+SubmoduleFactory = Callable[[], Union[InstrumentModule, ChannelTuple]]
+
+
+class LazySubmoduleMixin(InstrumentBase):
+    """
+    Mixin for instruments whose submodules can be constructed on demand.
+
+    Use it as the first base class of a driver, e.g.
+    ``class MyGenerator(LazySubmoduleMixin, VisaInstrument)``, and register
+    submodules with :meth:`add_lazy_submodule` instead of
+    :meth:`add_submodule`. If :attr:`lazy_submodules` is False (the
+    default), the submodules are constructed right away, exactly as with
+    :meth:`add_submodule`. Otherwise they are constructed on first
+    attribute access, or all at once with :meth:`build_submodules`.
+
+    Submodules that have not been constructed yet are not part of
+    :attr:`submodules` and therefore not part of snapshots.
+    """
+
+    #: Construct submodules on first access instead of during ``__init__``.
+    lazy_submodules: bool = False
+
+    def add_lazy_submodule(self, name: str, factory: SubmoduleFactory) -> None:
+        """
+        Register a submodule that is constructed by calling ``factory``.
+
+        Args:
+            name: Name of the submodule
+            factory: Callable without arguments returning the submodule
+        """
+        if not self.lazy_submodules:
+            self.add_submodule(name, factory())
+            return
+        if name in self.submodules or name in self._pending_submodules:
+            raise KeyError(f"Duplicate submodule name {name}")
+        self._pending_submodules[name] = factory
+
+    def add_lazy_channel_list(
+        self,
+        name: str,
+        list_name: str,
+        chan_type: type[InstrumentModule],
+        channel_names: Iterable[str],
+    ) -> None:
+        """
+        Register a locked, non-snapshotable channel list of submodules that
+        were registered before. Constructing the list constructs all its
+        channels.
+
+        Args:
+            name: Name of the submodule holding the channel list
+            list_name: Name of the channel list itself
+            chan_type: Type of the channels
+            channel_names: Names of the channel submodules, in list order
+        """
+        channel_names = list(channel_names)
+
+        def build() -> ChannelTuple:
+            channels = ChannelList(self, list_name, chan_type, snapshotable=False)
+            for channel_name in channel_names:
+                channels.append(getattr(self, channel_name))
+            channels.lock()
+            return channels
+
+        self.add_lazy_submodule(name, build)
+
+    @property
+    def _pending_submodules(self) -> dict[str, SubmoduleFactory]:
+        pending = self.__dict__.get("_lazy_submodule_factories")
+        if pending is None:
+            pending = self.__dict__["_lazy_submodule_factories"] = {}
+        return pending
+
+    @property
+    def pending_submodules(self) -> list[str]:
+        """Names of the registered submodules not constructed yet."""
+        return list(self._pending_submodules)
+
+    def build_submodules(self) -> None:
+        """Construct all submodules not constructed yet."""
+        for name in self.pending_submodules:
+            getattr(self, name)
+
+    def _build_submodule(self, name: str) -> Union[InstrumentModule, ChannelTuple]:
+        factory = self._pending_submodules.pop(name)
+        submodule = factory()
+        self.add_submodule(name, submodule)
+        return submodule
+
+    def __getattr__(self, key: str) -> Any:
+        pending = self.__dict__.get("_lazy_submodule_factories")
+        if pending and key in pending:
+            return self._build_submodule(key)
+        return super().__getattr__(key)
+
+    def __dir__(self) -> list[str]:
+        names = set(super().__dir__())
+        names.update(self.__dict__.get("_lazy_submodule_factories", ()))
+        return sorted(names)
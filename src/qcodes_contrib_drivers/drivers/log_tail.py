@@ -0,0 +1,105 @@
+"""
+Reader for the last line of growing log files.
+
+Drivers that get their values from log files written by another program
+(e.g. the fridge control software) only need the latest entry. Parsing the
+whole file for that costs time proportional to the file size, which grows
+during the day. :class:`LogTailReader` instead reads backwards from the end
+of the file up to the last complete line, and does not touch the file at all
+if it has not changed since the last read.
+"""
+import os
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+
+class _TailState(NamedTuple):
+    size: int
+    mtime_ns: int
+    line: Optional[str]
+
+
+class LogTailReader:
+    """
+    Returns the last complete line of log files, caching it per file until
+    the file changes.
+
+    A line is complete once its line break has been written, so a line that
+    is being written while the file is read is ignored.
+
+    Args:
+        block_size: Number of bytes read per step when searching backwards
+            for the start of the last line.
+        max_files: Number of files whose last line is remembered.
+        encoding: Encoding of the log files.
+    """
+
+    def __init__(self, block_size: int = 4096, max_files: int = 64,
+                 encoding: str = "utf-8") -> None:
+        self.block_size = block_size
+        self.max_files = max_files
+        self.encoding = encoding
+        self._files: "OrderedDict[str, _TailState]" = OrderedDict()
+
+    def last_line(self, path: str) -> Optional[str]:
+        """
+        Return the last complete line of a file, without line break.
+
+        Args:
+            path: Path of the log file.
+
+        Returns:
+            The last line, or None if the file holds no complete line yet.
+
+        Raises:
+            OSError: If the file cannot be accessed.
+        """
+        stat = os.stat(path)
+        state = self._files.get(path)
+        if state is not None and (state.size, state.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+            return state.line
+
+        with open(path, "rb") as file:
+            line = self._read_last_line(file, stat.st_size)
+
+        self._files[path] = _TailState(stat.st_size, stat.st_mtime_ns, line)
+        self._files.move_to_end(path)
+        while len(self._files) > self.max_files:
+            self._files.popitem(last=False)
+        return line
+
+    def forget(self, path: Optional[str] = None) -> None:
+        """
+        Drop the cached last line of a file, or of all files if no path is
+        given.
+        """
+        if path is None:
+            self._files.clear()
+        else:
+            self._files.pop(path, None)
+
+    def _read_last_line(self, file, size: int) -> Optional[str]:
+        # Only the first ``size`` bytes are considered, so that data appended
+        # after the stat call does not mix with the cached size.
+        buffer = b""
+        position = size
+        end: Optional[int] = None  # file offset of the break ending the last line
+        while position > 0:
+            step = min(self.block_size, position)
+            position -= step
+            file.seek(position)
+            buffer = file.read(step) + buffer
+            if end is None:
+                index = buffer.rfind(b"\n")
+                if index < 0:
+                    continue
+                end = position + index
+            start = buffer.rfind(b"\n", 0, end - position)
+            if start >= 0:
+                return self._decode(buffer[start + 1:end - position])
+        if end is None:
+            return None
+        return self._decode(buffer[:end])
+
+    def _decode(self, line: bytes) -> str:
+        return line.decode(self.encoding, errors="replace").rstrip("\r")
@@ -0,0 +1,241 @@
+"""
+Background sampling of instrument readings into a ring buffer.
+
+:class:`RingBufferSampler` calls a read function at a fixed interval in a
+background thread and keeps the time stamped readings in a numpy ring buffer.
+Readings can afterwards be interpolated to the time stamps of measurements
+taken meanwhile, and waits can be woken by new samples instead of polling
+the instrument in a loop of their own. It is the base of the field sweeps of
+magnet power supplies (:mod:`.field_sweep`) and the position sampling of the
+Attocube positioners (:mod:`.Attocube.position_sampler`).
+"""
+import logging
+import threading
+import time
+from collections.abc import Callable, Sequence
+from typing import Any, Optional, Self, Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+log = logging.getLogger(__name__)
+
+
+class RingBufferSampler:
+    """
+    Background thread recording time stamped readings in a ring buffer.
+
+    ``read`` is called every ``interval`` seconds until the sampler is
+    stopped, or until :meth:`_finished` returned True before a reading.
+    Readings are time stamped with :func:`time.time` at the middle of the
+    read. Only the last ``capacity`` readings are kept.
+
+    ``read`` may return a single value or a sequence of values, e.g. one per
+    axis; the readings are stored with one column per value.
+
+    Args:
+        read: Returns the present reading.
+        interval: Time in seconds between readings.
+        capacity: Number of readings kept in the ring buffer.
+        lock: Lock held while reading, shared with the driver so that the
+            sampler does not interleave with other commands.
+    """
+
+    def __init__(self, read: Callable[[], ArrayLike], interval: float = 0.1,
+                 capacity: int = 100_000,
+                 lock: Optional[threading.RLock] = None) -> None:
+        if capacity < 2:
+            raise ValueError("capacity must be at least 2")
+        self.interval = interval
+        self.capacity = capacity
+        self._read = read
+        self._lock = lock if lock is not None else threading.RLock()
+        self._condition = threading.Condition()
+        self._stopping = threading.Event()
+        self._done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+        self._times = np.empty(capacity)
+        self._values: Optional[np.ndarray] = None
+        self._count = 0
+        self.finished = False
+        self.started_at: Optional[float] = None
+
+    def __enter__(self) -> Self:
+        return self if self._thread is not None else self.start()
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    def start(self) -> Self:
+        """Start the sampling thread. Returns the sampler itself."""
+        if self._thread is not None:
+            raise RuntimeError(f"{type(self).__name__} has already been started")
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name=type(self).__name__,
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    @property
+    def running(self) -> bool:
+        """True while readings are recorded."""
+        return self._thread is not None and not self._done.is_set()
+
+    @property
+    def count(self) -> int:
+        """Number of readings recorded since starting."""
+        return self._count
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        """The exception which ended the sampling, if any."""
+        return self._error
+
+    def stop(self) -> None:
+        """Stop recording readings and wait for the thread to end."""
+        self._stopping.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """
+        Block until the sampling has finished or was stopped.
+
+        Args:
+            timeout: Maximum time to wait in seconds, None to wait forever.
+
+        Raises:
+            TimeoutError: If the sampling did not finish within ``timeout``.
+            RuntimeError: If reading failed.
+        """
+        if not self._done.wait(timeout):
+            raise TimeoutError(f"{type(self).__name__} did not finish within {timeout} s")
+        if self._error is not None:
+            raise RuntimeError("Reading failed") from self._error
+
+    def wait_for_sample(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the next reading has been recorded.
+
+        Returns:
+            False if there was no reading within ``timeout`` or the sampling
+            ended.
+        """
+        with self._condition:
+            count = self._count
+            self._condition.wait_for(
+                lambda: self._count > count or self._done.is_set(), timeout)
+            return self._count > count
+
+    def samples(self, n: Optional[int] = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return the last ``n`` readings, oldest first.
+
+        Args:
+            n: Number of readings, defaults to all readings kept.
+
+        Returns:
+            The time stamps and an array of the readings with one column per
+            value.
+        """
+        with self._condition:
+            if self._values is None:
+                return np.empty(0), np.empty((0, 0))
+            available = min(self._count, self.capacity)
+            n = available if n is None else min(n, available)
+            order = np.arange(self._count - n, self._count) % self.capacity
+            return self._times[order], self._values[order]
+
+    def latest(self) -> tuple[float, np.ndarray]:
+        """
+        Return the time stamp and values of the latest reading.
+
+        Raises:
+            RuntimeError: If nothing has been read yet.
+        """
+        times, values = self.samples(1)
+        if times.size == 0:
+            raise RuntimeError("Nothing has been read yet")
+        return float(times[0]), values[0]
+
+    def interpolate(self, timestamps: Union[float, Sequence[float], np.ndarray],
+                    right: Any = np.nan) -> np.ndarray:
+        """
+        Interpolate the recorded readings to the given time stamps.
+
+        Time stamps before the first kept reading give NaN, those after the
+        latest reading give ``right`` (per column).
+
+        Returns:
+            The readings, with an additional last axis per value.
+        """
+        times, values = self.samples()
+        timestamps = np.asarray(timestamps, dtype=float)
+        if times.size == 0:
+            return np.full(timestamps.shape + (max(values.shape[1], 1),), np.nan)
+        right = np.broadcast_to(right, values.shape[1:])
+        return np.stack([np.interp(timestamps, times, column, left=np.nan, right=r)
+                         for column, r in zip(values.T, right)], axis=-1)
+
+    def _finished(self) -> bool:
+        """
+        Called with the lock held before each reading. Returning True records
+        the following reading as the last one and marks the sampling as
+        finished.
+        """
+        return False
+
+    def _append(self, timestamp: float, value: ArrayLike) -> None:
+        reading = np.atleast_1d(np.asarray(value, dtype=float))
+        with self._condition:
+            if self._values is None:
+                self._values = np.empty((self.capacity, reading.size))
+            index = self._count % self.capacity
+            self._times[index] = timestamp
+            self._values[index] = reading
+            self._count += 1
+            self._condition.notify_all()
+
+    def _run(self) -> None:
+        try:
+            while not self._stopping.is_set():
+                start = time.time()
+                with self._lock:
+                    finished = self._finished()
+                    value = self._read()
+                self._append((start + time.time()) / 2, value)
+                if finished:
+                    self.finished = True
+                    break
+                self._stopping.wait(max(0.0, self.interval - (time.time() - start)))
+        except Exception as error:
+            log.exception(f"{type(self).__name__} failed")
+            self._error = error
+        finally:
+            with self._condition:
+                self._done.set()
+                self._condition.notify_all()
+
+
+def wait_until(predicate: Callable[[], bool], timeout: Optional[float] = None,
+               poll_interval: float = 0.01,
+               sampler: Optional[RingBufferSampler] = None) -> None:
+    """
+    Block until ``predicate`` returns True.
+
+    The predicate is evaluated after each new reading of a running sampler,
+    or every ``poll_interval`` seconds otherwise.
+
+    Raises:
+        TimeoutError: If ``predicate`` did not return True within ``timeout``.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while not predicate():
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if remaining is not None and remaining <= 0:
+            raise TimeoutError(f"Condition not met within {timeout} s")
+        if sampler is not None and sampler.running:
+            sampler.wait_for_sample(remaining if remaining is not None else 1.0)
+        else:
+            time.sleep(poll_interval if remaining is None else min(poll_interval, remaining))
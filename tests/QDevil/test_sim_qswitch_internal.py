@@ -3,7 +3,11 @@ from qcodes_contrib_drivers.drivers.QDevil.QSwitch import (
     _state_diff,
     channel_list_to_state,
     compress_channel_list,
-    expand_channel_list)
+    expand_channel_list,
+    mask_to_compressed_list,
+    mask_to_state,
+    state_to_compressed_list,
+    state_to_mask)
 
 
 @pytest.mark.parametrize(('input', 'output'), [
@@ -52,3 +56,23 @@ def test_state_diff(before, after, positive, negative):  # noqa
     # -----------------------------------------------------------------------
     assert pos == positive
     assert neg == negative
+
+
+@pytest.mark.parametrize('state', [
+    [],
+    [(1, 2)],
+    [(1, 0), (2, 0), (3, 0), (4, 9), (23, 7), (24, 7)],
+    [(24, 8), (22, 7), (20, 6), (1, 9), (2, 0), (21, 7)],
+])
+def test_mask_gives_same_channel_list_as_state(state):  # noqa
+    # -----------------------------------------------------------------------
+    mask = state_to_mask(state)
+    # -----------------------------------------------------------------------
+    assert mask_to_compressed_list(mask) == state_to_compressed_list(state)
+    assert sorted(mask_to_state(mask)) == sorted(set(state))
+
+
+@pytest.mark.parametrize('state', [[(0, 1)], [(25, 1)], [(1, 10)]])
+def test_mask_rejects_unknown_relays(state):  # noqa
+    with pytest.raises(ValueError):
+        state_to_mask(state)
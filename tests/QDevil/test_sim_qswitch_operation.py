@@ -99,3 +99,40 @@ def test_ground_disconnects_multiple(qswitch):  # noqa
     assert commands == [
         'clos (@14!0:15!0)', '*opc?',
         'open (@14!1:15!1,14!9:15!9)', '*opc?']
+
+
+def test_transaction_sends_one_close_and_one_open(qswitch):  # noqa
+    # -----------------------------------------------------------------------
+    with qswitch.transaction():
+        qswitch.connect('14')
+        qswitch.breakout('22', '7')
+    # -----------------------------------------------------------------------
+    commands = qswitch.get_recorded_scpi_commands()
+    assert commands == ['clos (@22!7,14!9)', '*opc?', 'open (@14!0,22!0)', '*opc?']
+
+
+def test_transaction_sends_only_net_changes(qswitch):  # noqa
+    qswitch.connect('14')
+    qswitch.start_recording_scpi()
+    # -----------------------------------------------------------------------
+    with qswitch.transaction():
+        qswitch.ground('14')
+        qswitch.breakout('22', '7')
+        qswitch.ground('22')
+        qswitch.connect('3')
+    # -----------------------------------------------------------------------
+    commands = qswitch.get_recorded_scpi_commands()
+    assert commands == ['clos (@14!0,3!9)', '*opc?', 'open (@3!0,14!9)', '*opc?']
+    assert qswitch._state == '(@1!0:2!0,4!0:24!0,3!9)'
+
+
+def test_failed_transaction_sends_nothing(qswitch):  # noqa
+    # -----------------------------------------------------------------------
+    with pytest.raises(ValueError):
+        with qswitch.transaction():
+            qswitch.connect('14')
+            qswitch.breakout('14', 'VNA')
+    # -----------------------------------------------------------------------
+    commands = qswitch.get_recorded_scpi_commands()
+    assert commands == []
+    assert qswitch._state == '(@1!0:24!0)'
@@ -0,0 +1,189 @@
+import sys
+import threading
+import time
+import types
+from functools import wraps
+
+import numpy as np
+import pytest
+
+from qcodes_contrib_drivers.drivers.Attocube.AMC100 import AttocubeAMC100
+
+
+def _exclusive(method):
+    """Count calls made while another call is still running."""
+
+    @wraps(method)
+    def call(self, *args):
+        if not self.busy.acquire(blocking=False):
+            self.overlaps += 1
+            return method(self, *args)
+        try:
+            time.sleep(1e-4)
+            return method(self, *args)
+        finally:
+            self.busy.release()
+    return call
+
+
+class _FakeAMCDevice:
+    """Closed loop positioner moving 0.4 mm towards its target per status check.
+
+    The control, move, status, description and system_service groups of the
+    API are all the device itself.
+    """
+
+    step = 0.4e6
+
+    def __init__(self, address):
+        self.address = address
+        self.control = self.move = self.status = self
+        self.description = self.system_service = self
+        self.positions = [0.0, 0.0, 0.0]
+        self.targets = [0.0, 0.0, 0.0]
+        self.moving = [False, False, False]
+        self.stuck = False
+        self.events = []
+        self.busy = threading.Lock()
+        self.overlaps = 0
+
+    def __getattr__(self, name):
+        # parameters which are not used by the moves
+        if name.startswith(("get", "set", "search")):
+            return lambda *args: 0
+        raise AttributeError(name)
+
+    def connect(self):
+        pass
+
+    def close(self):
+        pass
+
+    @_exclusive
+    def getActorType(self, axis):
+        return 0
+
+    @_exclusive
+    def getPosition(self, axis):
+        return self.positions[axis]
+
+    @_exclusive
+    def getPositionsAndVoltages(self):
+        return (*self.positions, 0.0, 0.0, 0.0)
+
+    @_exclusive
+    def setControlTargetPosition(self, axis, position):
+        self.targets[axis] = position
+
+    @_exclusive
+    def MultiAxisPositioning(self, set1, set2, set3, target1, target2, target3):
+        for axis, (enable, target) in enumerate(zip((set1, set2, set3),
+                                                    (target1, target2, target3))):
+            if enable:
+                self.targets[axis] = target
+
+    @_exclusive
+    def setControlMove(self, axis, enable):
+        self.events.append((axis, enable))
+        self.moving[axis] = enable
+
+    @_exclusive
+    def getStatusTargetRange(self, axis):
+        remaining = self.targets[axis] - self.positions[axis]
+        if self.moving[axis] and not self.stuck:
+            self.positions[axis] += float(np.clip(remaining, -self.step, self.step))
+        return abs(self.targets[axis] - self.positions[axis]) < 1
+
+
+@pytest.fixture(name="amc")
+def _make_amc(monkeypatch, tmp_path):
+    amc_module = types.ModuleType("AMC")
+    amc_module.Device = _FakeAMCDevice
+    amc_module.discover = lambda: {"192.168.1.1": "AMC100"}
+    acs_module = types.ModuleType("ACS")
+    acs_module.AttoException = type("AttoException", (Exception,), {})
+    monkeypatch.setitem(sys.modules, "AMC", amc_module)
+    monkeypatch.setitem(sys.modules, "ACS", acs_module)
+    monkeypatch.setattr(sys, "path", list(sys.path))
+
+    amc = AttocubeAMC100("amc100_fake", tmp_path)
+    yield amc
+    amc.close()
+
+
+def fake(amc):
+    return amc.device._target
+
+
+def test_move_axes_moves_together_and_stops(amc):
+    amc.move_axes({"axis_1": 1.0, 1: 2.0})
+
+    device = fake(amc)
+    assert device.positions == [1e6, 2e6, 0.0]
+    # both moves are started before waiting and stopped afterwards
+    assert device.events == [(0, True), (1, True), (0, False), (1, False)]
+    assert amc.axis_1.position.cache.get(get_if_invalid=False) == 1.0
+    assert amc.axis_2.position.cache.get(get_if_invalid=False) == 2.0
+
+
+def test_position_cache_is_updated_while_moving(amc, monkeypatch):
+    device = fake(amc)
+    cached = []
+    check = device.getStatusTargetRange
+
+    def record(axis):
+        cached.append(amc.axis_3.position.cache.get(get_if_invalid=False))
+        return check(axis)
+    monkeypatch.setattr(device, "getStatusTargetRange", record)
+
+    amc.axis_3.position(1.0)
+    assert device.positions[2] == 1e6
+    assert cached[1:] == pytest.approx([0.4, 0.8])
+    assert amc.axis_3.position.cache.get(get_if_invalid=False) == 1.0
+    assert device.events == [(2, True), (2, False)]
+
+
+def test_timeout_switches_the_moves_off(amc):
+    device = fake(amc)
+    device.stuck = True
+    with pytest.raises(TimeoutError):
+        amc.move_axes([1.0, np.nan, 2.0], timeout=0.05)
+    assert device.moving == [False, False, False]
+    assert device.events[-2:] == [(0, False), (2, False)]
+
+
+def test_run_trajectory_keeps_closed_loop_on(amc):
+    visited = []
+    positions = amc.run_trajectory(
+        [(0.5, 0.5), {"axis_1": 1.0}, [np.nan, 1.0, 0.2]],
+        callback=lambda index, position: visited.append((index, tuple(position))))
+
+    np.testing.assert_allclose(positions, [[0.5, 0.5, 0], [1.0, 0.5, 0], [1.0, 1.0, 0.2]])
+    assert [index for index, _ in visited] == [0, 1, 2]
+    device = fake(amc)
+    stops = [event for event in device.events if not event[1]]
+    assert device.events[-len(stops):] == stops
+    assert sorted(stops) == [(0, False), (1, False), (2, False)]
+
+
+def test_axis_keys(amc):
+    assert amc.start_move({0: 1.0, amc.axis_3: 1.0}) == [amc.axis_1, amc.axis_3]
+    with pytest.raises(ValueError):
+        amc.start_move({3: 1.0})
+    with pytest.raises(KeyError):
+        amc.start_move({"multi_axis_position": 1.0})
+
+
+def test_sampler_does_not_interleave_with_moves(amc):
+    sampler = amc.start_position_sampler(rate=2000)
+    try:
+        amc.move_axes([1.0, 2.0, 0.5], timeout=5)
+        amc.run_trajectory([[0.0, 0.0, 0.0], [0.4, 0.4, 0.4]], timeout=5)
+        assert sampler.running
+    finally:
+        amc.stop_position_sampler()
+
+    assert fake(amc).overlaps == 0
+    times, positions = sampler.samples()
+    assert positions.shape == (times.size, 3)
+    np.testing.assert_allclose(positions[-1], [0.4, 0.4, 0.4])
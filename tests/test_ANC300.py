@@ -0,0 +1,160 @@
+import copy
+from concurrent.futures import Future
+
+import pytest
+from qcodes.instrument import VisaInstrument
+
+from qcodes_contrib_drivers.drivers.Attocube import ANC300sim
+from qcodes_contrib_drivers.drivers.Attocube.ANC300 import ANC300
+
+
+class _MovingVisaHandle(ANC300sim.MockVisaHandle):
+    """The simulated controller, with outputs which stay active until stopped."""
+
+    def __init__(self):
+        super().__init__()
+        self.cmddef = copy.deepcopy(ANC300sim.MockVisaHandle.cmddef)
+        self.resource_name = "ASRL1::INSTR"
+        self.session = None
+        self.visalib = None
+        self.moving = set()
+        self.malformed = False
+
+    def write(self, data):
+        cmd = data.rstrip()
+        if "\r\n" not in cmd:
+            name, _, axis = cmd.partition(" ")
+            if name in ("stepu", "stepd"):
+                self.moving.add(axis)
+            elif name == "stop":
+                self.moving.discard(axis)
+            elif name == "geto" and axis in ("1", "2"):
+                if self.malformed:
+                    voltage = "n/a"
+                else:
+                    voltage = "20.000000" if axis in self.moving else "0.000000"
+                self.cmddef[cmd] = [f"voltage = {voltage} V"]
+        return super().write(data)
+
+
+class _Stage:
+    """Position readout of a stage moving ``step_size`` per step."""
+
+    def __init__(self, step_size):
+        self.step_size = step_size
+        self.position = 0.0
+        self.moves = []
+
+    def move(self, steps):
+        self.moves.append(steps)
+        self.position += self.step_size * steps
+        future = Future()
+        future.set_result(steps)
+        return future
+
+
+@pytest.fixture(name="handle")
+def _make_handle(monkeypatch):
+    monkeypatch.setattr(ANC300sim, "_USE_DEBUG", False)
+    return _MovingVisaHandle()
+
+
+@pytest.fixture(name="anc")
+def _make_anc(mocker, handle):
+    mocker.patch.object(VisaInstrument, "_connect_and_handle_error",
+                        return_value=handle)
+    anc = ANC300("anc300_sim", "ASRL1::INSTR")
+    anc.axis1.frequency(1000)
+    anc.axis2.frequency(1000)
+    yield anc
+    anc.close()
+
+
+def test_ask_many(anc):
+    assert anc.ask_many([]) == []
+    assert anc.ask_many(["getf 1", "getv 2", "getf 3", "getm 1"]) == \
+        ["1000", "20.000000", None, "gnd"]
+
+
+def test_refresh_status_matches_parameters(anc):
+    values = anc.refresh_status()
+    assert values
+    assert not any(key.startswith("axis3") for key in values)
+    for key, value in values.items():
+        module, name = key.split(".")
+        assert anc.submodules[module].parameters[name].get() == value
+
+    assert anc.refresh_status("axis2") == \
+        {key: value for key, value in values.items() if key.startswith("axis2.")}
+
+    everything = anc.getall()
+    assert everything["Version"] == anc.idn
+    assert everything["axis1.frequency"] == "1000 Hz"
+    assert everything["trigger1.state"] == "** not readable **"
+
+
+def test_move_async_resolves(anc, handle):
+    future = anc.axis1.move_async(10)
+    assert not future.done()
+
+    handle.moving.clear()
+    assert future.result(timeout=5) == 10
+
+    futures = anc.move_all({1: -5, "axis2": 3})
+    handle.moving.clear()
+    anc.wait_moves(futures, timeout=5)
+    assert {name: f.result() for name, f in futures.items()} == \
+        {"axis1": -5, "axis2": 3}
+
+
+def test_stop_fails_the_moves(anc):
+    future = anc.axis1.move_async(10)
+    anc.axis1.stopMove()
+    with pytest.raises(RuntimeError, match="axis1 was stopped"):
+        future.result(timeout=5)
+
+    futures = anc.move_all({1: 10, 2: -10})
+    anc.stopall()
+    for future in futures.values():
+        with pytest.raises(RuntimeError, match="was stopped"):
+            future.result(timeout=5)
+
+
+def test_malformed_reply_fails_the_move(anc, handle):
+    handle.malformed = True
+    future = anc.axis1.move_async(1)
+    with pytest.raises(ValueError):
+        future.result(timeout=5)
+
+    # the monitor is restarted for the next move
+    handle.malformed = False
+    future = anc.axis1.move_async(1)
+    handle.moving.clear()
+    assert future.result(timeout=5) == 1
+
+
+def test_move_to_target_reduces_the_steps(anc, mocker):
+    stage = _Stage(-0.37)
+    mocker.patch.object(type(anc.axis1), "move_async", side_effect=stage.move)
+    positions = []
+
+    def position():
+        positions.append(stage.position)
+        return stage.position
+
+    moved = anc.axis1.move_to_target(-50, position, tolerance=0.5)
+    assert abs(stage.position + 50) <= 0.5
+    assert moved == sum(stage.moves)
+    # the first move probes the step size, the later ones shrink towards the target
+    assert stage.moves[0] == -10
+    assert all(abs(a) >= abs(b) for a, b in zip(stage.moves[1:], stage.moves[2:]))
+    assert all(p >= -50.5 for p in positions)
+
+
+def test_move_to_target_gives_up(anc, mocker):
+    stage = _Stage(0.0)
+    mocker.patch.object(type(anc.axis1), "move_async", side_effect=stage.move)
+    with pytest.raises(RuntimeError, match="did not reach 1 within 5 moves"):
+        anc.axis1.move_to_target(1, lambda: stage.position, tolerance=0.1,
+                                 max_iterations=5)
+    assert stage.moves == [10] * 5
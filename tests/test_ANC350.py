@@ -0,0 +1,140 @@
+import threading
+import time
+from functools import wraps
+
+import numpy as np
+import pytest
+
+from qcodes_contrib_drivers.drivers.Attocube.ANC350 import ANC350
+from qcodes_contrib_drivers.drivers.Attocube.ANC350Lib import (ANC350LibActuatorType,
+                                                               ANC350v3Lib)
+
+
+def _exclusive(method):
+    """Count calls made while another call is still running."""
+
+    @wraps(method)
+    def call(self, *args):
+        if not self.busy.acquire(blocking=False):
+            self.overlaps += 1
+            return method(self, *args)
+        try:
+            time.sleep(1e-4)
+            return method(self, *args)
+        finally:
+            self.busy.release()
+    return call
+
+
+class _FakeLib(ANC350v3Lib):
+    """Positioner moving 0.4 mm towards its target per status read in auto move."""
+
+    step = 0.4e-3
+
+    def __init__(self):
+        self.positions = [0.0, 0.0, 0.0]
+        self.targets = [0.0, 0.0, 0.0]
+        self.auto_move = [False, False, False]
+        self.stuck = False
+        self.events = []
+        self.busy = threading.Lock()
+        self.overlaps = 0
+
+    def discover(self, search_usb=True, search_tcp=True):
+        return 1
+
+    def connect(self, dev_no=0):
+        return "handle"
+
+    def disconnect(self, dev_handle):
+        pass
+
+    def get_actuator_type(self, dev_handle, axis_no):
+        return ANC350LibActuatorType.Linear
+
+    @_exclusive
+    def get_position(self, dev_handle, axis_no):
+        return self.positions[axis_no]
+
+    @_exclusive
+    def set_target_position(self, dev_handle, axis_no, target):
+        self.targets[axis_no] = target
+
+    @_exclusive
+    def start_auto_move(self, dev_handle, axis_no, enable, relative):
+        self.events.append((axis_no, enable))
+        self.auto_move[axis_no] = enable
+
+    @_exclusive
+    def get_axis_status(self, dev_handle, axis_no):
+        remaining = self.targets[axis_no] - self.positions[axis_no]
+        if self.auto_move[axis_no] and not self.stuck:
+            self.positions[axis_no] += float(np.clip(remaining, -self.step, self.step))
+        target = abs(self.targets[axis_no] - self.positions[axis_no]) < 1e-9
+        moving = self.auto_move[axis_no] and not target
+        return True, True, moving, target, False, False, False
+
+
+@pytest.fixture(name="anc")
+def _make_anc(monkeypatch):
+    monkeypatch.setattr(ANC350, "_MOVE_START_DELAY", 0.0)
+    anc = ANC350("anc350_fake", _FakeLib())
+    yield anc
+    anc.close()
+
+
+def fake(anc):
+    return anc._lib._target
+
+
+def test_move_axes_moves_together_and_stops(anc):
+    anc.move_axes({"x_axis": 1.0, 1: 2.0})
+
+    lib = fake(anc)
+    assert lib.positions == pytest.approx([1e-3, 2e-3, 0.0])
+    assert lib.events == [(0, True), (1, True), (0, False), (1, False)]
+    np.testing.assert_allclose(anc.get_positions(), [1.0, 2.0, 0.0])
+
+
+def test_timeout_disables_auto_move(anc):
+    lib = fake(anc)
+    lib.stuck = True
+    with pytest.raises(TimeoutError):
+        anc.move_axes([1.0, None, 2.0], timeout=0.05)
+    assert lib.auto_move == [False, False, False]
+    assert lib.events[-2:] == [(0, False), (2, False)]
+
+
+def test_run_trajectory_keeps_auto_move_on(anc):
+    visited = []
+    positions = anc.run_trajectory(
+        [(0.5, 0.5), {anc.x_axis: 1.0}, [None, 1.0, 0.2]],
+        callback=lambda index, position: visited.append(index))
+
+    np.testing.assert_allclose(positions, [[0.5, 0.5, 0], [1.0, 0.5, 0], [1.0, 1.0, 0.2]])
+    assert visited == [0, 1, 2]
+    lib = fake(anc)
+    stops = [event for event in lib.events if not event[1]]
+    assert lib.events[-len(stops):] == stops
+    assert sorted(stops) == [(0, False), (1, False), (2, False)]
+
+
+def test_axis_keys(anc):
+    assert anc.start_move({0: 1.0, "z_axis": 1.0}) == [anc.x_axis, anc.z_axis]
+    with pytest.raises(ValueError):
+        anc.start_move({3: 1.0})
+    anc.wait_for_targets([0, "z_axis"], timeout=5)
+    assert fake(anc).auto_move == [False, False, False]
+
+
+def test_sampler_does_not_interleave_with_moves(anc):
+    sampler = anc.start_position_sampler(rate=2000)
+    try:
+        anc.move_axes([1.0, 2.0, 0.5], timeout=5)
+        anc.run_trajectory([[0.0, 0.0, 0.0], [0.4, 0.4, 0.4]], timeout=5)
+        assert sampler.running
+    finally:
+        anc.stop_position_sampler()
+
+    assert fake(anc).overlaps == 0
+    np.testing.assert_allclose(sampler.latest()[1], [0.4, 0.4, 0.4])
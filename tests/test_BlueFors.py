@@ -0,0 +1,72 @@
+import math
+from datetime import date, timedelta
+
+import pytest
+
+from qcodes_contrib_drivers.drivers.BlueFors.BlueFors import BlueFors
+from qcodes_contrib_drivers.drivers.log_tail import LogTailReader
+
+
+def _folder(tmp_path, day):
+    folder_name = day.strftime("%y-%m-%d")
+    folder = tmp_path / folder_name
+    folder.mkdir(exist_ok=True)
+    return folder, folder_name
+
+
+def _maxigauge_line(pressures):
+    fields = ["26-10-18", "12:00:00"]
+    for channel, pressure in enumerate(pressures, start=1):
+        fields += [f"CH{channel}", "       ", "1", f"{pressure:.2e}", "0", "1"]
+    return ",".join(fields) + ",\n"
+
+
+@pytest.fixture(name="fridge")
+def _make_fridge(tmp_path):
+    fridge = BlueFors("bluefors", str(tmp_path),
+                      channel_vacuum_can=1, channel_pumping_line=2,
+                      channel_compressor_outlet=3, channel_compressor_inlet=4,
+                      channel_mixture_tank=5, channel_venting_line=6,
+                      channel_50k_plate=1, channel_4k_plate=2,
+                      channel_still=5, channel_mixing_chamber=6)
+    yield fridge
+    fridge.close()
+
+
+def test_log_tail_reader_last_complete_line(tmp_path):
+    path = tmp_path / "test.log"
+    path.write_text("")
+    reader = LogTailReader(block_size=4)
+
+    assert reader.last_line(str(path)) is None
+    path.write_text("first line\r\nsecond line\nthird, being writ")
+    assert reader.last_line(str(path)) == "second line"
+    with path.open("a") as file:
+        file.write("ten\n")
+    assert reader.last_line(str(path)) == "third, being written"
+
+
+def test_temperature_from_last_line(fridge, tmp_path):
+    folder, folder_name = _folder(tmp_path, date.today())
+    (folder / f"CH6 T {folder_name}.log").write_text(
+        " 18-10-26,11:59:00,1.100000E-2\n 18-10-26,12:00:00,1.000000E-2\n")
+
+    assert fridge.temperature_mixing_chamber() == pytest.approx(0.01)
+
+
+def test_pressures_from_one_line(fridge, tmp_path):
+    folder, folder_name = _folder(tmp_path, date.today())
+    (folder / f"maxigauge {folder_name}.log").write_text(
+        _maxigauge_line([1e-6, 2e-1, 3, 4, 5e2, 6e2]))
+
+    assert fridge.get_pressures() == pytest.approx(
+        {1: 1e-6, 2: 2e-1, 3: 3, 4: 4, 5: 5e2, 6: 6e2})
+    assert fridge.pressure_venting_line() == pytest.approx(6e2)
+
+
+def test_day_rollover_uses_previous_file(fridge, tmp_path):
+    folder, folder_name = _folder(tmp_path, date.today() - timedelta(days=1))
+    (folder / f"CH1 T {folder_name}.log").write_text(" 18-10-26,23:59:00,45.0\n")
+
+    assert fridge.temperature_50k_plate() == pytest.approx(45.0)
+    assert math.isnan(fridge.temperature_4k_plate())
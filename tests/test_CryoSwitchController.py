@@ -0,0 +1,212 @@
+import copy
+import json
+import sys
+import time
+
+import numpy as np
+import pytest
+
+from qcodes_contrib_drivers.drivers.QphoX.CryoSwitchController import qcodes_driver
+from qcodes_contrib_drivers.drivers.QphoX.CryoSwitchController.CryoSwitchController import (
+    STATES_DEFAULT, Cryoswitch)
+
+
+class _FakeLabphox:
+    """Answers the commands used for switching with a R583423141 switch."""
+
+    def __init__(self):
+        self.peak_current = 100.0
+        self.unselectable = set()
+        self.adc_code = lambda: 1000
+        self.pulses = []
+
+    def IO_expander_cmd(self, cmd, port='A', value=0):
+        if cmd not in ('connect', 'disconnect'):
+            return None
+        if (port, value + 1) in self.unselectable:
+            return {'value': -1}
+        shift_byte = 0b0110 if cmd == 'connect' else 0b1001
+        validation_id = shift_byte << 2 * value
+        return {'value': (validation_id & 255) | (validation_id >> 8)}
+
+    def application_cmd(self, cmd, value=0):
+        self.pulses.append(cmd)
+        return np.array([0.0, self.peak_current, self.peak_current / 2])
+
+    def disconnect(self):
+        pass
+
+    def gpio_cmd(self, cmd, value=0):
+        return 1
+
+    def ADC_cmd(self, cmd, value=0):
+        if cmd == 'get':
+            return self.adc_code()
+        return None
+
+
+class _FakeClock:
+    """Monotonic clock advanced by sleep instead of by the wall time."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+@pytest.fixture(name="clock")
+def _make_clock(monkeypatch):
+    clock = _FakeClock()
+    monkeypatch.setattr(sys.modules[Cryoswitch.__module__], 'time', clock)
+    return clock
+
+
+@pytest.fixture(name="switch")
+def _make_switch(tmp_path, clock):
+    # the controller is set up by hand, its constructor talks to the hardware
+    switch = Cryoswitch.__new__(Cryoswitch)
+    switch.labphox = _FakeLabphox()
+    switch.debug = False
+    switch.verbose = False
+    switch.SN = 'SN1'
+    switch.ports_enabled = 4
+    switch.current_switch_model = 'R583423141'
+    switch.measured_adc_ref = 1
+    switch.current_sense_R = 1
+    switch.current_gain = 1
+    switch.ADC_8B_res = 1000
+    switch.MEASURED_converter_voltage = 5
+    switch.wait_time = 0.5
+    switch.poll_interval = 0.005
+    switch.ADC_settle_codes = 8
+    switch.ADC_settle_time = 0.05
+    switch.warning_threshold_current = 60
+    switch.plot = False
+    switch.log_wav = False
+    switch.pulse_logging = True
+    switch.pulse_logging_filename = str(tmp_path / 'pulse_logging.txt')
+    switch.track_states = True
+    switch.track_states_file = str(tmp_path / 'states.json')
+    states = copy.deepcopy(STATES_DEFAULT)
+    states['SN1'] = copy.deepcopy(states['SN'])
+    with open(switch.track_states_file, 'w') as outfile:
+        json.dump(states, outfile)
+    return switch
+
+
+def states(switch):
+    with open(switch.track_states_file) as file:
+        return json.load(file)['SN1']
+
+
+def test_poll_until(switch, clock):
+    values = iter([1, 2, 3, 4])
+    assert switch.poll_until(lambda: next(values), lambda value: value >= 3, 1) == 3
+    assert clock.now == pytest.approx(2 * switch.poll_interval)
+
+    clock.now = 0.0
+    assert switch.poll_until(lambda: 0, bool, 0.05) == 0
+    assert 0.05 <= clock.now < 0.05 + switch.poll_interval
+
+
+def test_read_settled_waits_for_a_stable_window(switch, clock):
+    # an input settling with a time constant of 10 ms
+    switch.labphox.adc_code = lambda: round(1000 * (1 - np.exp(-clock.now / 0.01)))
+
+    code = switch.measure_ADC(1)
+    assert abs(code - 1000) <= switch.ADC_settle_codes
+    assert switch.ADC_settle_time <= clock.now < switch.wait_time
+
+    # a constant code still takes the settle time
+    switch.labphox.adc_code = lambda: 1000
+    clock.now = 0.0
+    assert switch.measure_ADC(1) == 1000
+    assert switch.ADC_settle_time <= clock.now < switch.ADC_settle_time + 2 * switch.poll_interval
+
+
+def test_read_settled_gives_up_after_wait_time(switch, clock):
+    codes = iter(range(0, 10**6, 100))
+    switch.wait_time = 0.05
+    assert switch.read_settled(lambda: next(codes)) > 0
+    assert 0.05 <= clock.now < 0.05 + switch.poll_interval
+
+
+def test_pulse_batch(switch):
+    switch.labphox.unselectable.add(('B', 2))
+    profiles, success = switch.pulse_batch([('A', 1, 1), ('B', 2, 1), ('C', 3, 0)])
+
+    assert profiles.shape == (3, 3)
+    assert np.all(np.isnan(profiles[1]))
+    np.testing.assert_array_equal(success, [True, False, True])
+    assert len(switch.labphox.pulses) == 2
+
+    state = states(switch)
+    assert state['port_A']['contact_1'] == 1
+    assert state['port_B']['contact_2'] == 0
+    with open(switch.pulse_logging_filename) as logging_file:
+        assert len(logging_file.readlines()) == 2
+
+    switch.labphox.peak_current = 10
+    _, success = switch.pulse_batch([('A', 1, 0)])
+    np.testing.assert_array_equal(success, [False])
+    # a pulse which failed the verification does not change the tracked state
+    assert states(switch)['port_A']['contact_1'] == 1
+    with open(switch.pulse_logging_filename) as logging_file:
+        assert len(logging_file.readlines()) == 3
+    _, success = switch.pulse_batch([('A', 1, 0)], threshold=5)
+    np.testing.assert_array_equal(success, [True])
+    assert states(switch)['port_A']['contact_1'] == 0
+
+
+def test_pulse_batch_rejects_invalid_operations(switch):
+    assert switch.pulse_batch([('A', 1, 1), ('A', 7, 1)]) is None
+    assert switch.labphox.pulses == []
+
+
+def test_apply_states(switch):
+    switch.pulse_batch([('A', 1, 1), ('B', 3, 1)])
+
+    operations, profiles, success = switch.apply_states({'A': 2, 'B': 0, 'C': 4})
+    assert operations == [('A', 1, 0), ('A', 2, 1), ('B', 3, 0), ('C', 4, 1)]
+    assert profiles.shape[0] == 4
+    assert success.all()
+    state = states(switch)
+    assert state['port_A'] == {**state['port_A'], 'contact_1': 0, 'contact_2': 1}
+    assert state['port_C']['contact_4'] == 1
+
+    operations, profiles, success = switch.apply_states({'A': 2})
+    assert operations == []
+    assert switch.apply_states({'A': 2}, force=True)[0] == [('A', 2, 1)]
+
+
+@pytest.fixture(name="driver")
+def _make_driver(mocker, switch):
+    mocker.patch.object(qcodes_driver, 'Cryoswitch', return_value=switch)
+    driver = qcodes_driver.CryoSwitchControllerDriver('cryoswitch_fake')
+    yield driver
+    driver.close()
+
+
+def test_driver_tracks_only_successful_pulses(driver, switch):
+    switch.labphox.unselectable.add(('B', 2))
+    driver.pulse_batch([('A', 1, 1), ('B', 2, 1)])
+    assert driver.channels[0].active_contact() == 1
+    assert driver.channels[1].active_contact() == 0
+
+    switch.labphox.peak_current = 10
+    driver.apply_states({'A': 3})
+    assert driver.channels[0].active_contact() == 1
+
+    # the tracked states still agree with the active contacts
+    switch.labphox.peak_current = 100
+    operations, _, success = driver.apply_states({'A': 3})
+    assert operations == [('A', 1, 0), ('A', 3, 1)]
+    assert success.all()
+    assert driver.channels[0].active_contact() == 3
@@ -0,0 +1,129 @@
+import pytest
+
+from qcodes_contrib_drivers.drivers.Cryogenic.CryogenicSMS120C import CryogenicSMS120C
+
+
+class _FakeSMS:
+    """Answers the commands of the SMS120C, ramping by 0.25 T per readback."""
+
+    def __init__(self):
+        self.heater = "ON"
+        self.sign = "POSITIVE"
+        self.output = 1.0
+        self.mid = 0.0
+        self.target = None
+        self.fault = None
+        self.commands = []
+
+    def status(self):
+        if self.fault is not None:
+            return self.fault
+        return "HOLDING ON TARGET" if self.target is None else "RAMPING"
+
+    def ask(self, cmd):
+        self.commands.append(cmd)
+        replies = {
+            "TESLA": "UNITS: TESLA",
+            "HEATER": f"HEATER STATUS: {self.heater}",
+            "GET SIGN": f"CURRENT DIRECTION: {self.sign}",
+            "GET MAX": "MAX SETTING: 5.000 TESLA",
+            "GET RATE": "RAMP RATE: 0.050 A/SEC",
+            "RAMP STATUS": f"RAMP STATUS: {self.status()}",
+        }
+        if cmd == "GET OUTPUT":
+            if self.target is not None:
+                step = max(-0.25, min(0.25, self.target - self.output))
+                self.output += step
+                if self.output == self.target:
+                    self.target = None
+            reply = f"OUTPUT: {self.output:.3f} TESLA AT 0.100 VOLTS"
+        elif cmd.startswith("SET MID"):
+            self.mid = float(cmd.split()[-1])
+            reply = f"MID SETTING: {self.mid:.3f} TESLA"
+        elif cmd.startswith("PAUSE"):
+            reply = "PAUSE STATUS: OFF"
+        else:
+            reply = replies[cmd]
+        return f"12:00:00 {reply}"
+
+    def write(self, cmd):
+        self.commands.append(cmd)
+        if cmd == "RAMP MID":
+            self.target = self.mid
+        elif cmd == "RAMP ZERO":
+            self.target = 0.0
+        elif cmd.startswith("DIRECTION"):
+            assert self.output == 0
+            self.sign = "NEGATIVE" if cmd.endswith("-") else "POSITIVE"
+
+
+@pytest.fixture(name="fake")
+def _make_fake():
+    return _FakeSMS()
+
+
+@pytest.fixture(name="sms")
+def _make_sms(fake, mocker):
+    # the simulated serial port cannot flush its buffers
+    mocker.patch("pyvisa.resources.SerialInstrument.flush")
+    sms = CryogenicSMS120C(
+        "sms_sim", "ASRL1::INSTR",
+        pyvisa_sim_file="qcodes_contrib_drivers.sims:CryogenicSMS120C.yaml")
+    sms.field_sweep_settle_time = 0
+    mocker.patch.object(sms, "ask", side_effect=fake.ask)
+    mocker.patch.object(sms, "write", side_effect=fake.write)
+    yield sms
+    # close strips the instance attributes, including the patched ones
+    mocker.stopall()
+    sms.close()
+
+
+def test_sweep(sms, fake):
+    sweep = sms.start_field_sweep(2.0, interval=0.001)
+    sweep.wait(5)
+
+    _, fields = sweep.readbacks()
+    assert fields[-1] == 2.0
+    assert "RAMP MID" in fake.commands
+    assert "DIRECTION -" not in fake.commands
+
+
+def test_sweep_readback_does_not_query_unit(sms, fake):
+    sweep = sms.start_field_sweep(2.0, interval=0.001)
+    started = len(fake.commands)
+    sweep.wait(5)
+    assert "TESLA" not in fake.commands[started:]
+    assert fake.commands.count("GET OUTPUT") > 2
+
+
+def test_sweep_through_zero_changes_polarity(sms, fake):
+    sweep = sms.start_field_sweep(-0.5, interval=0.001)
+    sweep.wait(5)
+
+    ramps = [cmd for cmd in fake.commands
+             if cmd.startswith(("RAMP ", "DIRECTION")) and cmd != "RAMP STATUS"]
+    assert ramps == ["RAMP ZERO", "DIRECTION -", "RAMP MID"]
+    assert fake.sign == "NEGATIVE"
+    assert fake.output == 0.5
+
+
+@pytest.mark.parametrize("setup, target, error", [
+    (lambda fake: setattr(fake, "heater", "OFF"), 2.0, RuntimeError),
+    (lambda fake: setattr(fake, "fault", "QUENCH DETECTED"), 2.0, RuntimeError),
+    (lambda fake: None, 6.0, ValueError),
+    (lambda fake: None, -6.0, ValueError),
+])
+def test_sweep_preconditions(sms, fake, setup, target, error):
+    setup(fake)
+    with pytest.raises(error):
+        sms.start_field_sweep(target)
+    assert not any(cmd.startswith(("RAMP M", "RAMP Z", "SET MID"))
+                   for cmd in fake.commands)
+
+
+def test_fault_during_sweep_raises(sms, fake):
+    sweep = sms.start_field_sweep(4.0, interval=0.001)
+    fake.fault = "EXTERNAL TRIP"
+    with pytest.raises(RuntimeError) as error:
+        sweep.wait(5)
+    assert "EXTERNAL TRIP" in str(error.value.__cause__)
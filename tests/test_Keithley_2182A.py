@@ -280,6 +280,7 @@ def test_statistics_measurement(driver) -> None:
 
     assert stats["count"] == 5
     assert len(stats["measurements"]) == 5
+    assert isinstance(stats["measurements"], list)
     assert isinstance(stats["mean"], float)
     assert isinstance(stats["stdev"], float)
 
@@ -336,3 +337,65 @@ def test_reset(driver) -> None:
 
     # The instrument should be reset (values may vary depending on defaults)
     # This test mainly checks that reset doesn't cause errors
+
+
+def test_buffered_statistics_measurement(driver) -> None:
+    """Test statistics from a single buffered burst."""
+    stats = driver.measure_voltage_statistics(
+        num_measurements=5, buffered=True, binary=False
+    )
+
+    assert stats["count"] == 5
+    assert isinstance(stats["measurements"], np.ndarray)
+    assert stats["mean"] == pytest.approx(3.0e-6)
+    assert stats["min"] == pytest.approx(1.0e-6)
+    assert stats["max"] == pytest.approx(5.0e-6)
+
+
+def test_buffered_acquisition(driver) -> None:
+    """Test the split start/fetch buffered acquisition."""
+    driver.start_buffered_acquisition(5, binary=False)
+    assert driver._buffer_config == (5, False)
+    data = driver.fetch_buffered_acquisition()
+    np.testing.assert_allclose(data, [1e-6, 2e-6, 3e-6, 4e-6, 5e-6])
+
+    with pytest.raises(ValueError):
+        driver.configure_buffer(2000)
+
+    driver.reset()
+    with pytest.raises(RuntimeError):
+        driver.fetch_buffered_acquisition()
+
+
+def test_buffered_acquisition_binary(driver, mocker) -> None:
+    """Test the binary buffer transfer and the restored ASCII format."""
+    write = mocker.spy(driver, "write")
+    readings = np.array([1e-6, 2e-6, 3e-6, 4e-6, 5e-6, 0.0], dtype=np.float32)
+    query = mocker.patch.object(
+        driver.visa_handle, "query_binary_values", return_value=readings
+    )
+
+    driver.start_buffered_acquisition(5)
+    data = driver.fetch_buffered_acquisition()
+
+    assert data.dtype == np.float64
+    np.testing.assert_allclose(data, readings[:5])
+    assert query.call_args.args == ("TRAC:DATA?",)
+    assert query.call_args.kwargs["datatype"] == "f"
+    assert not query.call_args.kwargs["is_big_endian"]
+    commands = [call.args[0] for call in write.call_args_list]
+    assert commands[-2:] == ["FORM:BORD SWAP;:FORM:DATA SRE", "FORM:DATA ASC"]
+
+
+def test_buffer_reconfigured_after_measure(driver) -> None:
+    """Test that MEAS invalidates the buffer configuration."""
+    driver.configure_buffer(5, binary=False)
+    assert driver._buffer_config == (5, False)
+    driver.start_buffered_acquisition(5, binary=False)
+    assert driver._buffer_config == (5, False)
+
+    driver.voltage()
+    assert driver._buffer_config is None
+    data = driver.measure_voltage_buffered(5, binary=False)
+    assert driver._buffer_config == (5, False)
+    assert len(data) == 5
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from qcodes_contrib_drivers.drivers.Tektronix.Keithley_6430 import Keithley_6430
+
+
+@pytest.fixture(scope="function")
+def driver():
+    smu_sim = Keithley_6430(
+        "keithley_6430_sim",
+        "GPIB::1::INSTR",
+        pyvisa_sim_file="qcodes_contrib_drivers.sims:Keithley_6430.yaml",
+    )
+    yield smu_sim
+    smu_sim.close()
+
+
+def test_sweep(driver):
+    data = driver.sweep([0, 0.5, 1], binary=False)
+    np.testing.assert_allclose(data, [[0, 1e-9, 0], [0.5, 5e-7, 1e6], [1, 1e-6, 1e6]])
+
+    # the readout format seen by other parameters is restored
+    assert driver.ask(':FORM:ELEM?') == 'VOLT,CURR,RES,TIME,STAT'
+    assert driver.ask(':SOUR:VOLT:MODE?') == 'SWE'
+    assert driver.trigger_count() == '4'
+
+
+def test_sweep_restores_settings_on_error(driver, mocker):
+    mocker.patch.object(driver.visa_handle, 'query_binary_values',
+                        side_effect=TimeoutError)
+    with pytest.raises(TimeoutError):
+        driver.sweep([0, 0.5, 1])
+
+    assert driver.ask(':FORM:ELEM?') == 'VOLT,CURR,RES,TIME,STAT'
+    assert driver.ask(':SOUR:VOLT:MODE?') == 'SWE'
+    assert driver.trigger_count() == '4'
+
+
+def test_sweep_validation(driver):
+    with pytest.raises(ValueError):
+        driver.sweep([0, 300])
+    with pytest.raises(ValueError):
+        driver.sweep([])
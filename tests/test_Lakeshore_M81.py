@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from qcodes_contrib_drivers.drivers.Lakeshore.M81_SSM import M81_SSM
+
+
+@pytest.fixture(scope="function")
+def driver():
+    m81_sim = M81_SSM(
+        "m81_sim",
+        "TCPIP::192.168.1.1::INSTR",
+        pyvisa_sim_file="qcodes_contrib_drivers.sims:Lakeshore_M81.yaml",
+    )
+    yield m81_sim
+    m81_sim.close()
+
+
+def test_fetch_multiple(driver):
+    assert driver.fetch_multiple(('MX', 1), ('MY', 1), ('MOVerload', 1)) == (1.5e-6, -2.5e-7, False)
+
+    with pytest.raises(ValueError):
+        driver.fetch_multiple(('MZ', 1))
+
+
+def test_fetch_multiple_parameter(driver):
+    xy = driver.add_fetch_multiple_parameter('xy', ('MX', 1), ('MY', 1), ('MOVerload', 1))
+    assert xy.names == ('MX1', 'MY1', 'MOVerload1')
+    assert xy.units == ('V', 'V', '')
+    assert xy() == (1.5e-6, -2.5e-7, False)
+
+
+def test_stream_data(driver, mocker):
+    write = mocker.spy(driver, 'write')
+    columns = driver.stream_data(1000, 5, ('MX', 1), ('MY', 1))
+    np.testing.assert_array_equal(columns[0], [1, 3, 5, 1, 3])
+    np.testing.assert_array_equal(columns[1], [2, 4, 6, 2, 4])
+    assert write.call_args_list[-1].args == ('TRACe:STOP',)
+
+    points = driver.stream_data(1000, 5, ('MX', 1), ('MY', 1), transpose_data=False)
+    assert points[:2] == [(1.0, 2.0), (3.0, 4.0)]
+
+
+def test_stream_chunks_stop(driver, mocker):
+    write = mocker.spy(driver, 'write')
+    chunks = driver.stream_data_chunks(1000, None, ('MX', 1), ('MY', 1))
+    x, y = next(chunks)
+    np.testing.assert_array_equal(x, [1, 3, 5])
+    chunks.close()
+    assert write.call_args_list[-1].args == ('TRACe:STOP',)
+
+    chunks = driver.stream_data_chunks(1000, None, ('MX', 1), ('MY', 1), timeout=0.05)
+    assert sum(len(x) for x, _ in chunks) % 3 == 0
+    assert write.call_args_list[-1].args == ('TRACe:STOP',)
+
+
+def test_stream_stopped_on_error(driver, mocker):
+    write = mocker.spy(driver, 'write')
+    mocker.patch.object(driver, '_stream_dtype', return_value=np.dtype([('MX1', '<f8')]))
+    mocker.patch.object(driver.visa_handle, 'query', side_effect=RuntimeError('closed'))
+    with pytest.raises(RuntimeError):
+        list(driver.stream_data_chunks(1000, None, ('MX', 1), ('MY', 1)))
+    assert write.call_args_list[-1].args == ('TRACe:STOP',)
+
+
+def test_stream_data_without_data(driver, mocker, capsys):
+    ask = driver.ask
+    mocker.patch.object(driver, 'ask',
+                        side_effect=lambda cmd: '""' if cmd == 'TRACe:DATA?' else ask(cmd))
+    columns = driver.stream_data(1000, 5, ('MX', 1), ('MY', 1), timeout=0.05)
+    assert len(columns) == 2
+    assert all(column.dtype == float and column.size == 0 for column in columns)
+    assert 'Only 0 data points collected.' in capsys.readouterr().out
+
+    assert driver.stream_data(1000, 5, ('MX', 1), ('MY', 1), transpose_data=False,
+                              timeout=0.05) == []
@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+
+from qcodes_contrib_drivers.drivers.RohdeSchwarz.SMW200A import RohdeSchwarz_SMW200A
+
+
+@pytest.fixture(scope="function")
+def smw(mocker):
+    smw_sim = RohdeSchwarz_SMW200A(
+        "smw_sim",
+        "TCPIP::192.168.1.1::INSTR",
+        lazy_submodules=True,
+        terminator="\n",
+        pyvisa_sim_file="qcodes_contrib_drivers.sims:RohdeSchwarz_SMW200A.yaml",
+    )
+    # the simulated instrument only understands text, so the binary list
+    # tables are recorded without passing them on
+    sim_write_raw = smw_sim.visa_handle.write_raw
+    mocker.patch.object(
+        smw_sim.visa_handle, "write_raw",
+        side_effect=lambda message: None if b"#" in message
+        else sim_write_raw(message))
+    yield smw_sim
+    smw_sim.close()
+
+
+def written(smw):
+    return [call.args[0] for call in smw.visa_handle.write_raw.call_args_list]
+
+
+def block(header, values):
+    data = np.asarray(values, dtype="<f8").tobytes()
+    length = str(len(data))
+    return f"{header} #{len(length)}{length}".encode("ascii") + data + b"\n"
+
+
+def test_upload_list_writes_binary_blocks(smw):
+    list_mode = smw.list_mode1
+    frequencies = [1e9, 2e9, 3e9]
+
+    assert list_mode.upload_list("sweep", frequencies, -10, dwell=[1e-3, 2e-3, 3e-3])
+
+    messages = written(smw)
+    blocks = [message for message in messages if b"#" in message]
+    assert blocks == [
+        block("SOUR1:LIST:FREQ", frequencies),
+        block("SOUR1:LIST:POW", [-10.0, -10.0, -10.0]),
+        block("SOUR1:LIST:DWEL:LIST", [1e-3, 2e-3, 3e-3]),
+    ]
+    text = [message.decode().strip() for message in messages if b"#" not in message]
+    assert text == [
+        'SOUR1:LIST:SEL "sweep"',
+        "FORM:BORD NORM",
+        "FORM:DATA PACK",
+        "FORM:DATA ASC",
+        "SOUR1:LIST:DWEL:MODE LIST",
+    ]
+    assert list_mode.selected() == "sweep"
+    assert list_mode.dwell_mode() == "LIST"
+
+
+def test_upload_list_fixed_dwell(smw):
+    list_mode = smw.list_mode1
+    list_mode.upload_list("sweep", [1e9, 2e9], [-10, -20], dwell=0.005)
+
+    assert list_mode.dwell() == 0.005
+    assert list_mode.dwell_mode() == "FIX"
+    blocks = [message for message in written(smw) if b"#" in message]
+    assert blocks == [block("SOUR1:LIST:FREQ", [1e9, 2e9]),
+                      block("SOUR1:LIST:POW", [-10.0, -20.0])]
+
+
+def test_upload_list_skips_known_tables(smw):
+    list_mode = smw.list_mode1
+    frequencies = np.linspace(1e9, 2e9, 11)
+
+    assert list_mode.upload_list("sweep", frequencies, -10)
+    assert not list_mode.upload_list("sweep", frequencies, -10)
+    assert list_mode.upload_list("sweep", frequencies, -10, force=True)
+    assert list_mode.upload_list("other", frequencies, -10)
+    assert list_mode.upload_list("sweep", frequencies, -20)
+    assert len([message for message in written(smw) if b"#" in message]) == 8
+
+    list_mode.delete_list("sweep")
+    assert "sweep" not in smw.list_cache
+
+
+@pytest.mark.parametrize("frequencies, levels, dwell", [
+    ([], -10, None),
+    ([[1e9, 2e9]], -10, None),
+    ([1e9, 2e9], [-10, -10, -10], None),
+    ([1e9, 2e9], -10, [1e-3]),
+    ([1e9, 50e9], -10, None),
+    ([1e9, np.nan], -10, None),
+    ([1e9, 2e9], [-10, 40], None),
+    ([1e9, 2e9], -10, [1e-3, 1e-6]),
+])
+def test_upload_list_rejects_invalid_tables(smw, frequencies, levels, dwell):
+    with pytest.raises(ValueError):
+        smw.list_mode1.upload_list("sweep", frequencies, levels, dwell=dwell)
+    assert written(smw) == []
+    assert smw.list_cache == {}
+
+
+def test_start_and_stop(smw):
+    list_mode = smw.list_mode1
+    list_mode.start(trigger_source="BUS", mode="STEP")
+    assert list_mode.trigger_source() == "BUS"
+    assert list_mode.mode() == "STEP"
+    assert smw.rfoutput1.mode() == "LIST"
+
+    list_mode.trigger()
+    assert written(smw)[-1].strip() == b"*TRG"
+
+    list_mode.stop()
+    assert smw.rfoutput1.mode() == "CW"
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from qcodes_contrib_drivers.drivers.Ametek.SR_7270 import Signalrecovery7270
+
+
+@pytest.fixture(scope="function")
+def lockin():
+    lockin_sim = Signalrecovery7270(
+        "lockin_sim",
+        "GPIB::1::INSTR",
+        pyvisa_sim_file="qcodes_contrib_drivers.sims:Ametek_SR7270.yaml",
+    )
+    yield lockin_sim
+    lockin_sim.close()
+
+
+def test_ask_raw_strips_terminators(lockin):
+    assert lockin.model == "7270"
+    assert lockin.ask_raw("X.") == "1.5E-03"
+    assert lockin.xy() == complex(1.5e-3, -2e-4)
+
+
+def test_write_reads_empty_reply(lockin):
+    lockin.curve_length(4)
+    # the empty reply of LEN must not end up in the next response
+    assert lockin.x() == 1.5e-3
+    assert lockin.curve_length() == 4
+
+
+def test_setup_curve_buffer(lockin, mocker):
+    query = mocker.spy(lockin.visa_handle, "query")
+
+    lockin.setup_curve_buffer(4, 1e-3, curves=("x", "y", "phase"))
+
+    assert [call.args[0] for call in query.call_args_list] == [
+        "CBD 11", "LEN 4", "STR 1000"]
+    assert lockin.ask("CBD") == "11"
+    assert lockin.curve_storage_interval() == 1e-3
+
+    with pytest.raises(ValueError):
+        lockin.setup_curve_buffer(4, 1e-3, curves=("x", "z"))
+
+
+def test_get_curves_decodes_binary_transfer(lockin, mocker):
+    lockin.setup_curve_buffer(4, 1e-3, curves=("x", "phase"))
+    raw = {
+        "DCB 0": np.array([10000, -5000, 0, 1], dtype=">i2"),
+        "DCB 3": np.array([18000, -9000, 4500, 0], dtype=">i2"),
+    }
+    write = mocker.spy(lockin.visa_handle, "write")
+    read_bytes = mocker.patch.object(
+        lockin.visa_handle, "read_bytes",
+        side_effect=lambda count: raw[write.call_args.args[0]].tobytes())
+
+    curves = lockin.get_curves()
+
+    assert [call.args[0] for call in read_bytes.call_args_list] == [8, 8]
+    assert list(curves) == ["x", "phase"]
+    # sensitivity 100 mV is full scale at 10000
+    np.testing.assert_allclose(curves["x"], [0.1, -0.05, 0, 1e-5])
+    np.testing.assert_allclose(curves["phase"], [180, -90, 45, 0])
+    # the terminator after the binary data has been read
+    assert lockin.x() == 1.5e-3
+
+
+def test_acquire_curves(lockin, mocker):
+    query = mocker.spy(lockin.visa_handle, "query")
+    mocker.patch.object(
+        lockin.visa_handle, "read_bytes",
+        side_effect=lambda count: np.arange(count // 2, dtype=">i2").tobytes())
+
+    curves = lockin.acquire_curves(4, 1e-6, curves=("r",), timeout=1)
+
+    sent = [call.args[0] for call in query.call_args_list]
+    assert sent[:5] == ["CBD 4", "LEN 4", "STR 1", "NC", "TD"]
+    assert "M" in sent
+    np.testing.assert_allclose(curves["r"], np.arange(4) * 1e-5)
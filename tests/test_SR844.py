@@ -0,0 +1,73 @@
+import re
+
+import numpy as np
+import pytest
+
+from qcodes_contrib_drivers.drivers.StanfordResearchSystems.SR844 import SR844, decode_buffer
+
+
+def test_decode_buffer():
+    raw = np.array([[3, 125], [-5, 120], [7, 124]], dtype="<i2").tobytes()
+    np.testing.assert_array_equal(decode_buffer(raw), [6.0, -0.3125, 7.0])
+
+
+def test_decode_buffer_is_float64():
+    raw = np.array([[(1 << 14) + 1, 110]], dtype="<i2").tobytes()
+    values = decode_buffer(raw)
+    assert values.dtype == np.float64
+    assert values[0] == ((1 << 14) + 1) * 2.0 ** -14
+
+
+def test_decode_buffer_into_slice():
+    raw = np.array([[1, 126], [-1, 123]], dtype="<i2").tobytes()
+    out = np.zeros((2, 4))
+    decode_buffer(raw, out[1, 2:4])
+    np.testing.assert_array_equal(out, [[0, 0, 0, 0], [0, 0, 4.0, -0.5]])
+
+
+class _FakeBuffer:
+    """Answers SPTS? from a sequence of stored point counts and TRCL ? with
+    the value ``10 * index + channel`` per point."""
+
+    stream_buffers = SR844.stream_buffers
+    read_buffer = SR844.read_buffer
+
+    def __init__(self, stored):
+        self.stored = iter(stored)
+        self.commands = []
+        self.visa_handle = self
+
+    def buffer_npts(self):
+        return next(self.stored)
+
+    def write(self, cmd):
+        self.commands.append(cmd)
+
+    def read_raw(self):
+        channel, start, count = map(int, re.findall(r"\d+", self.commands[-1]))
+        mantissas = 10 * np.arange(start, start + count) + channel
+        return np.stack([mantissas, np.full(count, 124)], axis=1).astype("<i2").tobytes()
+
+
+def test_stream_buffers_reads_new_points():
+    fake = _FakeBuffer([0, 2, 2, 5, 7])
+    out = np.zeros((2, 6))
+    chunks = list(fake.stream_buffers(6, out=out, poll_interval=0))
+
+    assert [start for start, _ in chunks] == [0, 2, 5]
+    assert all(np.shares_memory(points, out) for _, points in chunks)
+    np.testing.assert_array_equal(chunks[1][1], [[21, 31, 41], [22, 32, 42]])
+    np.testing.assert_array_equal(out, 10 * np.arange(6) + [[1], [2]])
+    assert fake.commands == ["TRCL ? 1, 0, 2", "TRCL ? 2, 0, 2",
+                             "TRCL ? 1, 2, 3", "TRCL ? 2, 2, 3",
+                             "TRCL ? 1, 5, 1", "TRCL ? 2, 5, 1"]
+
+
+def test_stream_buffers_timeout():
+    fake = _FakeBuffer([1] * 1000)
+    chunks = fake.stream_buffers(3, channels=(2,), poll_interval=0.01, timeout=0.05)
+    start, points = next(chunks)
+    assert start == 0
+    np.testing.assert_array_equal(points, [[2]])
+    with pytest.raises(TimeoutError, match="got 1 of 3"):
+        next(chunks)
@@ -0,0 +1,106 @@
+import pytest
+
+from qcodes_contrib_drivers.drivers.Siglent.sdg import Siglent_SDG_2042X
+
+
+@pytest.fixture(scope="function")
+def driver():
+    sdg_sim = Siglent_SDG_2042X(
+        "sdg_sim",
+        "TCPIP::192.168.1.1::INSTR",
+        pyvisa_sim_file="qcodes_contrib_drivers.sims:Siglent_SDG.yaml",
+    )
+    sdg_sim.visa_handle.response_delay = 0
+    yield sdg_sim
+    sdg_sim.close()
+
+
+def queries(query):
+    return [call.args[0] for call in query.call_args_list]
+
+
+def test_composite_query_sent_once_per_block(driver, mocker):
+    query = mocker.spy(driver.visa_handle, "query")
+    channel = driver.channel1
+
+    with driver.cached_responses():
+        assert channel.frequency() == 1000
+        assert channel.amplitude() == 4
+        assert channel.wave_type() == "sine"
+    assert queries(query) == ["C1:BSWV?"]
+
+    # outside of a block nothing is cached by default
+    channel.frequency()
+    assert queries(query) == ["C1:BSWV?", "C1:BSWV?"]
+
+
+def test_write_invalidates_cached_responses(driver, mocker):
+    query = mocker.spy(driver.visa_handle, "query")
+    channel = driver.channel1
+
+    with driver.cached_responses():
+        channel.frequency()
+        channel.frequency(2000)
+        channel.amplitude()
+    assert queries(query) == ["C1:BSWV?", "C1:BSWV?"]
+
+
+def test_response_cache_ttl(driver, mocker):
+    query = mocker.spy(driver.visa_handle, "query")
+    channel = driver.channel1
+    driver.response_cache_ttl = 60
+
+    channel.frequency()
+    channel.amplitude()
+    assert queries(query) == ["C1:BSWV?"]
+
+    channel.frequency(2000)
+    channel.amplitude()
+    assert queries(query) == ["C1:BSWV?", "C1:BSWV?"]
+
+    driver.clear_response_cache()
+    channel.amplitude()
+    assert len(queries(query)) == 3
+
+
+def test_upload_arbitrary_wave(driver, mocker):
+    # the simulated instrument only understands text, so binary uploads
+    # are recorded without passing them on
+    sim_write_raw = driver.visa_handle.write_raw
+    write_raw = mocker.patch.object(
+        driver.visa_handle, "write_raw",
+        side_effect=lambda message: None if message.startswith(b"C1:WVDT")
+        else sim_write_raw(message))
+    channel = driver.channel1
+
+    def uploads():
+        return [call.args[0] for call in write_raw.call_args_list
+                if call.args[0].startswith(b"C1:WVDT")]
+
+    assert channel.upload_arbitrary_wave("wave1", [-1.0, 0.0, 0.5, 1.0], frequency=1000)
+    assert uploads() == [
+        b"C1:WVDT WVNM,wave1,FREQ,1000,WAVEDATA,"
+        b"\x01\x80\x00\x00\x00\x40\xff\x7f"
+    ]
+    assert write_raw.call_args.args[0] == b"C1:ARWV NAME,wave1\n"
+    assert driver.arbitrary_wave_library["wave1"]
+
+    # identical data under the same name is not uploaded again
+    assert not channel.upload_arbitrary_wave("wave1", [-1.0, 0.0, 0.5, 1.0], frequency=1000)
+    assert len(uploads()) == 1
+    assert channel.upload_arbitrary_wave("wave1", [-1.0, 0.0, 0.5, 1.0], frequency=1000,
+                                         force=True)
+    assert channel.upload_arbitrary_wave("wave1", [1, 2], select=False)
+    assert len(uploads()) == 3
+    assert uploads()[-1] == b"C1:WVDT WVNM,wave1,WAVEDATA,\x01\x00\x02\x00"
+
+
+def test_upload_arbitrary_wave_validation(driver, mocker):
+    mocker.patch.object(driver.visa_handle, "write_raw")
+    channel = driver.channel1
+    with pytest.raises(ValueError):
+        channel.upload_arbitrary_wave("wave1", [0.0, 1.5])
+    with pytest.raises(ValueError):
+        channel.upload_arbitrary_wave("wave1", [0, 40000])
+    with pytest.raises(ValueError):
+        channel.upload_arbitrary_wave("wave1", [0])
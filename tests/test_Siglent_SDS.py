@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from qcodes_contrib_drivers.drivers.Siglent.sds import (
+    AcquisitionScaling,
+    Siglent_SDS_120NxE,
+)
+
+
+@pytest.fixture(scope="function")
+def driver():
+    sds_sim = Siglent_SDS_120NxE(
+        "sds_sim",
+        "TCPIP::192.168.1.1::INSTR",
+        pyvisa_sim_file="qcodes_contrib_drivers.sims:Siglent_SDS.yaml",
+    )
+    sds_sim.visa_handle.response_delay = 0
+    yield sds_sim
+    sds_sim.close()
+
+
+def queries(query):
+    return [call.args[0] for call in query.call_args_list]
+
+
+def commands(write):
+    return [message for message in queries(write) if "?" not in message]
+
+
+def test_acquisition_scaling_single_query(driver, mocker):
+    query = mocker.spy(driver.visa_handle, "query")
+
+    scaling = driver.get_acquisition_scaling([1, 2])
+
+    assert queries(query) == ["C1:VDIV?;C1:OFST?;C2:VDIV?;C2:OFST?;SARA?"]
+    assert scaling == AcquisitionScaling(
+        vdiv={1: 0.5, 2: 2.5}, offset={1: -1.0, 2: 0.0}, sample_rate=1e9
+    )
+
+
+def test_acquisition_scaling_falls_back_to_single_queries(driver, mocker):
+    query = mocker.spy(driver.visa_handle, "query")
+
+    scaling = driver.get_acquisition_scaling([3])
+
+    assert queries(query) == ["C3:VDIV?;C3:OFST?;SARA?", "C3:VDIV?", "C3:OFST?", "SARA?"]
+    assert scaling == AcquisitionScaling(
+        vdiv={3: 1.0}, offset={3: 0.5}, sample_rate=500e6
+    )
+
+
+def test_channels_waveform_data(driver, mocker):
+    query = mocker.spy(driver.visa_handle, "query")
+
+    data = driver.get_channels_waveform_data([1, 2])
+
+    assert len(queries(query)) == 1
+    assert data.dtype == np.float32
+    np.testing.assert_allclose(
+        data, [[-0.2, 0.0, 0.2, 0.4], [1.2, 2.0, 3.0, 4.0]], rtol=1e-6, atol=1e-6
+    )
+
+    scaling = driver.get_acquisition_scaling([1, 2])
+    out = np.zeros((2, 4), dtype=np.float32)
+    assert driver.get_channels_waveform_data([1, 2], scaling, out=out) is out
+    np.testing.assert_array_equal(out, data)
+    assert len(queries(query)) == 2
+
+    with pytest.raises(ValueError):
+        driver.get_channels_waveform_data([1, 2], scaling, out=np.zeros((2, 5), np.float32))
+
+
+def test_channels_waveform_axis(driver):
+    axis, data = driver.get_channels_waveform([1])
+    assert data.shape == (1, 4)
+    np.testing.assert_allclose(axis, np.arange(4) / 1e9)
+
+
+def test_history_frames_data(driver, mocker):
+    write = mocker.spy(driver.visa_handle, "write")
+    query = mocker.spy(driver.visa_handle, "query")
+
+    data = driver.get_history_frames_data([1, 2], [1, 2, 3])
+
+    assert queries(query) == ["C1:VDIV?;C1:OFST?;C2:VDIV?;C2:OFST?;SARA?"]
+    assert commands(write) == ["HSMD ON", "FRAM 1", "FRAM 2", "FRAM 3", "HSMD OFF"]
+    assert data.shape == (3, 2, 4)
+    assert data.dtype == np.float32
+    for frame in data:
+        np.testing.assert_array_equal(frame, data[0])
+    np.testing.assert_allclose(data[0, 1], [1.2, 2.0, 3.0, 4.0], rtol=1e-6)
+
+
+def test_history_frames_data_leaves_history_mode_on_error(driver, mocker):
+    write = mocker.spy(driver.visa_handle, "write")
+    scaling = AcquisitionScaling(vdiv={1: 0.5}, offset={1: 0.0}, sample_rate=1e9)
+    mocker.patch.object(driver, "get_raw_analog_waveform_data",
+                        side_effect=RuntimeError("timeout"))
+
+    with pytest.raises(RuntimeError):
+        driver.get_history_frames_data([1], [1, 2], scaling)
+    assert commands(write) == ["HSMD ON", "FRAM 1", "HSMD OFF"]
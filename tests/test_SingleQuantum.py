@@ -0,0 +1,58 @@
+import socket
+import threading
+
+import numpy as np
+import pytest
+
+from qcodes_contrib_drivers.drivers.SingleQuantum.SingleQuantum import SQCounts
+
+
+@pytest.fixture(name="stream")
+def _make_stream():
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("localhost", 0))
+    server.listen(1)
+    counts = SQCounts(TCP_IP_PORT=server.getsockname()[1], CNTS_BUFFER=4)
+    connection, _ = server.accept()
+    counts.daemon = True
+    counts.start()
+    yield counts, connection
+    connection.close()
+    counts.close()
+    server.close()
+
+
+def _wait_for_rows(counts, n):
+    with counts.condition:
+        assert counts.condition.wait_for(lambda: counts.n >= n, 2)
+
+
+def test_lines_are_reassembled_across_chunks(stream):
+    counts, connection = stream
+    connection.sendall(b"1,10,20\n2,11,")
+    connection.sendall(b"21\n3,12,22\n4,13")
+    connection.sendall(b",23\n5,14,24\n")
+    _wait_for_rows(counts, 5)
+
+    assert counts.n == 5
+    np.testing.assert_array_equal(counts.cnts[:, 0], [2, 3, 4, 5])
+    np.testing.assert_array_equal(counts.cnts[-1], [5, 14, 24])
+
+
+def test_get_n_waits_for_new_rows(stream):
+    counts, connection = stream
+    connection.sendall(b"0,0\n")
+    _wait_for_rows(counts, 1)
+
+    sender = threading.Timer(0.05, connection.sendall, (b"1,8\nbad line\n2,9\n",))
+    sender.start()
+    rows = counts.get_n(2, timeout=2)
+    sender.join()
+
+    np.testing.assert_array_equal(rows, [[1, 8], [2, 9]])
+
+
+def test_get_n_times_out(stream):
+    counts, _ = stream
+    with pytest.raises(TimeoutError):
+        counts.get_n(1, timeout=0.05)
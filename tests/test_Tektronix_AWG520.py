@@ -0,0 +1,100 @@
+import struct
+import time
+
+import numpy as np
+import pytest
+
+from qcodes_contrib_drivers.drivers.Tektronix.AWG520 import (
+    Tektronix_AWG520, WAVEFORM_RECORD, pack_waveform)
+
+
+def pack_waveform_struct(w, m1, m2):
+    """The per sample packing pack_waveform replaces."""
+    m = m1 + np.multiply(m2, 2)
+    ws = b''
+    for i in range(0, len(w)):
+        ws = ws + struct.pack('<fB', w[i], int(m[i]))
+    return ws
+
+
+def random_waveform(n, seed):
+    rng = np.random.default_rng(seed)
+    w = rng.uniform(-1, 1, n)
+    m1 = rng.integers(0, 2, n)
+    m2 = rng.integers(0, 2, n)
+    return w, m1, m2
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_pack_waveform_matches_struct(seed):
+    w, m1, m2 = random_waveform(1000 + seed, seed)
+    packed = pack_waveform(w, m1, m2)
+    assert WAVEFORM_RECORD.itemsize == 5
+    assert packed == pack_waveform_struct(w, m1, m2)
+
+
+def test_pack_waveform_accepts_lists():
+    w, m1, m2 = random_waveform(50, 0)
+    w, m1, m2 = list(w), list(m1), [float(m) for m in m2]
+    assert pack_waveform(w, m1, m2) == pack_waveform_struct(w, m1, m2)
+
+
+@pytest.fixture
+def awg(mocker):
+    awg = Tektronix_AWG520(
+        "awg520_sim",
+        "GPIB::1::INSTR",
+        pyvisa_sim_file="qcodes_contrib_drivers.sims:Tektronix_AWG520.yaml",
+    )
+    mocker.patch.object(awg.visa_handle, 'write_raw')
+    yield awg
+    awg.close()
+
+
+def written(awg):
+    return [call.args[0] for call in awg.visa_handle.write_raw.call_args_list]
+
+
+def test_send_waveform_message(awg):
+    w, m1, m2 = random_waveform(100, 2)
+    awg.send_waveform(w, m1, m2, 'test.wfm', 1e9)
+    data = pack_waveform_struct(w, m1, m2)
+    content = b'MAGIC 1000\n#3500' + data + b'CLOCK 1.0000000000e+09\n'
+    expected = ((b'MMEM:DATA "test.wfm",#3%d' % len(content)) + content +
+                awg.visa_handle.write_termination.encode())
+    assert written(awg) == [expected]
+
+
+def test_upload_cache_skips_identical_files(awg):
+    w, m1, m2 = random_waveform(100, 3)
+    awg.send_waveform(w, m1, m2, 'a.wfm', 1e9)
+    awg.send_waveform(w, m1, m2, 'a.wfm', 1e9)
+    awg.send_sequence(['a.wfm'], [1], [0], [0], [0], 'a.seq')
+    awg.send_sequence(['a.wfm'], [1], [0], [0], [0], 'a.seq')
+    assert len(written(awg)) == 2
+
+    awg.send_waveform(w, m1, 1 - m2, 'a.wfm', 1e9)
+    awg.send_waveform(w, m1, m2, 'b.wfm', 1e9)
+    awg.send_waveform(w, m1, m2, 'b.wfm', 1e9, force_upload=True)
+    assert len(written(awg)) == 5
+
+    awg.clear_upload_cache()
+    awg.send_sequence(['a.wfm'], [1], [0], [0], [0], 'a.seq')
+    assert len(written(awg)) == 6
+
+
+if __name__ == '__main__':
+    # benchmark: python tests/test_Tektronix_AWG520.py
+    # (not a test, timings on shared CI machines are not reliable)
+    for n in (10_000, 100_000, 4_000_000):
+        w, m1, m2 = random_waveform(n, 0)
+        t0 = time.perf_counter()
+        pack_waveform(w, m1, m2)
+        t_numpy = time.perf_counter() - t0
+        if n <= 100_000:
+            t0 = time.perf_counter()
+            pack_waveform_struct(w, m1, m2)
+            t_struct = '%.3f s' % (time.perf_counter() - t0)
+        else:
+            t_struct = 'skipped'
+        print('%9d points: numpy %.4f s, struct %s' % (n, t_numpy, t_struct))
@@ -0,0 +1,50 @@
+import pytest
+
+from qcodes_contrib_drivers.drivers.OxfordInstruments.Triton import Triton
+
+_COLUMNS = ["Time(secs)", "PT1 Plate T(K)", "PT2 Plate T(K)", "Still T(K)",
+            "100mK Plate T(K)", "MC cernox T(K)", "MC RuO2 T(K)",
+            "P1 Tank (Bar)", "P2 Condense (Bar)", "P5 ForepumpBack (Bar)"]
+
+
+def _row(*values):
+    return "\t".join(str(value) for value in values) + "\n"
+
+
+@pytest.fixture(name="triton")
+def _make_triton(tmp_path):
+    converter = tmp_path / "VCL_2_ASCII_CONVERTER.exe"
+    converter.write_text("")
+    vcl = tmp_path / "log.vcl"
+    vcl.write_text("")
+    (tmp_path / "log.txt").write_text(
+        _row(*_COLUMNS)
+        + _row(0, 50.1, 4.1, 1.1, 0.2, 5.0, 0.5, 0.3, 0.4, 0.01)
+        + _row(60, 50.0, 4.0, 1.0, 0.1, 2.0, 0.01, 0.3, 0.5, 0.02))
+    # A large conversion timer keeps the converter from being run
+    triton = Triton("triton", str(vcl), str(converter), conversion_timer=1e6)
+    yield triton
+    triton.close()
+
+
+def test_values_from_last_row(triton):
+    assert triton.temperature_50k_plate() == 50.0
+    assert triton.temperature_still() == 1.0
+    assert triton.temperature_mixing_chamber() == 0.01
+    assert triton.pressure_condensation_line() == 0.5
+    assert triton.pressure_forepump_back() == 0.02
+
+
+def test_last_row_parsed_once(triton, mocker):
+    spy = mocker.spy(triton._log_reader, "last_line")
+    triton.get_latest()
+    latest = triton._latest
+    triton.temperature_4k_plate()
+    triton.pressure_mixture_tank()
+    assert spy.call_count == 3
+    assert triton._latest is latest
+
+
+def test_unknown_channel(triton):
+    with pytest.raises(ValueError, match="Unknown channel"):
+        triton.get_temperature("1k")
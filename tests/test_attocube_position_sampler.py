@@ -0,0 +1,51 @@
+import time
+
+import numpy as np
+import pytest
+
+from qcodes_contrib_drivers.drivers.Attocube.position_sampler import PositionSampler
+from qcodes_contrib_drivers.drivers.sampling import wait_until
+
+
+class _Stage:
+    """Axes moving linearly with time."""
+
+    def __init__(self):
+        self.start = time.time()
+        self.reads = 0
+
+    def read(self):
+        self.reads += 1
+        elapsed = time.time() - self.start
+        return [elapsed, 2 * elapsed]
+
+
+def test_samples_are_kept_in_ring_buffer():
+    stage = _Stage()
+    with PositionSampler(stage.read, 2, rate=1000, capacity=8) as sampler:
+        while sampler.count < 20:
+            assert sampler.wait_for_sample(1)
+    assert not sampler.running
+
+    times, positions = sampler.samples()
+    assert times.shape == (8,)
+    assert positions.shape == (8, 2)
+    assert np.all(np.diff(times) > 0)
+    np.testing.assert_allclose(positions[:, 1], 2 * positions[:, 0])
+    np.testing.assert_array_equal(sampler.latest()[1], positions[-1])
+    np.testing.assert_allclose(sampler.positions_at(times[2:4]), positions[2:4])
+    assert np.all(np.isnan(sampler.positions_at(times[0] - 1)))
+
+
+def test_wait_until_is_woken_by_samples():
+    stage = _Stage()
+    with PositionSampler(stage.read, 2, rate=200) as sampler:
+        wait_until(lambda: sampler.latest()[1][0] > 0.05 if sampler.count else False,
+                   timeout=2, sampler=sampler)
+        reads = stage.reads
+    assert reads < 30
+
+
+def test_wait_until_times_out():
+    with pytest.raises(TimeoutError):
+        wait_until(lambda: False, timeout=0.05, poll_interval=0.01)
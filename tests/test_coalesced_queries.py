@@ -0,0 +1,101 @@
+import pytest
+from qcodes.instrument import Instrument
+
+from qcodes_contrib_drivers.drivers.coalesced_queries import CoalescedQueryMixin
+
+
+class _FakeSCPIInstrument(CoalescedQueryMixin, Instrument):
+    """Answers simple and compound queries from a dictionary."""
+
+    def __init__(self, name, accept_compound=True):
+        super().__init__(name)
+        self.accept_compound = accept_compound
+        self.messages = []
+        self.responses = {":VOLT?": "1.5", ":OUTP?": "1", ":MODE?": '"DC"',
+                          "*IDN?": "ACME,fake,1,0.1"}
+        self.add_parameter("voltage", get_cmd=":VOLT?", get_parser=float)
+        self.add_parameter("output", get_cmd=":OUTP?",
+                           val_mapping={True: "1", False: "0"})
+        self.add_parameter("mode", get_cmd=":MODE?",
+                           get_parser=lambda s: s.strip('"'))
+        self.add_parameter("computed", get_cmd=lambda: 42)
+
+    def ask_raw(self, cmd):
+        self.messages.append(cmd)
+        queries = cmd.split(";")
+        if len(queries) > 1 and not self.accept_compound:
+            raise RuntimeError("-113, Undefined header")
+        return ";".join(self.responses[query] for query in queries)
+
+
+@pytest.fixture(name="instrument")
+def _make_instrument():
+    instrument = _FakeSCPIInstrument("coalesced")
+    yield instrument
+    instrument.close()
+
+
+def test_get_coalesced_single_message(instrument):
+    values = instrument.get_coalesced()
+
+    assert instrument.messages == [":VOLT?;:OUTP?;:MODE?"]
+    assert values == {"voltage": 1.5, "output": True, "mode": "DC"}
+    assert instrument.voltage.cache.get(get_if_invalid=False) == 1.5
+    assert instrument.output.cache.get(get_if_invalid=False) is True
+
+
+def test_get_coalesced_chunks(instrument):
+    instrument.coalesced_query_max_count = 2
+    instrument.get_coalesced()
+    assert instrument.messages == [":VOLT?;:OUTP?", ":MODE?"]
+
+
+def test_snapshot_uses_compound_query(instrument):
+    snapshot = instrument.snapshot(update=True)
+    # IDN is read through get_idn and therefore not coalesced
+    assert instrument.messages == [":VOLT?;:OUTP?;:MODE?", "*IDN?"]
+    assert snapshot["parameters"]["mode"]["value"] == "DC"
+    assert snapshot["parameters"]["computed"]["value"] == 42
+
+
+def test_fallback_to_individual_queries():
+    instrument = _FakeSCPIInstrument("no_compound", accept_compound=False)
+    try:
+        values = instrument.get_coalesced(["voltage", "output"])
+        assert values == {"voltage": 1.5, "output": True}
+        # a single failure may be transient
+        assert instrument.coalesced_queries_supported is True
+
+        instrument.get_coalesced(["voltage", "output"])
+        instrument.get_coalesced(["voltage", "output"])
+        assert instrument.coalesced_queries_supported is False
+
+        instrument.messages.clear()
+        instrument.get_coalesced(["voltage", "output"])
+        assert instrument.messages == [":VOLT?", ":OUTP?"]
+    finally:
+        instrument.close()
+
+
+def test_transient_failure_does_not_disable(instrument):
+    instrument.accept_compound = False
+    instrument.get_coalesced(["voltage", "output"])
+    instrument.accept_compound = True
+    instrument.get_coalesced(["voltage", "output"])
+    instrument.accept_compound = False
+    instrument.get_coalesced(["voltage", "output"])
+    instrument.get_coalesced(["voltage", "output"])
+    assert instrument.coalesced_queries_supported is True
+
+
+def test_wrong_number_of_values_disables(instrument):
+    instrument.responses[":MODE?"] = '"D;C"'
+    assert instrument.get_coalesced(["voltage", "mode"])["mode"] == "D;C"
+    assert instrument.coalesced_queries_supported is False
+
+
+def test_dependencies_are_read_first(instrument):
+    instrument.coalesced_query_dependencies = ("mode",)
+    values = instrument.get_coalesced(["voltage", "output"])
+    assert instrument.messages == [":MODE?", ":VOLT?;:OUTP?"]
+    assert values == {"mode": "DC", "voltage": 1.5, "output": True}
@@ -0,0 +1,84 @@
+import threading
+
+import pytest
+
+from qcodes_contrib_drivers.drivers.OxfordInstruments._decs_push import DECSPushCache
+
+
+@pytest.fixture(name="cache")
+def _make_cache():
+    cache = DECSPushCache("ws://localhost:8080/ws", "realm", {"get_MC_T": "topic"})
+    # pretend the session joined, without starting the event loop
+    cache._joined.set()
+    yield cache
+    cache._loop.close()
+
+
+def test_wait_for_wakes_up_on_publication(cache):
+    timer = threading.Timer(0.05, cache._on_event, ("get_MC_T", 0.01))
+    timer.start()
+    assert cache.wait_for(lambda: cache.get("get_MC_T") == 0.01, timeout=5)
+    assert cache.updates("get_MC_T") == 1
+
+
+def test_wait_for_timeout(cache):
+    calls = []
+    assert not cache.wait_for(lambda: calls.append(1), timeout=0.05)
+    assert len(calls) == 2
+
+
+def test_wait_for_evaluates_predicate_without_lock(cache):
+    def predicate():
+        # a publication while the predicate runs, e.g. while it queries
+        # the instrument, must not wait for the predicate to finish
+        publisher = threading.Thread(target=cache._on_event, args=("get_MC_T", 1.0))
+        publisher.start()
+        publisher.join(timeout=1)
+        return not publisher.is_alive()
+
+    assert cache.wait_for(predicate, timeout=5)
+
+
+class _Session:
+    def __init__(self, cache):
+        self.cache = cache
+        self.left_in = None
+
+    def is_attached(self):
+        return self.left_in is None
+
+    def leave(self):
+        self.left_in = threading.current_thread()
+        # the router acknowledges and the connection closes later on
+        self.cache._loop.call_later(0.02, self.cache._disconnected.set)
+
+
+def test_stop_leaves_and_closes_the_loop(cache):
+    session = cache._session = _Session(cache)
+    cache._thread.start()
+    cache.stop()
+    assert session.left_in is cache._thread
+    assert cache._disconnected.is_set()
+    assert not cache._thread.is_alive()
+    assert cache._loop.is_closed()
+    assert not cache.connected
+    cache.stop()
+
+
+def test_stop_without_thread_closes_the_loop(cache):
+    cache.stop()
+    assert cache._loop.is_closed()
+
+
+@pytest.mark.parametrize("value, text", [
+    (10.0, "10"),
+    (0, "0"),
+    (True, "1"),
+    (0.25, "0.25"),
+    ("Holding Persistent", "Holding Persistent"),
+])
+def test_format_pushed(value, text):
+    # Proteox needs the decs_visa submodule
+    proteox = pytest.importorskip(
+        "qcodes_contrib_drivers.drivers.OxfordInstruments.Proteox")
+    assert proteox._format_pushed(value) == text
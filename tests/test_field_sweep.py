@@ -0,0 +1,99 @@
+import time
+
+import numpy as np
+import pytest
+from qcodes.instrument import Instrument
+
+from qcodes_contrib_drivers.drivers.field_sweep import FieldSweep, FieldSweepMixin
+
+
+class _Ramp:
+    """Field ramping linearly from 0 to ``target`` at ``rate`` per second."""
+
+    def __init__(self, target=1.0, rate=10.0):
+        self.target = target
+        self.rate = rate
+        self.start = time.time()
+
+    def field(self):
+        return min(self.target, (time.time() - self.start) * self.rate)
+
+    def ramping(self):
+        return self.field() < self.target
+
+
+class _Magnet(FieldSweepMixin, Instrument):
+    field_sweep_interval = 0.01
+    field_sweep_settle_time = 0.0
+
+    def _start_field_ramp(self, target, rate=10.0):
+        self.ramp = _Ramp(target, rate)
+
+    def _field_ramping(self):
+        return self.ramp.ramping()
+
+    def _read_swept_field(self):
+        return self.ramp.field()
+
+
+def test_measurements_are_tagged_with_interpolated_field():
+    ramp = _Ramp(target=1.0, rate=10.0)
+    with FieldSweep(ramp.field, ramp.ramping, interval=0.01).start() as sweep:
+        for _ in range(5):
+            time.sleep(0.01)
+            sweep.tag(ramp.field())
+        sweep.wait(timeout=2)
+
+    assert sweep.finished
+    times, fields = sweep.readbacks()
+    assert fields[-1] == 1.0
+    assert np.all(np.diff(times) > 0)
+    _, tagged_fields, values = sweep.tagged()
+    np.testing.assert_allclose(tagged_fields, values, atol=0.02)
+    assert sweep.field_at(time.time()) == 1.0
+    assert np.isnan(sweep.field_at(times[0] - 1))
+
+
+def test_ring_buffer_and_vector_readings():
+    ramp = _Ramp(target=1.0, rate=10.0)
+    sweep = FieldSweep(lambda: (0.0, 0.0, ramp.field()), ramp.ramping,
+                       interval=0.0, capacity=4).start()
+    sweep.wait(timeout=2)
+
+    times, fields = sweep.readbacks()
+    assert fields.shape == (4, 3)
+    np.testing.assert_array_equal(fields[-1], [0, 0, 1])
+    assert sweep.field_at([times[-1]]).shape == (1, 3)
+
+
+def test_wait_times_out_and_stop_leaves_ramp_running():
+    ramp = _Ramp(target=1.0, rate=0.1)
+    sweep = FieldSweep(ramp.field, ramp.ramping, interval=0.01).start()
+    with pytest.raises(TimeoutError):
+        sweep.wait(timeout=0.05)
+    sweep.stop()
+    assert not sweep.running
+    assert not sweep.finished
+
+
+def test_mixin_starts_ramp_and_poller():
+    magnet = _Magnet('field_sweep_magnet')
+    try:
+        sweep = magnet.start_field_sweep(0.5, rate=5.0)
+        with pytest.raises(RuntimeError, match='already sweeping'):
+            magnet.start_field_sweep(1.0)
+        values = sweep.measure(magnet.IDN)
+        assert values[0]['vendor'] is None
+        sweep.wait(timeout=2)
+        assert sweep.readbacks()[1][-1] == 0.5
+    finally:
+        magnet.close()
+
+
+def test_mixin_requires_the_ramp_hooks():
+    class _Incomplete(FieldSweepMixin, Instrument):
+        def _start_field_ramp(self, target):
+            pass
+
+    with pytest.raises(TypeError, match='_field_ramping'):
+        _Incomplete('field_sweep_incomplete')
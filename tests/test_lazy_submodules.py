@@ -0,0 +1,68 @@
+import pytest
+from qcodes.instrument import Instrument, InstrumentChannel
+
+from qcodes_contrib_drivers.drivers.lazy_submodules import LazySubmoduleMixin
+
+
+class _Channel(InstrumentChannel):
+    instances = 0
+
+    def __init__(self, parent, name, number):
+        super().__init__(parent, name)
+        type(self).instances += 1
+        self.number = number
+        self.add_parameter("value", get_cmd=lambda: number)
+
+
+class _FakeInstrument(LazySubmoduleMixin, Instrument):
+    def __init__(self, name, lazy_submodules):
+        self.lazy_submodules = lazy_submodules
+        super().__init__(name)
+        for number in (1, 2):
+            self.add_lazy_submodule(
+                f"ch{number}", lambda number=number: _Channel(self, f"ch{number}", number)
+            )
+        self.add_lazy_channel_list("channels", "channels", _Channel, ["ch1", "ch2"])
+
+
+@pytest.fixture(name="lazy_instrument")
+def _make_lazy_instrument():
+    _Channel.instances = 0
+    instrument = _FakeInstrument("lazy", lazy_submodules=True)
+    yield instrument
+    instrument.close()
+
+
+def test_eager_by_default():
+    instrument = _FakeInstrument("eager", lazy_submodules=False)
+    try:
+        assert list(instrument.submodules) == ["ch1", "ch2", "channels"]
+        assert instrument.pending_submodules == []
+    finally:
+        instrument.close()
+
+
+def test_constructed_on_first_access(lazy_instrument):
+    assert _Channel.instances == 0
+    assert "ch1" not in lazy_instrument.snapshot()["submodules"]
+
+    assert lazy_instrument.ch2.value() == 2
+    assert _Channel.instances == 1
+    assert lazy_instrument.ch2 is lazy_instrument.submodules["ch2"]
+    assert lazy_instrument.pending_submodules == ["ch1", "channels"]
+
+
+def test_channel_list_builds_channels(lazy_instrument):
+    ch1 = lazy_instrument.ch1
+    channels = lazy_instrument.channels
+    assert channels[0] is ch1
+    assert [channel.number for channel in channels] == [1, 2]
+    assert _Channel.instances == 2
+
+
+def test_build_submodules(lazy_instrument):
+    lazy_instrument.build_submodules()
+    assert lazy_instrument.pending_submodules == []
+    assert list(lazy_instrument.submodules) == ["ch1", "ch2", "channels"]
+    with pytest.raises(AttributeError):
+        lazy_instrument.ch3
@@ -0,0 +1,96 @@
+import queue
+import threading
+
+import pytest
+
+from qcodes_contrib_drivers.drivers.Thorlabs.kinesis_motion import KinesisMotionCoordinator
+
+
+class _Position:
+    def __init__(self):
+        self.value = 0.0
+
+    def get(self):
+        return self.value
+
+
+class _FakeMotor:
+    """Posts Kinesis completion messages after a fixed move duration."""
+
+    def __init__(self, name, duration=0.1, log=None, barrier=None):
+        self.name = name
+        self.duration = duration
+        self.barrier = barrier
+        self.position = _Position()
+        self.messages = queue.Queue()
+        self.log = log if log is not None else []
+        self.stopped = False
+
+    def _finish(self, target):
+        self.position.value = target
+        self.log.append(('done', self.name, target))
+        self.messages.put((2, 1, 0))
+
+    def move_to(self, position, block=True):
+        self.log.append(('start', self.name, position))
+        if self.barrier is not None:
+            # only passes if the other move was started meanwhile
+            self.barrier.wait(timeout=5)
+        if self.duration is not None:
+            threading.Timer(self.duration, self._finish, (position,)).start()
+
+    def move_by(self, displacement, block=True):
+        self.move_to(self.position.value + displacement, block)
+
+    def stop(self, immediate=False, block=True):
+        self.stopped = True
+        self.messages.put((2, 2, 0))
+
+    def _wait_for_message(self):
+        return self.messages.get()
+
+
+def test_moves_run_concurrently():
+    barrier = threading.Barrier(2)
+    motors = [_FakeMotor('x', 0.01, barrier=barrier), _FakeMotor('y', 0.01, barrier=barrier)]
+    with KinesisMotionCoordinator(motors) as coordinator:
+        positions = coordinator.wait(coordinator.move_all({'x': 1.0, motors[1]: 2.0}))
+    assert positions == {'x': 1.0, 'y': 2.0}
+    assert not barrier.broken
+
+
+def test_trajectory_waits_for_each_waypoint():
+    log = []
+    motors = [_FakeMotor('x', 0.02, log), _FakeMotor('y', 0.05, log)]
+    reached = []
+    with KinesisMotionCoordinator(motors) as coordinator:
+        coordinator.run_trajectory([{'x': 1, 'y': 1}, {'x': 2, 'y': 2}],
+                                   callback=lambda i, p: reached.append((i, p)))
+    second = log.index(('start', 'x', 2))
+    assert ('done', 'y', 1) in log[:second]
+    assert reached == [(0, {'x': 1, 'y': 1}), (1, {'x': 2, 'y': 2})]
+
+
+def test_timeout_stops_devices():
+    motors = [_FakeMotor('x', None), _FakeMotor('y', 0.01)]
+    with KinesisMotionCoordinator(motors, timeout=0.1) as coordinator:
+        moves = coordinator.move_all({'x': 1, 'y': 1})
+        with pytest.raises(TimeoutError):
+            coordinator.wait(moves)
+        assert all(motor.stopped for motor in motors)
+        with pytest.raises(RuntimeError, match='stopped'):
+            moves['x'].result(timeout=1)
+
+
+def test_close_stops_moves_in_flight():
+    started = threading.Barrier(2)
+    motor = _FakeMotor('x', None, barrier=started)
+    coordinator = KinesisMotionCoordinator([motor])
+    running = coordinator.move_to('x', 1)
+    queued = coordinator.move_to('x', 2)
+    started.wait(timeout=5)
+    coordinator.close(timeout=1)
+    assert motor.stopped
+    assert queued.cancelled()
+    with pytest.raises(RuntimeError, match='stopped'):
+        running.result(timeout=1)